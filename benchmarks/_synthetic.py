@@ -0,0 +1,63 @@
+"""Synthetic USGS-like catalogs for the benchmark scripts.
+
+Place strings follow the USGS '<distance> <bearing> of <town>, <region>'
+pattern over a hundred towns, so - as in a real catalog, where activity
+clusters around a few volcanoes and faults - they repeat heavily.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+from typing import Any
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+_REGIONS = ['Hawaii', 'Alaska', 'CA', 'Nevada', 'Japan', 'Chile', 'Indonesia',
+            'Puerto Rico', 'Oklahoma', 'Tonga']
+_BEARINGS = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
+_START_MS = 1_700_000_000_000
+_B_VALUE = 1.0  # magnitudes follow Gutenberg-Richter above M1.0
+
+
+def synthetic_features(count: int, seed: int = 1) -> list[dict[str, Any]]:
+    """`count` GeoJSON event features, newest first, deterministic by seed."""
+    rng = random.Random(seed)
+    towns = ['{} {}, {}'.format(
+        rng.choice(['Port', 'Mount', 'Lake', 'San', 'Fort']),
+        ''.join(rng.choice('abcdefghij') for _ in range(6)).title(),
+        rng.choice(_REGIONS)) for _ in range(100)]
+    features = []
+    for n in range(count):
+        if rng.random() < 0.05:
+            place = '{} Mid-Ocean Ridge'.format(rng.choice(_BEARINGS))
+        else:
+            place = '{}km {} of {}'.format(
+                rng.randrange(1, 20), rng.choice(_BEARINGS), rng.choice(towns))
+        features.append({
+            'type': 'Feature',
+            'id': 'syn{}'.format(n),
+            'properties': {
+                'mag': round(1.0 + rng.expovariate(_B_VALUE * math.log(10)),
+                             2),
+                'place': place,
+                'time': _START_MS - n * 60_000,
+            },
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [rng.uniform(-180, 180), rng.uniform(-60, 70),
+                                rng.expovariate(1 / 40)],
+            },
+        })
+    return features
+
+
+def synthetic_geojson(count: int, seed: int = 1) -> bytes:
+    """A FeatureCollection document holding synthetic_features()."""
+    return json.dumps({
+        'type': 'FeatureCollection',
+        'metadata': {'title': 'Synthetic catalog', 'count': count},
+        'features': synthetic_features(count, seed),
+    }).encode('utf-8')
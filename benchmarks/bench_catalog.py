@@ -0,0 +1,78 @@
+"""Benchmark opening a saved catalog: GeoJSON parse vs compiled mapping.
+
+Saves a synthetic catalog as GeoJSON and compiles it as
+`seismic compile` does, then times getting a QuakeTable from each file
+- parse_table() over the GeoJSON, read_columnar() mapping the compiled
+file - and the first work on that table: the 20 strongest events and
+the statistics header.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_catalog.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from timeit import default_timer as timer
+
+from _synthetic import synthetic_geojson
+
+from seismic_reporting.core import (
+    DEFAULT_ORIGIN,
+    SORT_MAGNITUDE,
+    QuakeTable,
+    magnitude_summary,
+    parse_table,
+    sort_quakes,
+)
+from seismic_reporting.export import read_columnar, write_columnar
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+def _first_report(table: QuakeTable) -> float:
+    start = timer()
+    sort_quakes(table, SORT_MAGNITUDE, reverse=True, top=20)
+    magnitude_summary(table)
+    return timer() - start
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        geojson = os.path.join(tmp, 'saved.geojson')
+        compiled = os.path.join(tmp, 'catalog.bin')
+        with open(geojson, 'wb') as out:
+            out.write(synthetic_geojson(count))
+        print('{:,} events: {:.1f} MB GeoJSON'.format(
+            count, os.path.getsize(geojson) / 1e6), end='')
+
+        start = timer()
+        with open(geojson, 'rb') as source:
+            table, meta = parse_table(source, DEFAULT_ORIGIN, fields=())
+        parsed = timer() - start
+        report = _first_report(table)
+
+        start = timer()
+        with open(geojson, 'rb') as source:
+            table, meta = parse_table(source, DEFAULT_ORIGIN)
+        with open(compiled, 'wb') as out:
+            write_columnar(out, table, meta)
+        print(', {:.1f} MB compiled in {:.1f}s'.format(
+            os.path.getsize(compiled) / 1e6, timer() - start))
+        print('{:9} {:>10} {:>14}'.format('', 'open', 'top 20 + stats'))
+        print('{:9} {:9.3f}s {:13.3f}s'.format('GeoJSON', parsed, report))
+
+        start = timer()
+        with open(compiled, 'rb') as source:
+            table, meta = read_columnar(source, DEFAULT_ORIGIN, fields=())
+        mapped = timer() - start
+        print('{:9} {:9.3f}s {:13.3f}s'.format('compiled', mapped,
+                                               _first_report(table)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
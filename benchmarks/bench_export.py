@@ -0,0 +1,81 @@
+"""Benchmark serialization throughput of each machine-readable format.
+
+Writes a synthetic catalog with every event field as CSV, NDJSON and
+the columnar binary to a temporary file, reporting time, events/second
+and size for each, then times read_columnar() loading the binary back.
+The table is built directly, skipping GeoJSON parsing.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_export.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+from timeit import default_timer as timer
+from typing import Any
+
+from _synthetic import synthetic_features
+
+from seismic_reporting.core import DEFAULT_ORIGIN, QuakeTable
+from seismic_reporting.export import (
+    read_columnar,
+    write_columnar,
+    write_csv,
+    write_ndjson,
+)
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+def _best_of(runs: int, func: Callable[[], Any]) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = timer()
+        func()
+        best = min(best, timer() - start)
+    return best
+
+
+def _table(count: int) -> QuakeTable:
+    table = QuakeTable()
+    for n, feature in enumerate(synthetic_features(count)):
+        props = feature['properties']
+        lon, lat, depth = feature['geometry']['coordinates']
+        table.append(props['mag'], props['place'], lat, lon, props['time'],
+                     depth_km=depth, event_id=feature['id'],
+                     updated_ms=props['time'] + 60_000,
+                     mag_type=('md', 'ml', 'mb')[n % 3],
+                     event_type='earthquake', status='reviewed')
+    table.measure_from(DEFAULT_ORIGIN)
+    return table
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 1_000_000
+    table = _table(count)
+    print('{:,} events'.format(count))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'catalog')
+        for label, write, mode in (('csv', write_csv, 'w'),
+                                   ('ndjson', write_ndjson, 'w'),
+                                   ('columnar', write_columnar, 'wb')):
+            def run(write: Any = write, mode: str = mode) -> None:
+                with open(path, mode) as stream:
+                    write(stream, table)
+            seconds = _best_of(3, run)
+            print('{:9} {:6.3f}s  {:>10,.0f} events/s  {:7.1f} MB'.format(
+                label, seconds, count / seconds, os.path.getsize(path) / 1e6))
+
+        def load() -> None:
+            with open(path, 'rb') as stream:
+                read_columnar(stream)
+        print('read_columnar {:.3f}s'.format(_best_of(3, load)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
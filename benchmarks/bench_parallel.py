@@ -0,0 +1,111 @@
+"""Benchmark parsing a saved GeoJSON catalog across processes.
+
+Saves a synthetic catalog and times parse_table() against
+parse_table_parallel() with increasing worker counts, all keeping every
+event field. parse_table_parallel() never starts more processes than
+there are CPUs, so worker counts above the CPU count are not measured.
+
+Each worker count also gets a projected time, built from parts timed
+one after another in this process: splitting the file, the slowest
+range (parse, measure and pickle its table, as a worker does), starting
+the pool, and unpickling and joining the ranges in the parent. That is
+what the parallel parse costs with a free core per range, so it gives
+a multi-core figure even on a single-CPU machine; where the cores exist,
+compare it with the measured one.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_parallel.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+
+from _synthetic import synthetic_geojson
+
+from seismic_reporting import parallel
+from seismic_reporting.core import DEFAULT_ORIGIN, EVENT_FIELDS, parse_table
+from seismic_reporting.parallel import parse_table_parallel
+from seismic_reporting.stats import MagnitudeStats
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+def _projected(path: str, workers: int) -> float:
+    """Seconds parse_table_parallel() would take with `workers` free cores."""
+    start = timer()
+    with open(path, 'rb') as stream, mmap.mmap(
+            stream.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        _, pos = parallel._expect(buf, 0, b'{')
+        first = parallel._members(buf, pos, {})
+        assert first is not None
+        starts = parallel._split(buf, first, workers)
+        size = len(buf)
+    split = timer() - start
+
+    ends = [*starts[1:], size]
+    slowest, pickled = 0.0, []
+    for begin, end in zip(starts, ends, strict=True):
+        start = timer()
+        part = parallel._parse_range(path, begin, end, end == size,
+                                     [DEFAULT_ORIGIN], EVENT_FIELDS, True)
+        pickled.append(pickle.dumps(part))
+        slowest = max(slowest, timer() - start)
+
+    start = timer()
+    with ProcessPoolExecutor(max_workers=len(starts)) as pool:
+        list(pool.map(abs, range(len(starts))))
+    startup = timer() - start
+
+    start = timer()
+    table, stats = None, MagnitudeStats()
+    for data in pickled:
+        part, part_stats, _ = pickle.loads(data)
+        if table is None:
+            table = part
+        else:
+            table.extend(part)
+        stats.merge(part_stats)
+    join = timer() - start
+    return split + slowest + startup + join
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 1_000_000
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'saved.geojson')
+        with open(path, 'wb') as out:
+            out.write(synthetic_geojson(count))
+        print('{:,} events, {:.1f} MB, {} CPUs'.format(
+            count, os.path.getsize(path) / 1e6, cpus))
+
+        start = timer()
+        with open(path, 'rb') as source:
+            parse_table(source, DEFAULT_ORIGIN)
+        serial = timer() - start
+        print('{:>8} {:8.2f}s'.format('serial', serial))
+        print('{:>8} {:>15} {:>15}'.format('', 'measured', 'projected'))
+        for workers in (2, 4, 8):
+            measured = '{:>15}'.format('-')
+            if workers <= cpus:
+                start = timer()
+                parse_table_parallel(path, DEFAULT_ORIGIN, workers=workers)
+                seconds = timer() - start
+                measured = '{:8.2f}s {:4.1f}x'.format(seconds,
+                                                      serial / seconds)
+            projected = _projected(path, workers)
+            print('{:>8} {} {:8.2f}s {:4.1f}x'.format(
+                '{} procs'.format(workers), measured, projected,
+                serial / projected))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+"""Benchmark parse throughput and epoch-to-local time conversion.
+
+Reports events/second for parse_quakes() and parse_table() over a
+synthetic catalog - origin times stay epoch milliseconds until a record
+is rendered - and compares converting every event's time with a
+per-event astimezone() against the per-day offset cache in _local_time().
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_parse.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import datetime
+import sys
+from collections.abc import Callable
+from timeit import default_timer as timer
+from typing import Any
+
+from _synthetic import synthetic_geojson
+
+from seismic_reporting import core
+from seismic_reporting.core import DEFAULT_ORIGIN, parse_quakes, parse_table
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+def _best_of(runs: int, func: Callable[[], Any]) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = timer()
+        func()
+        best = min(best, timer() - start)
+    return best
+
+
+def _astimezone(time_ms: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(
+        time_ms / 1000.0, tz=datetime.timezone.utc).astimezone()
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 100_000
+    data = synthetic_geojson(count)
+    print('{:,} events, {:.1f} MB of GeoJSON'.format(count, len(data) / 1e6))
+
+    for label, parse in (('parse_quakes', parse_quakes),
+                         ('parse_table', parse_table)):
+        seconds = _best_of(3, lambda parse=parse: parse(data, DEFAULT_ORIGIN))
+        print('{:13} {:6.3f}s  {:>9,.0f} events/s'.format(
+            label, seconds, count / seconds))
+
+    table, _ = parse_table(data, DEFAULT_ORIGIN)
+    stamps = list(table.time_ms)
+    per_event = _best_of(3, lambda: [_astimezone(t) for t in stamps])
+
+    def cached() -> None:
+        core._day_zones.clear()
+        [core._local_time(t) for t in stamps]
+    per_day = _best_of(3, cached)
+    print('local time    astimezone() {:.3f}s   cached offset {:.3f}s   '
+          '{:.1f}x'.format(per_event, per_day, per_event / per_day))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
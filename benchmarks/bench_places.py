@@ -0,0 +1,111 @@
+"""Benchmark location sorting and report rendering.
+
+Times sort_quakes(SORT_LOCATION) and format_report() over a synthetic
+catalog. For a list of Quakes it compares formatting the place of every
+row (the original behaviour) with formatting each distinct place once
+per call, as sort_quakes() and iter_report() now do. A QuakeTable
+always formats each distinct place once (see region_places()); its sort
+is shown split into computing the order and take() building the sorted
+table, which copies every column. Rendering is dominated by per-row
+time conversion and formatting.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_places.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from timeit import default_timer as timer
+from typing import Any
+
+from _synthetic import synthetic_geojson
+
+from seismic_reporting import core
+from seismic_reporting.core import (
+    DEFAULT_ORIGIN,
+    SORT_LOCATION,
+    Quake,
+    format_place,
+    format_report,
+    parse_quakes,
+    parse_table,
+    sort_quakes,
+)
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+class _PerRow(dict[str, str]):
+    """A stand-in region lookup that formats the place on every access."""
+
+    def __missing__(self, place: str) -> str:
+        return format_place(place)
+
+
+def _render(quakes: Any) -> None:
+    format_report(quakes, {'count': len(quakes), 'title': 'bench'}, '',
+                  DEFAULT_ORIGIN, SORT_LOCATION, '', 0.0, 106)
+
+
+def _time_phases(quakes: Any) -> tuple[float, float]:
+    """Seconds to location-sort `quakes`, then to render the sorted report."""
+    start = timer()
+    ordered = sort_quakes(quakes, SORT_LOCATION)
+    sorted_at = timer()
+    _render(ordered)
+    return sorted_at - start, timer() - sorted_at
+
+
+def _time_table(table: Any) -> tuple[float, float, float]:
+    """Seconds for order(), take() and rendering of a location sort."""
+    start = timer()
+    rows = table.order(SORT_LOCATION)
+    ordered_at = timer()
+    ordered = table.take(rows)
+    taken_at = timer()
+    _render(ordered)
+    return ordered_at - start, taken_at - ordered_at, timer() - taken_at
+
+
+def _best_of(runs: int, timed: Callable[[], tuple[float, ...]]
+             ) -> tuple[float, ...]:
+    timings = [timed() for _ in range(runs)]
+    return tuple(map(min, zip(*timings, strict=True)))
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 100_000
+    data = synthetic_geojson(count)
+    quakes, _ = parse_quakes(data, DEFAULT_ORIGIN)
+    print('{:,} events, {:,} distinct places'.format(
+        count, len({q.place for q in quakes})))
+    print('{:6} {:>22} {:>22}'.format('list', 'location sort', 'render report'))
+
+    def fresh() -> list[Quake]:  # Quakes cache their local time
+        return parse_quakes(data, DEFAULT_ORIGIN)[0]
+
+    def per_row(quakes: list[Quake]) -> dict[str, str]:
+        return _PerRow()
+
+    lookup = core._region_lookup
+    core._region_lookup = per_row
+    try:
+        before = _best_of(3, lambda: _time_phases(fresh()))
+    finally:
+        core._region_lookup = lookup
+    after = _best_of(3, lambda: _time_phases(fresh()))
+    print('{:6} {}'.format('', ' '.join(
+        '{:6.3f}s -> {:6.3f}s'.format(b, a)
+        for b, a in zip(before, after, strict=True))))
+
+    order, take, render = _best_of(
+        3, lambda: _time_table(parse_table(data, DEFAULT_ORIGIN)[0]))
+    print('table  order {:.3f}s + take {:.3f}s = sort {:.3f}s, '
+          'render {:.3f}s'.format(order, take, order + take, render))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,90 @@
+"""Benchmark the SQLite event database: bulk insert and indexed queries.
+
+Inserts a synthetic catalog into a temporary EventDatabase, re-inserts
+it (every event already stored, so each upsert is a no-op revision
+check), then times the FDSN-style queries `seismic --db` makes: a
+magnitude cut, a recent time window and radius queries around a point.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_sqlstore.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+from timeit import default_timer as timer
+from typing import Any
+
+from _synthetic import synthetic_features
+
+from seismic_reporting.core import DEFAULT_ORIGIN, QuakeTable
+from seismic_reporting.sqlstore import EventDatabase
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+_EPOCH = '1970-01-01T00:00:00'
+
+
+def _best_of(runs: int, func: Callable[[], Any]) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = timer()
+        func()
+        best = min(best, timer() - start)
+    return best
+
+
+def _table(count: int) -> QuakeTable:
+    table = QuakeTable()
+    for feature in synthetic_features(count):
+        props = feature['properties']
+        lon, lat, depth = feature['geometry']['coordinates']
+        table.append(props['mag'], props['place'], lat, lon, props['time'],
+                     depth_km=depth, event_id=feature['id'],
+                     updated_ms=props['time'] + 60_000,
+                     event_type='earthquake', status='reviewed')
+    return table
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 100_000
+    table = _table(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quakes.db')
+        with EventDatabase(path) as db:
+            start = timer()
+            db.insert(table)
+            print('{:,} events inserted in {:.2f}s, {:.1f} MB'.format(
+                count, timer() - start, os.path.getsize(path) / 1e6))
+            start = timer()
+            db.insert(table)
+            print('re-inserted (no changes) in {:.2f}s'.format(
+                timer() - start))
+
+            week = datetime.datetime.fromtimestamp(
+                (max(table.time_ms) - 7 * 86_400_000) / 1000,
+                datetime.timezone.utc).replace(tzinfo=None).isoformat()
+            queries: list[tuple[str, dict[str, Any]]] = [
+                ('M4.5+', {'min_mag': 4.5, 'starttime': _EPOCH}),
+                ('past week', {'min_mag': 0.0, 'starttime': week}),
+                ('100 km', {'min_mag': 0.0, 'starttime': _EPOCH,
+                            'lat': 19.4, 'lon': -155.3, 'radius_km': 100.0}),
+                ('1000 km', {'min_mag': 0.0, 'starttime': _EPOCH,
+                             'lat': 19.4, 'lon': -155.3,
+                             'radius_km': 1000.0}),
+            ]
+            for label, query in queries:
+                found = len(db.query(DEFAULT_ORIGIN, **query)[0])
+                seconds = _best_of(5, lambda query=query: db.query(
+                    DEFAULT_ORIGIN, **query))
+                print('{:10} {:8.1f} ms  {:>8,} events'.format(
+                    label, seconds * 1000, found))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""Benchmark the statistics header and the --stats section.
+
+Times the old three-pass magnitude summary (max(), statistics.mean() and
+statistics.median() over the magnitude column) against a MagnitudeStats
+pass, and the extended catalog statistics (histogram, Mc, b-value, rates
+and depths) against the sub-second budget for a year of global M1+
+events - roughly 150,000 of them.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_stats.py [EVENTS]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+from collections.abc import Callable
+from timeit import default_timer as timer
+from typing import Any
+
+from _synthetic import synthetic_geojson
+
+from seismic_reporting.core import (
+    DEFAULT_ORIGIN,
+    format_catalog_stats,
+    magnitude_summary,
+    parse_table,
+)
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+def _best_of(runs: int, func: Callable[[], Any]) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = timer()
+        func()
+        best = min(best, timer() - start)
+    return best
+
+
+def main(argv: list[str]) -> None:
+    count = int(argv[0]) if argv else 150_000
+    table, _ = parse_table(synthetic_geojson(count), DEFAULT_ORIGIN)
+    mags = table.mag
+    print('{:,} events'.format(count))
+
+    three_pass = _best_of(3, lambda: (max(mags), statistics.mean(mags),
+                                      statistics.median(mags)))
+    one_pass = _best_of(3, lambda: magnitude_summary(table))
+    print('summary line  three passes {:.3f}s   MagnitudeStats {:.3f}s'.format(
+        three_pass, one_pass))
+
+    section = _best_of(3, lambda: format_catalog_stats(
+        table.catalog_stats(365.0), 100))
+    print('--stats       {:.3f}s'.format(section))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
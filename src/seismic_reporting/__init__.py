@@ -8,43 +8,108 @@ tool (:mod:`seismic_reporting.cli`) and a Tkinter GUI
 
 from __future__ import annotations
 
+from seismic_reporting.cache import ResponseCache
 from seismic_reporting.core import (
     DEFAULT_ORIGIN,
+    EVENT_FIELDS,
     FDSN_ENDPOINT,
     SORT_DISTANCE,
     SORT_LOCATION,
     SORT_MAGNITUDE,
     SORT_TIME,
+    FDSNClient,
     Origin,
     Quake,
+    QuakeTable,
+    TransferStats,
     build_fdsn_url,
     fetch_geojson,
+    format_catalog_stats,
     format_report,
+    format_report_header,
+    format_site_reports,
+    iter_features,
+    iter_quakes,
+    iter_report,
+    iter_site_reports,
+    lookback_start,
     magnitude_summary,
+    open_geojson,
     parse_quakes,
+    parse_table,
     sort_quakes,
+    write_report,
 )
-from seismic_reporting.haversine import EARTH_RADIUS_KM, calc_dist
+from seismic_reporting.export import (
+    OUTPUT_FORMATS,
+    read_columnar,
+    record_fields,
+    write_columnar,
+    write_csv,
+    write_ndjson,
+)
+from seismic_reporting.haversine import (
+    EARTH_RADIUS_KM,
+    calc_dist,
+    calc_dist_matrix,
+    calc_dists,
+)
+from seismic_reporting.parallel import parse_table_parallel
+from seismic_reporting.spatial import SpatialIndex
+from seismic_reporting.sqlstore import EventDatabase
+from seismic_reporting.stats import CatalogStats, MagnitudeStats, catalog_stats
+from seismic_reporting.sync import sync_store
 
 __version__ = "1.2.0"
 __author__ = "Michael E. O'Connor"
 
 __all__ = [
     "DEFAULT_ORIGIN",
+    "EVENT_FIELDS",
     "FDSN_ENDPOINT",
     "SORT_DISTANCE",
     "SORT_LOCATION",
     "SORT_MAGNITUDE",
     "SORT_TIME",
     "EARTH_RADIUS_KM",
+    "OUTPUT_FORMATS",
+    "CatalogStats",
+    "EventDatabase",
+    "FDSNClient",
+    "MagnitudeStats",
     "Origin",
     "Quake",
+    "QuakeTable",
+    "ResponseCache",
+    "SpatialIndex",
+    "TransferStats",
     "build_fdsn_url",
     "calc_dist",
+    "calc_dist_matrix",
+    "calc_dists",
+    "catalog_stats",
     "fetch_geojson",
+    "format_catalog_stats",
     "format_report",
+    "format_report_header",
+    "format_site_reports",
+    "iter_features",
+    "iter_quakes",
+    "iter_report",
+    "iter_site_reports",
+    "lookback_start",
     "magnitude_summary",
+    "open_geojson",
     "parse_quakes",
+    "parse_table",
+    "parse_table_parallel",
+    "read_columnar",
+    "record_fields",
     "sort_quakes",
+    "sync_store",
+    "write_columnar",
+    "write_csv",
+    "write_ndjson",
+    "write_report",
     "__version__",
 ]
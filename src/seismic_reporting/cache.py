@@ -0,0 +1,236 @@
+"""On-disk cache of USGS FDSN responses.
+
+Response bodies are stored under the XDG cache directory, keyed on the
+normalised query URL; a "past N days" query is keyed on its look-back
+rather than its moving start time. An entry younger than the TTL is
+served without touching the network; an older one is revalidated with its ETag /
+Last-Modified validators, so an unchanged result costs a 304 instead of
+a full download. Total size is bounded by least-recently-used eviction.
+
+This module only manages storage; core.open_geojson() does the HTTP.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.message import Message
+from hashlib import sha256
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from seismic_reporting.util import atomic_write, parse_utc
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+DEFAULT_TTL_S: float = 300.0
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+# Values of ResponseCache.last_status.
+CACHE_HIT: str = 'cache hit'
+CACHE_MISS: str = 'cache miss'
+CACHE_REVALIDATED: str = 'cache revalidated'
+
+# Open-ended queries whose look-backs differ by less than this share an
+# entry: it covers lookback_start()'s minute flooring and the time the
+# response took to arrive.
+_LOOKBACK_SLACK_S: float = 300.0
+
+
+def default_cache_dir() -> Path:
+    """$XDG_CACHE_HOME/seismic-reporting, defaulting to ~/.cache."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'seismic-reporting'
+
+
+def _query_params(url: str) -> list[tuple[str, str]]:
+    return sorted((name.lower(), value) for name, value
+                  in parse_qsl(urlsplit(url).query, keep_blank_values=True))
+
+
+def _window_start(url: str) -> float | None:
+    """Epoch start of an open-ended query (`starttime`, no `endtime`).
+
+    None for a query with an end time, or without a readable start.
+    """
+    params = dict(_query_params(url))
+    if 'endtime' in params or 'starttime' not in params:
+        return None
+    try:
+        return parse_utc(params['starttime']).timestamp()
+    except ValueError:
+        return None
+
+
+def cache_key(url: str) -> str:
+    """Normalise a query URL so equivalent queries share one entry.
+
+    Scheme and host are lower-cased and query parameters are sorted by
+    (lower-cased) name, so parameter order does not matter. An
+    open-ended query ("the past N days", see _window_start()) is keyed
+    on its look-back in whole hours instead of its start time, which
+    moves on every run; ResponseCache.lookup() checks the look-back
+    more closely.
+    """
+    parts = urlsplit(url)
+    params = _query_params(url)
+    start = _window_start(url)
+    if start is not None:
+        params = [(name, value) for name, value in params
+                  if name != 'starttime']
+        params.append(('lookback_h', str(int(time.time() - start) // 3600)))
+    return '{}://{}{}?{}'.format(parts.scheme.lower(), parts.netloc.lower(),
+                                 parts.path, urlencode(params))
+
+
+@dataclass
+class CacheEntry:
+    """A stored response body plus the metadata needed to revalidate it."""
+
+    body: Path
+    stored_at: float  # epoch seconds of the last download or revalidation
+    etag: str | None = None
+    last_modified: str | None = None
+    start: float | None = None  # _window_start() of the stored query
+
+    def validators(self) -> dict[str, str]:
+        """Conditional-request headers for revalidating this entry."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded, TTL-governed store of response bodies on disk.
+
+    The directory is created on first store, so constructing a cache has
+    no side effects. `last_status` records how the most recent open was
+    served (CACHE_HIT, CACHE_MISS or CACHE_REVALIDATED) for display in the
+    report header.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = directory or default_cache_dir()
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.last_status = ''
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        digest = sha256(cache_key(url).encode('utf-8')).hexdigest()
+        return (self.directory / (digest + '.body'),
+                self.directory / (digest + '.json'))
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """The stored entry for `url`, or None if there is none.
+
+        For an open-ended query the entry must also cover the same
+        look-back: "the past day" stored an hour ago answers "the past
+        day" now (fresh or after revalidation), but not "the past week".
+        """
+        body, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text('utf-8'))
+        except (OSError, ValueError):
+            return None
+        if not body.exists():
+            return None
+        entry = CacheEntry(body, meta['stored_at'], meta.get('etag'),
+                           meta.get('last_modified'), meta.get('start'))
+        start = _window_start(url)
+        if start is not None:
+            if entry.start is None or abs(
+                    (entry.stored_at - entry.start) - (time.time() - start)
+            ) >= _LOOKBACK_SLACK_S:
+                return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """True while `entry` is within the TTL and needs no revalidation."""
+        return time.time() - entry.stored_at < self.ttl_s
+
+    def open_entry(self, entry: CacheEntry, status: str = CACHE_HIT) -> BinaryIO:
+        """Open a stored body for reading and mark it recently used."""
+        os.utime(entry.body)
+        self.last_status = status
+        return open(entry.body, 'rb')
+
+    def refresh(self, url: str, entry: CacheEntry,
+                headers: Mapping[str, str] | Message) -> BinaryIO:
+        """Record a successful revalidation (HTTP 304) and open the body."""
+        entry.stored_at = time.time()
+        entry.start = _window_start(url)
+        entry.etag = headers.get('ETag') or entry.etag
+        entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        self._write_meta(url, entry)
+        return self.open_entry(entry, CACHE_REVALIDATED)
+
+    def store(self, url: str, stream: BinaryIO,
+              headers: Mapping[str, str] | Message) -> BinaryIO:
+        """Copy a response body to disk, chunk by chunk, and open the copy.
+
+        The body is written to a temporary file and renamed into place, so
+        a concurrent reader never sees a partial entry.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        body, _ = self._paths(url)
+        with atomic_write(body) as tmp:
+            shutil.copyfileobj(stream, tmp)
+        entry = CacheEntry(body, time.time(), headers.get('ETag'),
+                           headers.get('Last-Modified'), _window_start(url))
+        self._write_meta(url, entry)
+        self._evict(keep=body)
+        return self.open_entry(entry, CACHE_MISS)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for path in self.directory.glob('*.body'):
+            self._remove(path)
+
+    def _write_meta(self, url: str, entry: CacheEntry) -> None:
+        _, meta_path = self._paths(url)
+        meta_path.write_text(json.dumps({
+            'url': url,
+            'stored_at': entry.stored_at,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'start': entry.start,
+        }), 'utf-8')
+
+    def _evict(self, keep: Path) -> None:
+        """Drop least-recently-used bodies until under max_bytes."""
+        entries = []
+        for path in self.directory.glob('*.body'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(body: Path) -> None:
+        for path in (body, body.with_suffix('.json')):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
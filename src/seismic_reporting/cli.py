@@ -8,31 +8,69 @@ Examples:
     seismic                                  # M2.5+, past day, near home
     seismic --radius 300 --min-mag 1.0       # within 300 km of home
     seismic --lat 37.77 --lon -122.42 --radius 100 --sort time --reverse
+    seismic --days 30 --sort magnitude --reverse --top 20
+    seismic --days 30 --min-mag 1.0 --stats  # b-value, rates, depths
     seismic --file saved.geojson --sort magnitude
+    seismic --file saved.geojson --radius 50 --sort magnitude
+    seismic --file saved.geojson --nearest 10
+    seismic --file big.geojson --workers 8
+    seismic --days 7 --format csv > week.csv
+    seismic --days 7 --format columnar > week.bin
+    seismic --days 7 --save-db quakes.db     # also keep the events
+    seismic --db quakes.db --days 7 --radius 100
+    seismic compile saved.geojson -o catalog.bin
+    seismic --file catalog.bin --sort magnitude
 """
 
 from __future__ import annotations
 
 import argparse
-import datetime
+import io
 import signal
+import sqlite3
 import sys
+from collections.abc import Iterator
+from pathlib import Path
 from timeit import default_timer as timer
+from typing import Any, BinaryIO
 
+from seismic_reporting.cache import DEFAULT_TTL_S, ResponseCache
 from seismic_reporting.core import (
     DEFAULT_ORIGIN,
+    EVENT_FIELDS,
     SORT_DISTANCE,
     SORT_LOCATION,
     SORT_MAGNITUDE,
     SORT_TIME,
+    FDSNClient,
     Origin,
+    QuakeTable,
+    TransferStats,
     build_fdsn_url,
-    fetch_geojson,
-    format_report,
+    format_catalog_stats,
+    iter_report,
+    iter_site_reports,
+    lookback_start,
     magnitude_summary,
-    parse_quakes,
+    open_geojson,
+    parse_table,
     sort_quakes,
+    write_report,
 )
+from seismic_reporting.export import (
+    COLUMNAR_MAGIC,
+    OUTPUT_FORMATS,
+    read_columnar,
+    write_columnar,
+    write_csv,
+    write_ndjson,
+)
+from seismic_reporting.parallel import parse_table_parallel
+from seismic_reporting.sharding import fetch_sharded
+from seismic_reporting.sqlstore import EventDatabase
+from seismic_reporting.stats import MagnitudeStats
+from seismic_reporting.sync import sync_store
+from seismic_reporting.util import atomic_write
 
 __author__ = "Michael E. O'Connor"
 __copyright__ = "Copyright 2026"
@@ -51,12 +89,25 @@ def _period_label(days: float) -> str:
     return 'Past {:g} {}'.format(days, unit)
 
 
+def _site(text: str) -> Origin:
+    """argparse type for --site: 'LAT,LON' or 'LAT,LON,NAME'."""
+    lat, sep, rest = text.partition(',')
+    lon, _, name = rest.partition(',')
+    try:
+        return Origin(float(lat), float(lon), name.strip() or text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected LAT,LON[,NAME], got {!r}".format(text)) from None
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Define and parse command-line options."""
     parser = argparse.ArgumentParser(
         prog='seismic',
         description="Query USGS earthquake data and list events sorted by "
-                    "magnitude, location, distance or time.")
+                    "magnitude, location, distance or time.",
+        epilog="'seismic compile GEOJSON -o PATH' compiles a saved catalog "
+               "for fast --file loading; see 'seismic compile -h'.")
 
     parser.add_argument('--lat', type=float, default=DEFAULT_ORIGIN.lat,
                         help='observer latitude (default: %(default)s)')
@@ -65,8 +116,12 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument('--name', default=DEFAULT_ORIGIN.name,
                         help='observer location label (default: %(default)s)')
     parser.add_argument('--radius', type=float, default=None, metavar='KM',
-                        help='restrict to events within KM of the observer '
+                        help='restrict to events within KM of the observer; '
+                             'with --file, filtered locally '
                              '(default: no radial limit)')
+    parser.add_argument('--nearest', type=int, default=None, metavar='K',
+                        help='report only the K events nearest the observer, '
+                             'found with a local spatial index')
     parser.add_argument('--min-mag', type=float, default=2.5,
                         help='minimum magnitude (default: %(default)s)')
     parser.add_argument('--days', type=float, default=1.0,
@@ -77,55 +132,330 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument('--reverse', action='store_true',
                         help='reverse the sort order')
     parser.add_argument('--limit', type=int, default=None,
-                        help='maximum number of events to request')
+                        help='maximum number of events to request '
+                             '(not with --sync or --shards)')
+    parser.add_argument('--top', type=int, default=None, metavar='N',
+                        help='report only the first N events in sort order, '
+                             'e.g. --sort magnitude --reverse --top 50 for '
+                             'the 50 strongest (statistics still cover all)')
+    parser.add_argument('--stats', action='store_true',
+                        help='add a statistics section: magnitude-frequency '
+                             'histogram, completeness magnitude and '
+                             'Gutenberg-Richter b-value, event rates and '
+                             'depths')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                        help='output format: the text report, or every '
+                             'event field as CSV, newline-delimited JSON or '
+                             'a columnar binary (default: %(default)s)')
     parser.add_argument('--width', type=int, default=100,
                         help='report width in characters (default: %(default)s)')
-    parser.add_argument('--file', metavar='PATH', default=None,
-                        help='read GeoJSON from PATH instead of querying USGS')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--file', metavar='PATH', default=None,
+                        help='read GeoJSON, or a catalog compiled with '
+                             "'seismic compile', from PATH instead of "
+                             'querying USGS')
+    source.add_argument('--sync', metavar='PATH', default=None,
+                        help='keep a local event store at PATH, fetching only '
+                             'events updated since the last run, and report '
+                             'from it')
+    source.add_argument('--db', metavar='PATH', default=None,
+                        help='report from the SQLite event database at PATH '
+                             '(see --save-db), applying --min-mag, --days, '
+                             '--radius and --limit locally, with no network')
+    parser.add_argument('--save-db', metavar='PATH', default=None,
+                        help='also add the events read to the SQLite event '
+                             'database at PATH, creating it if needed; a '
+                             'newer revision of a stored event replaces it')
+    parser.add_argument('--shards', type=int, default=1, metavar='N',
+                        help='split the time window into N shards fetched '
+                             'in parallel, subdividing any shard that hits '
+                             'the USGS result limit (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='parse a GeoJSON --file in N processes, for '
+                             'catalogs of hundreds of MB '
+                             '(default: %(default)s)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL_S,
+                        metavar='SECONDS',
+                        help='reuse a cached USGS response younger than this '
+                             'without revalidating it (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='bypass the on-disk response cache')
+    parser.add_argument('--site', type=_site, action='append', default=[],
+                        metavar='LAT,LON[,NAME]', dest='sites',
+                        help='measure distance from this site instead of '
+                             'the observer; repeat for several sites, and '
+                             'each event is reported against its nearest')
+    parser.add_argument('--per-site', action='store_true',
+                        help='with several --site options, print a separate '
+                             'report section for each site')
+    args = parser.parse_args(argv)
+    if args.format != 'text' and (args.stats or args.per_site):
+        parser.error('--stats and --per-site apply only to --format text')
+    if args.db and args.save_db:
+        parser.error('--save-db cannot be combined with --db')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.top is not None and args.top < 1:
+        parser.error('--top must be at least 1')
+    if args.nearest is not None and args.nearest < 1:
+        parser.error('--nearest must be at least 1')
+    if args.limit is not None and (args.sync or args.shards > 1):
+        parser.error('--limit cannot be combined with --sync or --shards')
+    return args
+
+
+def parse_compile_args(argv: list[str]) -> argparse.Namespace:
+    """Define and parse options for the `seismic compile` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog='seismic compile',
+        description="Compile a saved GeoJSON catalog into a columnar file "
+                    "that 'seismic --file' memory-maps instead of parsing.")
+    parser.add_argument('source', metavar='GEOJSON',
+                        help='saved GeoJSON catalog to compile')
+    parser.add_argument('-o', '--output', required=True, metavar='PATH',
+                        help='columnar catalog file to write')
+    parser.add_argument('--lat', type=float, default=DEFAULT_ORIGIN.lat,
+                        help='latitude to store distances from; reports '
+                             'from elsewhere re-measure (default: '
+                             '%(default)s)')
+    parser.add_argument('--lon', type=float, default=DEFAULT_ORIGIN.lon,
+                        help='longitude to store distances from '
+                             '(default: %(default)s)')
+    parser.add_argument('--name', default=DEFAULT_ORIGIN.name,
+                        help='location label (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help='parse in N processes (default: one per CPU)')
     return parser.parse_args(argv)
 
 
+def compile_catalog(argv: list[str]) -> int:
+    """Run `seismic compile`: GeoJSON in, columnar catalog out."""
+    args = parse_compile_args(argv)
+    start = timer()
+    try:
+        table, meta = parse_table_parallel(
+            args.source, Origin(args.lat, args.lon, args.name),
+            workers=args.workers)
+    except OSError as err:
+        print('Error reading {}: {}'.format(args.source, err),
+              file=sys.stderr)
+        return 1
+    # Written aside and renamed into place, so a reader that has the old
+    # file mapped keeps a consistent copy.
+    try:
+        with atomic_write(args.output) as tmp:
+            write_columnar(tmp, table, meta)
+    except OSError as err:
+        print('Error writing {}: {}'.format(args.output, err),
+              file=sys.stderr)
+        return 1
+    print('Compiled {:,} events from {} into {} in {:.2f} seconds'.format(
+        len(table), args.source, args.output, timer() - start))
+    return 0
+
+
+def _is_columnar(source: BinaryIO) -> bool:
+    """Whether the file `source` holds a compiled columnar catalog.
+
+    Peeks at the buffered stream rather than reading and seeking back,
+    so a pipe such as /dev/stdin is left unconsumed.
+    """
+    if isinstance(source, io.BufferedReader):
+        magic = source.peek(len(COLUMNAR_MAGIC))[:len(COLUMNAR_MAGIC)]
+    elif source.seekable():
+        magic = source.read(len(COLUMNAR_MAGIC))
+        source.seek(0)
+    else:
+        return False
+    return magic == COLUMNAR_MAGIC
+
+
+def _write_records(
+    output_format: str, quakes: QuakeTable, meta: dict[str, Any]
+) -> None:
+    """Write `quakes` to stdout in a machine-readable --format."""
+    if output_format == 'csv':
+        write_csv(sys.stdout, quakes)
+    elif output_format == 'ndjson':
+        write_ndjson(sys.stdout, quakes)
+    else:
+        sys.stdout.flush()
+        write_columnar(sys.stdout.buffer, quakes, meta)
+        sys.stdout.buffer.flush()
+
+
 def main(argv: list[str] | None = None) -> int:
-    """Run a query (or load a file) and print the formatted report."""
+    """Run a query (or load a file) and print the formatted report.
+
+    `seismic compile ...` runs compile_catalog() instead.
+    """
     # Restore default SIGPIPE handling so 'seismic | head' terminates
     # quietly when the reader closes the pipe, instead of raising
     # BrokenPipeError. SIGPIPE is absent on Windows, hence the guard.
     if hasattr(signal, 'SIGPIPE'):
         signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ['compile']:
+        return compile_catalog(argv[1:])
     args = parse_args(argv)
     origin = Origin(args.lat, args.lon, args.name)
+    sites = args.sites or [origin]
     sort_code = _SORT_CODES[args.sort]
 
-    if args.file:
+    # The document is parsed straight off the file or socket, one feature
+    # at a time, so even a multi-GB saved catalog is never held whole.
+    with FDSNClient() as client:
+        transfer = TransferStats()
+        source: BinaryIO
+        if args.file:
+            try:
+                source = open(args.file, 'rb')
+            except OSError as err:
+                print('Error reading {}: {}'.format(args.file, err),
+                      file=sys.stderr)
+                return 1
+            period_label = ''
+            source_error = 'Error reading {}'.format(args.file)
+            fetch_note = ''
+        elif args.db:
+            period_label = _period_label(args.days)
+            source_error = 'Error reading {}'.format(args.db)
+            fetch_note = 'local database'
+        elif args.sync:
+            try:
+                synced = sync_store(Path(args.sync), args.min_mag, args.days,
+                                    lat=args.lat, lon=args.lon,
+                                    radius_km=args.radius, client=client,
+                                    stats=transfer)
+                source = open(args.sync, 'rb')
+            except RuntimeError as err:
+                print('Error retrieving data: {}'.format(err), file=sys.stderr)
+                return 1
+            except OSError as err:
+                print('Error updating {}: {}'.format(args.sync, err),
+                      file=sys.stderr)
+                return 1
+            period_label = _period_label(args.days)
+            source_error = 'Error reading {}'.format(args.sync)
+            fetch_note = synced.summary()
+        elif args.shards > 1:
+            try:
+                source = fetch_sharded(
+                    args.min_mag, lookback_start(args.days), lat=args.lat,
+                    lon=args.lon, radius_km=args.radius, shards=args.shards,
+                    client=client, stats=transfer)
+            except RuntimeError as err:
+                print('Error retrieving data: {}'.format(err), file=sys.stderr)
+                return 1
+            period_label = _period_label(args.days)
+            source_error = 'Error retrieving data'
+            fetch_note = '{} shards'.format(args.shards)
+        else:
+            url = build_fdsn_url(args.min_mag, lookback_start(args.days),
+                                 lat=args.lat, lon=args.lon,
+                                 radius_km=args.radius, limit=args.limit)
+            cache = (None if args.no_cache
+                     else ResponseCache(ttl_s=args.cache_ttl))
+            try:
+                source = open_geojson(url, cache=cache, client=client,
+                                      stats=transfer)
+            except RuntimeError as err:
+                print('Error retrieving data: {}'.format(err), file=sys.stderr)
+                return 1
+            period_label = _period_label(args.days)
+            source_error = 'Error retrieving data'
+            fetch_note = cache.last_status if cache else ''
+
+        start = timer()
+        mag_stats = MagnitudeStats()
+        # Decode only the optional event fields the report shows; the
+        # machine-readable formats and the database carry them all.
+        if args.format != 'text' or args.save_db:
+            fields = EVENT_FIELDS
+        else:
+            fields = ('depth_km',) if args.stats else ()
+        if args.db:
+            try:
+                with EventDatabase(args.db, create=False) as db:
+                    quakes, meta = db.query(
+                        sites, args.min_mag, lookback_start(args.days),
+                        lat=args.lat, lon=args.lon, radius_km=args.radius,
+                        limit=args.limit, mag_stats=mag_stats, fields=fields)
+            except (sqlite3.Error, ValueError) as err:
+                print('{}: {}'.format(source_error, err), file=sys.stderr)
+                return 1
+        else:
+            with source:
+                try:
+                    # A compiled catalog is mapped, not parsed; see
+                    # compile_catalog().
+                    if args.file and _is_columnar(source):
+                        # A pipe cannot be mapped; read it into memory.
+                        quakes, meta = read_columnar(
+                            source if source.seekable() else source.read(),
+                            sites, mag_stats, fields)
+                    elif args.file and args.workers > 1 and source.seekable():
+                        quakes, meta = parse_table_parallel(
+                            args.file, sites, mag_stats, fields, args.workers)
+                    else:
+                        quakes, meta = parse_table(source, sites, mag_stats,
+                                                   fields)
+                except OSError as err:
+                    print('{}: {}'.format(source_error, err), file=sys.stderr)
+                    return 1
+    notes = [fetch_note, transfer.summary()]
+    if args.save_db:
         try:
-            with open(args.file, 'rb') as handle:
-                data = handle.read()
-        except OSError as err:
-            print('Error reading {}: {}'.format(args.file, err),
+            with EventDatabase(args.save_db) as db:
+                saved = db.insert(quakes)
+        except (sqlite3.Error, ValueError) as err:
+            print('Error updating {}: {}'.format(args.save_db, err),
                   file=sys.stderr)
             return 1
-        period_label = ''
+        notes.append('{:,} saved'.format(saved))
+    # A saved catalog was not filtered by USGS, and --nearest is always
+    # local: both are answered from the table's spatial index.
+    filtered = False
+    if args.file and args.radius is not None:
+        quakes = quakes.within(origin.lat, origin.lon, args.radius)
+        notes.append('within {:g} km'.format(args.radius))
+        filtered = True
+    if args.nearest is not None:
+        quakes = quakes.nearest(origin.lat, origin.lon, args.nearest)
+        notes.append('nearest {}'.format(args.nearest))
+        filtered = True
+    if filtered:
+        meta['count'] = len(quakes)
+        mag_stats = MagnitudeStats.of(quakes.known_mags())
+    if args.format != 'text':
+        _write_records(args.format,
+                       sort_quakes(quakes, sort_code, args.reverse, args.top),
+                       meta)
+        return 0
+    if args.top is not None:
+        notes.append('top {}'.format(args.top))
+    fetch_note = '; '.join(note for note in notes if note)
+    stats = magnitude_summary(mag_stats)
+    section = ''
+    if args.stats:
+        span_days = None if args.file else args.days
+        section = format_catalog_stats(quakes.catalog_stats(span_days),
+                                       args.width)
+    # Rows are formatted as they are written, so output starts at once
+    # and 'seismic | head' stops the work when the pipe closes.
+    pieces: Iterator[str]
+    if args.per_site:
+        pieces = iter_site_reports(quakes, meta, period_label, sort_code,
+                                   args.reverse, stats, timer() - start,
+                                   args.width, fetch_note, args.top, section)
     else:
-        starttime = (datetime.datetime.now(datetime.timezone.utc)
-                     - datetime.timedelta(days=args.days)
-                     ).strftime('%Y-%m-%dT%H:%M:%S')
-        url = build_fdsn_url(args.min_mag, starttime,
-                             lat=args.lat, lon=args.lon,
-                             radius_km=args.radius, limit=args.limit)
-        try:
-            data = fetch_geojson(url)
-        except RuntimeError as err:
-            print('Error retrieving data: {}'.format(err), file=sys.stderr)
-            return 1
-        period_label = _period_label(args.days)
-
-    start = timer()
-    quakes, meta = parse_quakes(data, origin)
-    stats = magnitude_summary(quakes)
-    quakes = sort_quakes(quakes, sort_code, args.reverse)
-    report = format_report(quakes, meta, period_label, origin, sort_code,
-                           stats, timer() - start, args.width)
-    print(report)
+        quakes = sort_quakes(quakes, sort_code, args.reverse, args.top)
+        pieces = iter_report(quakes, meta, period_label, sites[0], sort_code,
+                             stats, timer() - start, args.width, fetch_note,
+                             section)
+    write_report(sys.stdout, pieces)
+    sys.stdout.write('\n')
     return 0
 
 
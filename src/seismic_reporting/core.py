@@ -10,18 +10,33 @@ FDSN event service: https://earthquake.usgs.gov/fdsnws/event/1/
 
 from __future__ import annotations
 
+import base64
+import codecs
 import datetime
+import heapq
+import http.client
+import io
 import json
-from collections.abc import Callable
-from dataclasses import dataclass
-from operator import attrgetter
-from statistics import mean, median
-from typing import Any, cast
+import math
+import re
+import threading
+import time
+import zlib
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import compress
+from operator import attrgetter, itemgetter
+from typing import Any, BinaryIO, TextIO, cast, overload
 from urllib.error import HTTPError
-from urllib.parse import urlencode
-from urllib.request import urlopen
+from urllib.parse import unquote, urlencode, urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 
-from seismic_reporting.haversine import calc_dist
+from seismic_reporting.cache import ResponseCache
+from seismic_reporting.haversine import calc_dist, calc_dist_matrix
+from seismic_reporting.spatial import SpatialIndex
+from seismic_reporting.stats import CatalogStats, MagnitudeStats, catalog_stats
 
 __author__ = "Michael E. O'Connor"
 __copyright__ = "Copyright 2026"
@@ -49,15 +64,70 @@ _EMPTY_GEOJSON: bytes = (
     b'"features":[]}'
 )
 
+# Bytes read per call when parsing a GeoJSON stream incrementally.
+_CHUNK_SIZE: int = 1 << 16
 
-@dataclass
+_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+
+# Strings (or a lone quote opening an unterminated one) and brackets:
+# enough to tell whether a JSON value is complete without decoding it.
+_JSON_TOKENS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}"]')
+_SCALAR_END = re.compile(r'[ \t\n\r,\]}]')
+
+# Content-Encodings FDSNClient asks for and undoes transparently.
+_ACCEPT_ENCODING: str = 'gzip, deflate'
+
+# Redirect statuses FDSNClient follows, and how many in a row (as urllib).
+_REDIRECT_CODES = frozenset((301, 302, 303, 307, 308))
+_MAX_REDIRECTS: int = 10
+
+
+# Optional per-event fields, decoded unless a parse projects them away.
+EVENT_FIELDS: tuple[str, ...] = ('event_id', 'depth_km', 'updated_ms',
+                                 'mag_type', 'event_type', 'status')
+
+# EVENT_FIELDS stored in QuakeTable as indices into its `labels`.
+_LABEL_FIELDS = frozenset({'mag_type', 'event_type', 'status'})
+
+
+@dataclass(slots=True)
 class Quake:
-    """A single seismic event, with distance pre-computed from the observer."""
+    """A single seismic event, with distance pre-computed from the observer.
+
+    The origin time is kept as USGS epoch milliseconds; `time`, the
+    host-local datetime used for display, is converted on first access,
+    so records that are sorted or counted but never rendered skip it.
+
+    The fields after `time_ms` are the rest of the USGS event: they keep
+    their defaults when the parse that built the record left them out
+    (see EVENT_FIELDS). Records are slotted, with no per-instance dict.
+
+    An event the feed gave no magnitude has `mag` 0.00 for display and
+    `mag_known` False, so statistics can leave it out.
+    """
 
     mag: float
     place: str  # raw USGS place string
     distance_km: float
-    time: datetime.datetime  # timezone-aware, host local zone
+    time_ms: int  # epoch milliseconds, UTC
+    lat: float = math.nan
+    lon: float = math.nan
+    depth_km: float = math.nan
+    event_id: str = ''  # USGS event id, e.g. 'hv74103036'
+    updated_ms: int = 0  # epoch milliseconds of the last revision
+    mag_type: str = ''  # e.g. 'md', 'ml', 'mww'
+    event_type: str = ''  # e.g. 'earthquake', 'quarry blast'
+    status: str = ''  # 'automatic', 'reviewed' or 'deleted'
+    mag_known: bool = True  # False when `mag` stands in for JSON null
+    _time: datetime.datetime | None = field(
+        default=None, init=False, repr=False, compare=False)
+
+    @property
+    def time(self) -> datetime.datetime:
+        """Origin time, timezone-aware in the host's local zone."""
+        if self._time is None:
+            self._time = _local_time(self.time_ms)
+        return self._time
 
 
 @dataclass
@@ -101,15 +171,785 @@ def format_place(place: str) -> str:
     return ', '.join(parts)
 
 
-def _place_key(quake: Quake) -> str:
-    """Sort key for location ordering (region-first form)."""
-    return format_place(quake.place)
+def _region_lookup(quakes: list[Quake]) -> dict[str, str]:
+    """format_place() of each distinct place in `quakes`, keyed by place.
+
+    USGS place strings repeat heavily, so a list of Quakes is sorted and
+    rendered by location from this per-call table, as a QuakeTable is
+    from its region_places(), formatting each place once.
+    """
+    return {place: format_place(place)
+            for place in {q.place for q in quakes}}
+
+
+_DAY_MS: int = 86_400_000
+
+# UTC day number -> the host zone's fixed offset throughout that day, or
+# None when a DST change falls within it. Filled on demand by _local_time().
+_day_zones: dict[int, datetime.tzinfo | None] = {}
+
+
+def _day_zone(day: int) -> datetime.tzinfo | None:
+    """The host's local offset for a whole UTC day, if it does not change."""
+    first, last = (datetime.datetime.fromtimestamp(
+        seconds, tz=datetime.timezone.utc).astimezone()
+        for seconds in (day * 86_400, day * 86_400 + 86_399))
+    if (first.utcoffset(), first.tzname()) != (last.utcoffset(), last.tzname()):
+        return None
+    return first.tzinfo
+
+
+def _local_time(time_ms: float) -> datetime.datetime:
+    """Convert USGS epoch milliseconds (UTC) to an aware host-local datetime.
+
+    The local-zone lookup (astimezone()) is done once per UTC day and the
+    resulting fixed offset reused for every event on that day; only days
+    containing a DST change fall back to a per-event lookup.
+    """
+    day = int(time_ms // _DAY_MS)
+    try:
+        zone = _day_zones[day]
+    except KeyError:
+        zone = _day_zones[day] = _day_zone(day)
+    if zone is None:
+        return datetime.datetime.fromtimestamp(
+            time_ms / 1000.0, tz=datetime.timezone.utc).astimezone()
+    return datetime.datetime.fromtimestamp(time_ms / 1000.0, tz=zone)
+
+
+# --------------------------------------------------------------------------
+# Columnar storage for catalog-scale result sets
+# --------------------------------------------------------------------------
+
+def _gather(column: Sequence[Any], rows: list[int]) -> list[Any]:
+    """[column[row] for row in rows], with the indexing done in C."""
+    if len(rows) < 2:  # itemgetter() of one index returns a bare item
+        return [column[row] for row in rows]
+    return list(itemgetter(*rows)(column))
+
+
+class QuakeTable:
+    """Column-oriented set of quakes backed by typed arrays.
+
+    Each event costs a few dozen bytes (six doubles, two int64 epoch-ms
+    times, an id and small label indices) instead of a dataclass instance
+    with its own datetime. Place strings are interned: `places` holds
+    each distinct string once and `place_id` indexes into it; the
+    magnitude type, event type and review status share the `labels`
+    table the same way. Quake records are materialised only on indexing
+    or iteration, i.e. at format time.
+
+    `fields` chooses which of the optional EVENT_FIELDS columns are kept
+    (and decoded by parse_table()); the others stay empty and read back
+    as Quake defaults.
+
+    An event the feed gave no magnitude reads back as M0.00, as in a
+    Quake; `mag_known` is 0 for it, and known_mags() and the catalog
+    statistics leave it out.
+
+    Distances may be measured from several observer sites at once (see
+    measure_from_sites()): `site_km[i]` is then the distance column for
+    `sites[i]`, and `distance_km` / `nearest_site` hold each event's
+    distance to, and index of, its nearest site.
+
+    The pipeline functions (magnitude_summary, sort_quakes, format_report)
+    accept a QuakeTable anywhere they accept a list of Quakes.
+
+    A table opened from a compiled catalog (export.read_columnar()) holds
+    read-only memoryviews of the mapped file in place of arrays; it can
+    be sorted, filtered and measured but not appended to.
+    """
+
+    # Per-row columns, all kept the same length. Each of `fields` adds
+    # its own column of that name, also the same length.
+    _COLUMNS = ('mag', 'mag_known', 'lat', 'lon', 'distance_km', 'time_ms',
+                'place_id', 'nearest_site')
+
+    def __init__(self, fields: Iterable[str] = EVENT_FIELDS) -> None:
+        self.fields = frozenset(fields)
+        unknown = self.fields.difference(EVENT_FIELDS)
+        if unknown:
+            raise ValueError('unknown event fields: {}'.format(
+                ', '.join(sorted(unknown))))
+        self.mag = array('d')
+        self.mag_known = array('B')
+        self.lat = array('d')
+        self.lon = array('d')
+        self.distance_km = array('d')
+        self.time_ms = array('q')
+        self.place_id = array('I')
+        self.nearest_site = array('H')
+        self.event_id: list[str] = []
+        self.depth_km = array('d')
+        self.updated_ms = array('q')
+        self.mag_type = array('H')
+        self.event_type = array('H')
+        self.status = array('H')
+        self.places: list[str] = []
+        self._place_ids: dict[str, int] = {}
+        self.labels: list[str] = []
+        self._label_ids: dict[str, int] = {}
+        self._region_places: list[str] = []
+        self.sites: list[Origin] = []
+        self.site_km: list[array[float]] = []
+        self._index: SpatialIndex | None = None
+
+    def __len__(self) -> int:
+        return len(self.mag)
+
+    def __getitem__(self, row: int) -> Quake:
+        fields, labels = self.fields, self.labels
+        return Quake(
+            mag=self.mag[row],
+            place=self.places[self.place_id[row]],
+            distance_km=self.distance_km[row],
+            time_ms=self.time_ms[row],
+            lat=self.lat[row],
+            lon=self.lon[row],
+            depth_km=self.depth_km[row] if 'depth_km' in fields else math.nan,
+            event_id=self.event_id[row] if 'event_id' in fields else '',
+            updated_ms=self.updated_ms[row] if 'updated_ms' in fields else 0,
+            mag_type=(labels[self.mag_type[row]]
+                      if 'mag_type' in fields else ''),
+            event_type=(labels[self.event_type[row]]
+                        if 'event_type' in fields else ''),
+            status=labels[self.status[row]] if 'status' in fields else '',
+            mag_known=bool(self.mag_known[row]),
+        )
+
+    def _columns(self) -> list[str]:
+        """Names of every populated per-row column."""
+        return [*self._COLUMNS,
+                *(name for name in EVENT_FIELDS if name in self.fields)]
+
+    def _label(self, text: str) -> int:
+        label_id = self._label_ids.get(text)
+        if label_id is None:
+            label_id = self._label_ids[text] = len(self.labels)
+            self.labels.append(text)
+        return label_id
+
+    def __iter__(self) -> Iterator[Quake]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def region_places(self) -> list[str]:
+        """format_place() of each distinct place, indexed like `places`.
+
+        Computed once per distinct place and kept, so location sorting and
+        rendering never reformat a place string per row.
+        """
+        done = len(self._region_places)
+        if done < len(self.places):
+            self._region_places.extend(map(format_place, self.places[done:]))
+        return self._region_places
+
+    def _region_ranks(self) -> list[int]:
+        """Each place's position in region_places() sort order (ties equal)."""
+        region = self.region_places()
+        ranks = [0] * len(region)
+        rank, previous = -1, None
+        for place_id in sorted(range(len(region)), key=region.__getitem__):
+            if region[place_id] != previous:
+                rank, previous = rank + 1, region[place_id]
+            ranks[place_id] = rank
+        return ranks
+
+    def append(
+        self,
+        mag: float,
+        place: str,
+        lat: float,
+        lon: float,
+        time_ms: int,
+        distance_km: float = math.nan,
+        depth_km: float = math.nan,
+        event_id: str = '',
+        updated_ms: int = 0,
+        mag_type: str = '',
+        event_type: str = '',
+        status: str = '',
+        mag_known: bool = True,
+    ) -> None:
+        """Add one event, interning its place string.
+
+        Distance is normally left unset here and filled for the whole
+        table at once by measure_from() or measure_from_sites(). An
+        unknown depth is NaN; an unknown magnitude is passed as 0.0 with
+        `mag_known` False. Values for fields outside `fields` are ignored.
+        """
+        self._append_row(mag, place, lat, lon, time_ms, distance_km,
+                         mag_known)
+        fields = self.fields
+        if 'event_id' in fields:
+            self.event_id.append(event_id)
+        if 'depth_km' in fields:
+            self.depth_km.append(depth_km)
+        if 'updated_ms' in fields:
+            self.updated_ms.append(updated_ms)
+        if 'mag_type' in fields:
+            self.mag_type.append(self._label(mag_type))
+        if 'event_type' in fields:
+            self.event_type.append(self._label(event_type))
+        if 'status' in fields:
+            self.status.append(self._label(status))
+
+    def _append_row(
+        self,
+        mag: float,
+        place: str,
+        lat: float,
+        lon: float,
+        time_ms: int,
+        distance_km: float = math.nan,
+        mag_known: bool = True,
+    ) -> None:
+        """append() for the always-present columns only.
+
+        Callers append to the `fields` columns themselves - see
+        _field_appenders() - so every column stays the same length.
+        """
+        place_id = self._place_ids.get(place)
+        if place_id is None:
+            place_id = self._place_ids[place] = len(self.places)
+            self.places.append(place)
+        self.mag.append(mag)
+        self.mag_known.append(mag_known)
+        self.lat.append(lat)
+        self.lon.append(lon)
+        self.distance_km.append(distance_km)
+        self.time_ms.append(time_ms)
+        self.place_id.append(place_id)
+        self.nearest_site.append(0)
+
+    def _field_appenders(self) -> list[Callable[[Any], None]]:
+        """Per-field append callables for `fields`, in EVENT_FIELDS order.
+
+        Label fields are interned on the way in.
+        """
+        appenders: list[Callable[[Any], None]] = []
+        for name in EVENT_FIELDS:
+            if name not in self.fields:
+                continue
+            column = getattr(self, name)
+            if name in _LABEL_FIELDS:
+                appenders.append(self._label_appender(column))
+            else:
+                appenders.append(column.append)
+        return appenders
+
+    def _label_appender(self, column: array[int]) -> Callable[[str], None]:
+        def append(text: str) -> None:
+            column.append(self._label(text))
+        return append
+
+    def measure_from(self, origin: Origin) -> None:
+        """(Re)compute the distance column from `origin` in one batch."""
+        self.measure_from_sites([origin])
+
+    def measure_from_sites(self, sites: Sequence[Origin]) -> None:
+        """Compute the events x sites distance matrix in one pass.
+
+        Fills `site_km` with one column per site, and `distance_km` and
+        `nearest_site` with each event's nearest site.
+        """
+        if not sites:
+            raise ValueError('at least one site is required')
+        self.sites = list(sites)
+        self.site_km = calc_dist_matrix(
+            [(site.lat, site.lon) for site in sites], self.lat, self.lon)
+        if len(sites) == 1:
+            self.distance_km = self.site_km[0]
+            self.nearest_site = array('H', bytes(2 * len(self)))
+            return
+        self.distance_km = array('d')
+        self.nearest_site = array('H')
+        for dists in zip(*self.site_km, strict=True):
+            nearest = min(dists)
+            self.distance_km.append(nearest)
+            self.nearest_site.append(dists.index(nearest))
+
+    def for_site(self, index: int) -> QuakeTable:
+        """A view of this table measured from `sites[index]` alone.
+
+        Columns other than distance are shared, not copied.
+        """
+        table = QuakeTable(self.fields)
+        for name in self._columns():
+            setattr(table, name, getattr(self, name))
+        table._share_strings(self)
+        table.sites = [self.sites[index]]
+        table.site_km = [self.site_km[index]]
+        table.distance_km = self.site_km[index]
+        table.nearest_site = array('H', bytes(2 * len(self)))
+        table._index = self._index
+        return table
+
+    def _share_strings(self, other: QuakeTable) -> None:
+        """Use `other`'s interned place and label tables."""
+        self.places = other.places
+        self._place_ids = other._place_ids
+        self._region_places = other._region_places
+        self.labels = other.labels
+        self._label_ids = other._label_ids
+
+    def _set_strings(self, places: list[str], labels: list[str]) -> None:
+        """Adopt interned place and label tables, e.g. read from a file."""
+        self.places = places
+        self._place_ids = {place: n for n, place in enumerate(places)}
+        self._region_places = []
+        self.labels = labels
+        self._label_ids = {label: n for n, label in enumerate(labels)}
+
+    def take(self, rows: Iterable[int]) -> QuakeTable:
+        """Return a new table holding `rows`, in the given order.
+
+        The place and label string tables are shared with this table, not
+        copied.
+        """
+        rows = list(rows)
+        table = QuakeTable(self.fields)
+        table._share_strings(self)
+        table.sites = self.sites
+        single_site = len(self.site_km) < 2
+        for name in self._columns():
+            if name == 'nearest_site' and single_site:  # all zeros
+                table.nearest_site = array('H', bytes(2 * len(rows)))
+                continue
+            values = _gather(getattr(self, name), rows)
+            if name == 'event_id':
+                table.event_id = values
+            else:
+                getattr(table, name).fromlist(values)
+        # One site's column is distance_km itself; it is not copied twice.
+        table.site_km = [table.distance_km if column is self.distance_km
+                         else array('d', _gather(column, rows))
+                         for column in self.site_km]
+        return table
+
+    def extend(self, other: QuakeTable) -> None:
+        """Append every row of `other`, which must share `fields` and `sites`.
+
+        Its places and labels are interned into this table's string
+        tables, so joining the tables parsed from consecutive parts of a
+        feed gives the table one parse of the whole feed would.
+        """
+        if other.fields != self.fields or other.sites != self.sites:
+            raise ValueError('tables differ in fields or sites')
+        place_ids = []
+        for place in other.places:
+            place_id = self._place_ids.get(place)
+            if place_id is None:
+                place_id = self._place_ids[place] = len(self.places)
+                self.places.append(place)
+            place_ids.append(place_id)
+        label_ids = list(map(self._label, other.labels))
+        for name in self._columns():
+            column, more = getattr(self, name), getattr(other, name)
+            if name == 'place_id':
+                column.extend(map(place_ids.__getitem__, more))
+            elif name in _LABEL_FIELDS:
+                column.extend(map(label_ids.__getitem__, more))
+            elif not (name == 'distance_km' and self.site_km
+                      and column is self.site_km[0]):
+                column.extend(more)
+        for column, more in zip(self.site_km, other.site_km, strict=True):
+            column.extend(more)
+
+    def order(
+        self, sort_code: int, reverse: bool = False, top: int | None = None
+    ) -> list[int]:
+        """Row indices in the order sort_quakes() would produce.
+
+        With `top`, only the first `top` rows of that order are returned,
+        selected with a heap in O(n log top) rather than a full sort.
+
+        Keys are read straight from the columns; for SORT_LOCATION each
+        row's key is its place's rank in region-first order, so rows are
+        compared as ints and each place is formatted only once.
+        """
+        keys: Any
+        if sort_code == SORT_LOCATION:
+            keys = list(map(self._region_ranks().__getitem__, self.place_id))
+        elif sort_code == SORT_DISTANCE:
+            keys = self.distance_km
+        elif sort_code == SORT_TIME:
+            keys = self.time_ms
+        else:
+            keys = self.mag
+        return _ordered(range(len(self)), keys.__getitem__, reverse, top)
+
+    def known_mags(self) -> Sequence[float]:
+        """The `mag` column without the events the feed gave no magnitude."""
+        if all(self.mag_known):
+            return self.mag
+        return list(compress(self.mag, self.mag_known))
+
+    def catalog_stats(self, span_days: float | None = None) -> CatalogStats:
+        """Histogram, Mc, b-value, rates and depths; see stats.catalog_stats().
+
+        Computed from whole columns. `span_days` is the window the rates
+        are averaged over, normally the query's look-back. Events with no
+        magnitude count towards the rates but not the magnitude bins.
+        """
+        mags: Sequence[float] = self.mag
+        if not all(self.mag_known):
+            mags = [mag if known else math.nan
+                    for mag, known in zip(self.mag, self.mag_known,
+                                          strict=True)]
+        return catalog_stats(mags, self.time_ms, self.depth_km, span_days)
+
+    def spatial_index(self) -> SpatialIndex:
+        """A SpatialIndex over the event coordinates, built on first use.
+
+        Kept with the table (and shared by for_site() views) so repeated
+        radius and nearest queries reuse it; rebuilt if rows were added.
+        """
+        if self._index is None or len(self._index) != len(self):
+            self._index = SpatialIndex(self.lat, self.lon)
+        return self._index
+
+    def within(self, lat: float, lon: float, radius_km: float) -> QuakeTable:
+        """The events within `radius_km` of (lat, lon), in feed order.
+
+        The local counterpart of build_fdsn_url()'s radius filter, for a
+        catalog already loaded; see spatial_index().
+        """
+        found = self.spatial_index().within(lat, lon, radius_km)
+        return self.take(row for _, row in found)
+
+    def nearest(self, lat: float, lon: float, k: int) -> QuakeTable:
+        """The `k` events nearest (lat, lon), nearest first."""
+        found = self.spatial_index().nearest(lat, lon, k)
+        return self.take(row for _, row in found)
+
+    def sort_orders(self) -> dict[int, array[int]]:
+        """Ascending row order for every sort code, computed once.
+
+        For views that re-sort repeatedly (the GUI table): switching sort
+        field is then a dict lookup, and descending order is the same
+        array read back to front - so, unlike order(reverse=True), rows
+        with equal keys appear in reverse input order.
+        """
+        return {sort_code: array('I', self.order(sort_code))
+                for sort_code in _SORT_LABEL}
+
+
+# --------------------------------------------------------------------------
+# HTTP transport: pooled keep-alive connections
+# --------------------------------------------------------------------------
+
+def _format_bytes(count: float) -> str:
+    """Byte count in decimal units, e.g. '3.1 MB'."""
+    for unit in ('B', 'kB', 'MB'):
+        if count < 1000:
+            return '{:.{}f} {}'.format(count, 0 if unit == 'B' else 1, unit)
+        count /= 1000
+    return '{:.1f} GB'.format(count)
+
+
+@dataclass
+class TransferStats:
+    """Bytes moved by one or more responses, for the report header.
+
+    `wire_bytes` counts the body as it arrived (compressed, when the
+    server honoured Accept-Encoding) and `body_bytes` the decoded GeoJSON.
+    One instance may be shared by concurrent requests, e.g. the shards of
+    fetch_sharded(); throughput is measured from the first request to the
+    last chunk received.
+    """
+
+    wire_bytes: int = 0
+    body_bytes: int = 0
+    started: float | None = None
+    finished: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock,
+                                  repr=False, compare=False)
+
+    def start(self) -> None:
+        """Note that a request has been sent."""
+        with self._lock:
+            if self.started is None:
+                self.started = time.perf_counter()
+
+    def add(self, wire_bytes: int, body_bytes: int) -> None:
+        """Count one chunk: its size on the wire and once decoded."""
+        with self._lock:
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+            self.finished = time.perf_counter()
+
+    def summary(self) -> str:
+        """e.g. '412.0 kB over the wire for 3.1 MB of GeoJSON, 2.4 MB/s'.
+
+        Empty when nothing was downloaded (a cache hit or a 304).
+        """
+        if not self.wire_bytes:
+            return ''
+        text = '{} over the wire'.format(_format_bytes(self.wire_bytes))
+        if self.body_bytes != self.wire_bytes:
+            text += ' for {} of GeoJSON'.format(_format_bytes(self.body_bytes))
+        if self.started is not None and self.finished is not None:
+            elapsed = self.finished - self.started
+            if elapsed > 0:
+                text += ', {}/s'.format(
+                    _format_bytes(self.wire_bytes / elapsed))
+        return text
+
+
+class _DecodedResponse(io.BufferedIOBase):
+    """Response body stream that undoes gzip/deflate Content-Encoding.
+
+    Decompression is incremental - one network chunk at a time - so the
+    compressed and decompressed bodies are never held whole. Closing the
+    stream calls `release` with whether the body was read to the end
+    (FDSNClient uses that to decide whether the connection can be
+    pooled). Quacks like the object urlopen() returns (getcode(),
+    headers). With `stats`, every chunk is counted in it.
+    """
+
+    def __init__(
+        self,
+        response: Any,
+        release: Callable[[bool], None],
+        stats: TransferStats | None = None,
+    ) -> None:
+        super().__init__()
+        self._response = response
+        self._release = release
+        self._stats = stats
+        self.headers = response.headers
+        encoding = (self.headers.get('Content-Encoding') or '').lower()
+        # wbits 32+MAX_WBITS accepts both gzip and zlib ('deflate') framing.
+        self._decoder = (zlib.decompressobj(32 + zlib.MAX_WBITS)
+                         if encoding in ('gzip', 'x-gzip', 'deflate') else None)
+        self._buf = bytearray()
+        self._eof = False
+        self.status: int = response.getcode()
+
+    def getcode(self) -> int:
+        return self.status
+
+    def readable(self) -> bool:
+        return True
+
+    def _next(self) -> bytes:
+        raw = self._response.read(_CHUNK_SIZE)
+        try:
+            if not raw:
+                self._eof = True
+                data = self._decoder.flush() if self._decoder else b''
+            else:
+                data = self._decoder.decompress(raw) if self._decoder else raw
+        except zlib.error as err:
+            raise OSError('corrupt compressed response: {}'.format(err)) from err
+        if self._stats is not None:
+            self._stats.add(len(raw), len(data))
+        return data
+
+    def read(self, size: int | None = -1, /) -> bytes:
+        if size is None or size < 0:
+            while not self._eof:
+                self._buf += self._next()
+            size = len(self._buf)
+        while len(self._buf) < size and not self._eof:
+            self._buf += self._next()
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        return data
+
+    def read1(self, size: int = -1, /) -> bytes:
+        return self.read(size)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._release(self._eof)
+        super().close()
+
+
+class FDSNClient:
+    """Reusable HTTP(S) client that keeps connections alive per host.
+
+    Pass one instance as the `client` argument of open_geojson() /
+    fetch_geojson() (and the sharded and sync fetchers) for every request
+    in a session: after the first query, repeat queries reuse an idle
+    keep-alive connection and skip DNS, TCP and TLS setup. Responses are
+    requested gzip/deflate-encoded and decompressed as they are read.
+
+    `urlopen()` mirrors urllib's: it follows redirects, goes through the
+    proxy named by the environment (HTTP_PROXY / HTTPS_PROXY, honouring
+    NO_PROXY), returns the response for 2xx and raises HTTPError
+    otherwise, so error handling is shared. Safe to use from several
+    threads; each request checks out its own connection.
+    """
+
+    def __init__(self) -> None:
+        self._idle: dict[tuple[str, str, int | None],
+                         list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def __enter__(self) -> FDSNClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _checkout(
+        self, key: tuple[str, str, int | None], timeout: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """An idle connection to `key` (reused=True), or a new one."""
+        with self._lock:
+            pool = self._idle.get(key)
+            if pool:
+                connection = pool.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+            self.connections_opened += 1
+        scheme, host, port = key
+        proxy = _proxy_for(scheme, host)
+        if proxy is None:
+            if scheme == 'https':
+                return (http.client.HTTPSConnection(host, port, timeout=timeout),
+                        False)
+            return http.client.HTTPConnection(host, port, timeout=timeout), False
+        proxy_host, proxy_port, proxy_headers = proxy
+        if scheme == 'https':  # tunnel through the proxy with CONNECT
+            tunnel = http.client.HTTPSConnection(proxy_host, proxy_port,
+                                                 timeout=timeout)
+            tunnel.set_tunnel(host, port, headers=proxy_headers)
+            return tunnel, False
+        return (http.client.HTTPConnection(proxy_host, proxy_port,
+                                           timeout=timeout), False)
+
+    def _checkin(
+        self,
+        key: tuple[str, str, int | None],
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        finished: bool,
+    ) -> None:
+        if finished and not response.will_close:
+            with self._lock:
+                self._idle.setdefault(key, []).append(connection)
+        else:
+            connection.close()
+
+    def _get(
+        self, url: str, headers: dict[str, str], timeout: float
+    ) -> tuple[http.client.HTTPResponse, Callable[[bool], None]]:
+        """GET one URL; return the response and its connection release."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or '', parts.port)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        proxy = _proxy_for(parts.scheme, key[1])
+        if proxy is not None and parts.scheme == 'http':
+            path = url  # a plain-HTTP proxy takes the absolute URL
+            headers = {**headers, **proxy[2]}
+        while True:
+            connection, reused = self._checkout(key, timeout)
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+            except (ConnectionError, http.client.HTTPException):
+                connection.close()
+                if reused:
+                    continue  # the server dropped an idle keep-alive socket
+                raise
+            except BaseException:  # e.g. TimeoutError: never reuse it
+                connection.close()
+                raise
+            break
+
+        def release(finished: bool) -> None:
+            self._checkin(key, connection, response, finished)
+
+        return response, release
+
+    def urlopen(
+        self,
+        request: str | Request,
+        timeout: float = 10,
+        stats: TransferStats | None = None,
+    ) -> _DecodedResponse:
+        """GET a URL (or urllib Request) over a pooled connection."""
+        if isinstance(request, str):
+            request = Request(request)
+        url = request.full_url
+        headers = {'Accept-Encoding': _ACCEPT_ENCODING,
+                   **dict(request.header_items())}
+        for _ in range(_MAX_REDIRECTS + 1):
+            response, release = self._get(url, headers, timeout)
+            location = response.getheader('Location')
+            if response.status not in _REDIRECT_CODES or not location:
+                break
+            response.read()  # drain, so the connection can be reused
+            release(True)
+            url = urljoin(url, location)
+        else:
+            release(False)
+            raise HTTPError(url, response.status, 'too many redirects',
+                            response.headers, io.BytesIO(b''))
+
+        stream = _DecodedResponse(response, release, stats)
+        if not 200 <= response.status < 300:
+            body = stream.read()
+            stream.close()
+            raise HTTPError(url, response.status, response.reason,
+                            response.headers, io.BytesIO(body))
+        return stream
+
+
+def _proxy_for(
+    scheme: str, host: str
+) -> tuple[str, int | None, dict[str, str]] | None:
+    """The environment's proxy for `scheme`://`host`, as urllib would pick.
+
+    Returns (proxy host, proxy port, headers to authenticate to it), or
+    None to connect directly.
+    """
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return None
+    parts = urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+    headers = {}
+    if parts.username is not None:
+        credentials = '{}:{}'.format(unquote(parts.username),
+                                     unquote(parts.password or ''))
+        headers['Proxy-Authorization'] = 'Basic {}'.format(
+            base64.b64encode(credentials.encode('utf-8')).decode('ascii'))
+    return parts.hostname or '', parts.port, headers
 
 
 # --------------------------------------------------------------------------
 # Pipeline: build URL -> fetch -> parse -> (summary) -> sort -> format
 # --------------------------------------------------------------------------
 
+def lookback_start(
+    days: float, now: datetime.datetime | None = None
+) -> str:
+    """ISO-8601 UTC start time `days` before `now` (default: the present).
+
+    The result is floored to the whole minute so that repeat queries made
+    within the same minute produce an identical URL, and therefore share
+    a ResponseCache entry.
+    """
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+    start = now - datetime.timedelta(days=days)
+    return start.strftime('%Y-%m-%dT%H:%M:00')
+
+
 def build_fdsn_url(
     min_mag: float,
     starttime: str,
@@ -119,13 +959,17 @@ def build_fdsn_url(
     radius_km: float | None = None,
     orderby: str = 'time',
     limit: int | None = None,
+    updatedafter: str | None = None,
+    includedeleted: bool = False,
 ) -> str:
     """Construct a USGS FDSN event-query URL (GeoJSON format).
 
     `starttime`/`endtime` are ISO-8601 strings (UTC assumed). When `lat`,
     `lon` and `radius_km` are all supplied the query is restricted to that
     radial region; otherwise it is global. Server-side filtering replaces
-    the old client-side distance filtering.
+    the old client-side distance filtering. `updatedafter` (ISO-8601)
+    limits the result to events changed since then, and `includedeleted`
+    adds deleted events (status 'deleted'), for incremental sync.
     """
     params: dict[str, object] = {
         'format': 'geojson',
@@ -141,25 +985,18 @@ def build_fdsn_url(
         params['maxradiuskm'] = radius_km
     if limit is not None:
         params['limit'] = limit
+    if updatedafter is not None:
+        params['updatedafter'] = updatedafter
+    if includedeleted:
+        params['includedeleted'] = 'true'
     return FDSN_ENDPOINT + '?' + urlencode(params)
 
 
-def fetch_geojson(url: str, timeout: float = 10) -> bytes:
-    """Fetch raw GeoJSON bytes from a USGS URL.
-
-    Returns an empty FeatureCollection on HTTP 204 (FDSN: query valid but
-    zero events matched). Any failure - network error, timeout, or a
-    non-200/204 HTTP status - is raised as RuntimeError with a message
-    suitable for display to the user, so callers need only catch one type.
-    """
+@contextmanager
+def _fetch_errors(timeout: float) -> Iterator[None]:
+    """Normalise every network failure raised in the block to RuntimeError."""
     try:
-        response = urlopen(url, timeout=timeout)
-        code = response.getcode()
-        if code == 204:
-            return _EMPTY_GEOJSON
-        if code != 200:
-            raise RuntimeError('USGS server returned HTTP {}'.format(code))
-        return cast(bytes, response.read())
+        yield
     except TimeoutError as err:
         raise RuntimeError(
             'USGS request timed out after {:g}s; the query range may be '
@@ -174,73 +1011,546 @@ def fetch_geojson(url: str, timeout: float = 10) -> bytes:
         raise RuntimeError('USGS request failed: {}'.format(err)) from err
 
 
+def _open_url(
+    request: str | Request,
+    timeout: float,
+    client: FDSNClient | None,
+    stats: TransferStats | None,
+) -> _DecodedResponse:
+    """GET a URL asking for a compressed body; return the decoding stream."""
+    if stats is not None:
+        stats.start()
+    if client is not None:
+        return client.urlopen(request, timeout, stats)
+    if isinstance(request, str):
+        request = Request(request)
+    if not request.has_header('Accept-encoding'):
+        request.add_header('Accept-Encoding', _ACCEPT_ENCODING)
+    response = urlopen(request, timeout=timeout)
+    return _DecodedResponse(response, lambda finished: response.close(),
+                            stats)
+
+
+def fetch_geojson(
+    url: str,
+    timeout: float = 10,
+    cache: ResponseCache | None = None,
+    client: FDSNClient | None = None,
+    stats: TransferStats | None = None,
+) -> bytes:
+    """Fetch raw GeoJSON bytes from a USGS URL.
+
+    Returns an empty FeatureCollection on HTTP 204 (FDSN: query valid but
+    zero events matched). Any failure - network error, timeout, or a
+    non-200/204 HTTP status - is raised as RuntimeError with a message
+    suitable for display to the user, so callers need only catch one type.
+    `cache`, `client` and `stats` are as for open_geojson().
+    """
+    with _fetch_errors(timeout), \
+            open_geojson(url, timeout, cache, client, stats) as stream:
+        return stream.read()
+
+
+def open_geojson(
+    url: str,
+    timeout: float = 10,
+    cache: ResponseCache | None = None,
+    client: FDSNClient | None = None,
+    stats: TransferStats | None = None,
+    wrap: Callable[[BinaryIO], BinaryIO] | None = None,
+) -> BinaryIO:
+    """Open a USGS URL and return the response as an unread binary stream.
+
+    The streaming counterpart of fetch_geojson(): the body is left on the
+    socket for parse_quakes() to consume chunk by chunk. The caller owns
+    the stream and must close it. Status handling and error translation
+    match fetch_geojson(); a read failure part-way through the body still
+    surfaces from the stream itself as OSError.
+
+    The body is requested gzip/deflate-encoded (GeoJSON compresses about
+    tenfold) and decompressed chunk by chunk as the stream is read. Pass
+    `stats` to have the compressed and decoded byte counts tallied.
+
+    With a `cache`, a fresh entry is returned straight from disk; a stale
+    one is revalidated with a conditional request and reused on HTTP 304.
+    Otherwise the body is downloaded into the cache and the cached copy is
+    returned. `cache.last_status` records which of these happened.
+
+    With a `client`, the request is made over its pooled keep-alive
+    connections (see FDSNClient) instead of a one-off urlopen().
+
+    `wrap`, if given, is applied to the network response before any of
+    its body is read, including the copy into the cache; an exception it
+    raises from read() aborts the download and closes the response. The
+    GUI uses it to make Cancel stop a transfer part-way through.
+    """
+    if cache is None:
+        with _fetch_errors(timeout):
+            response = _open_url(url, timeout, client, stats)
+            code = response.getcode()
+            if code == 204:
+                response.close()
+                return io.BytesIO(_EMPTY_GEOJSON)
+            if code != 200:
+                response.close()
+                raise RuntimeError('USGS server returned HTTP {}'.format(code))
+            body = cast(BinaryIO, response)
+            return wrap(body) if wrap is not None else body
+
+    entry = cache.lookup(url)
+    if entry is not None and cache.is_fresh(entry):
+        return cache.open_entry(entry)
+    request = Request(url, headers=entry.validators() if entry else {})
+    with _fetch_errors(timeout):
+        try:
+            response = _open_url(request, timeout, client, stats)
+        except HTTPError as err:
+            if err.code == 304 and entry is not None:
+                return cache.refresh(url, entry, err.headers)
+            raise
+        with response:
+            code = response.getcode()
+            if code == 204:
+                return cache.store(url, io.BytesIO(_EMPTY_GEOJSON),
+                                   response.headers)
+            if code != 200:
+                raise RuntimeError('USGS server returned HTTP {}'.format(code))
+            body = cast(BinaryIO, response)
+            return cache.store(url, wrap(body) if wrap is not None else body,
+                               response.headers)
+
+
+class _FeatureScanner:
+    """Incremental reader for the top level of a GeoJSON FeatureCollection.
+
+    Elements of the 'features' array are decoded one at a time as the
+    stream is read, so the buffer never holds much more than one feature
+    plus one chunk. Every other top-level member (metadata, bbox, ...) is
+    decoded whole into `header`. A value that is complete but invalid
+    raises at once, without reading the rest of the stream, and so does
+    anything but whitespace after the closing brace.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = _CHUNK_SIZE) -> None:
+        self.header: dict[str, Any] = {}
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        """Append the next chunk to the buffer, dropping consumed text."""
+        chunk = self._stream.read(self._chunk_size)
+        self._eof = not chunk
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk, self._eof)
+        self._pos = 0
+
+    def _peek(self) -> str:
+        """Skip whitespace; return the next character ('' at end of input)."""
+        while True:
+            found = _NON_WHITESPACE.search(self._buf, self._pos)
+            if found:
+                self._pos = found.start()
+                return self._buf[self._pos]
+            self._pos = len(self._buf)
+            if self._eof:
+                return ''
+            self._fill()
+
+    def _expect(self, chars: str) -> str:
+        """Consume one character, which must be one of `chars`."""
+        char = self._peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                'Expecting one of {!r}'.format(chars), self._buf, self._pos)
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof or self._complete():
+                    raise
+                self._fill()
+                continue
+            # A bare number at the end of the buffer may continue in the
+            # next chunk; containers and strings are self-delimiting.
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _complete(self) -> bool:
+        """Whether the buffer holds a whole JSON value at the read position.
+
+        Only strings and brackets are matched, so this tells a value that
+        raw_decode() rejects outright from one cut off by the chunk end.
+        """
+        buf, pos = self._buf, self._pos
+        if buf[pos] not in '{["':  # a number or literal ends at a delimiter
+            return _SCALAR_END.search(buf, pos) is not None
+        depth = 0
+        for token in _JSON_TOKENS.finditer(buf, pos):
+            text = token.group()
+            if text == '"':  # unterminated so far
+                return False
+            if text in '{[':
+                depth += 1
+            elif text in '}]':
+                depth -= 1
+            if depth <= 0:
+                return True
+        return False
+
+    def features(self) -> Iterator[dict[str, Any]]:
+        """Yield each feature object in document order."""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key == 'features':
+                    self._expect('[')
+                    if self._peek() == ']':
+                        self._pos += 1
+                    else:
+                        while True:
+                            yield self._value()
+                            if self._expect(',]') == ']':
+                                break
+                else:
+                    self.header[key] = self._value()
+                if self._expect(',}') == '}':
+                    break
+        if self._peek():
+            raise json.JSONDecodeError('Extra data', self._buf, self._pos)
+
+
+def iter_features(
+    stream: BinaryIO, header: dict[str, Any] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield the raw feature objects of a GeoJSON stream, one at a time.
+
+    For callers that need fields the Quake records do not carry (event
+    id, update time, status). If `header` is supplied it is updated with
+    the document's other top-level members once the stream is exhausted.
+    """
+    scanner = _FeatureScanner(stream)
+    yield from scanner.features()
+    if header is not None:
+        header.update(scanner.header)
+
+
+def _depth(feature: dict[str, Any]) -> float:
+    coords = feature['geometry']['coordinates']
+    depth = coords[2] if len(coords) > 2 else None
+    return math.nan if depth is None else float(depth)
+
+
+# How each of EVENT_FIELDS is read from a decoded GeoJSON feature.
+_FIELD_READERS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    'event_id': lambda feature: str(feature.get('id') or ''),
+    'depth_km': _depth,
+    'updated_ms': lambda feature: int(feature['properties'].get('updated')
+                                      or 0),
+    'mag_type': lambda feature: feature['properties'].get('magType') or '',
+    'event_type': lambda feature: feature['properties'].get('type') or '',
+    'status': lambda feature: feature['properties'].get('status') or '',
+}
+
+
+def _field_readers(
+    fields: Iterable[str],
+) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+    """(name, reader) for each requested field; ValueError if unknown."""
+    try:
+        return [(name, _FIELD_READERS[name]) for name in fields]
+    except KeyError as err:
+        raise ValueError('unknown event field: {}'.format(err)) from None
+
+
+def _quake_from_feature(
+    feature: dict[str, Any],
+    origin: Origin,
+    readers: list[tuple[str, Callable[[dict[str, Any]], Any]]],
+) -> Quake:
+    """Build a Quake from one decoded GeoJSON feature."""
+    lon, lat = feature['geometry']['coordinates'][0:2]
+    props = feature['properties']
+    # USGS 'time' is epoch milliseconds (UTC); shown in the host's zone.
+    return Quake(
+        mag=check_type(props['mag']),
+        mag_known=isinstance(props['mag'], (float, int)),
+        place=props['place'],
+        distance_km=calc_dist(lat, lon, origin.lat, origin.lon),
+        time_ms=int(props['time']),
+        lat=lat,
+        lon=lon,
+        **{name: read(feature) for name, read in readers},
+    )
+
+
+def _feed_meta(header: dict[str, Any], count: int) -> dict[str, Any]:
+    """Report metadata from the document's 'metadata' member, with defaults."""
+    metadata = header.get('metadata', {})
+    return {
+        'count': metadata.get('count', count),
+        'title': metadata.get('title', 'USGS FDSN Earthquakes'),
+    }
+
+
+def iter_quakes(
+    stream: BinaryIO,
+    origin: Origin,
+    meta: dict[str, Any] | None = None,
+    chunk_size: int = _CHUNK_SIZE,
+    fields: Iterable[str] = EVENT_FIELDS,
+) -> Iterator[Quake]:
+    """Yield Quake records from a GeoJSON stream as each feature closes.
+
+    `stream` is any binary file-like object (an open_geojson() response or
+    a file opened 'rb'); it is read `chunk_size` bytes at a time and never
+    held whole. If `meta` is supplied it is updated in place with 'count'
+    and 'title' once the stream is exhausted. Distances are computed per
+    record so each one is yielded without waiting for a batch; use
+    parse_quakes() or parse_table() when throughput matters more.
+    `fields` projects the optional event fields as for parse_table().
+    """
+    readers = _field_readers(fields)
+    scanner = _FeatureScanner(stream, chunk_size)
+    count = 0
+    for feature in scanner.features():
+        count += 1
+        yield _quake_from_feature(feature, origin, readers)
+    if meta is not None:
+        meta.update(_feed_meta(scanner.header, count))
+
+
 def parse_quakes(
-    data: bytes, origin: Origin
+    data: bytes | BinaryIO,
+    origin: Origin,
+    mag_stats: MagnitudeStats | None = None,
+    fields: Iterable[str] = EVENT_FIELDS,
 ) -> tuple[list[Quake], dict[str, Any]]:
-    """Decode GeoJSON bytes into (list[Quake], metadata dict).
+    """Decode GeoJSON into (list[Quake], metadata dict).
+
+    `data` is either the complete document as bytes or a binary stream,
+    which is parsed incrementally (see iter_quakes()) so the raw document
+    and its decoded object tree are never resident at once. Quakes are
+    returned in feed order. `origin` is an Origin instance; its
+    coordinates are the reference for the distance calculation, which is
+    done for all events in one calc_dists() batch. `mag_stats` and
+    `fields` are as for parse_table().
+    """
+    table, meta = parse_table(data, origin, mag_stats, fields)
+    return list(table), meta
+
+
+def parse_table(
+    data: bytes | BinaryIO,
+    origin: Origin | Sequence[Origin],
+    mag_stats: MagnitudeStats | None = None,
+    fields: Iterable[str] = EVENT_FIELDS,
+) -> tuple[QuakeTable, dict[str, Any]]:
+    """Decode GeoJSON into (QuakeTable, metadata dict).
+
+    The columnar counterpart of parse_quakes(), for catalog-scale result
+    sets: features are streamed straight into typed columns and no Quake
+    objects are built. Rows are in feed order. `origin` may be a single
+    Origin or a sequence of sites, in which case one parse yields the full
+    events x sites distance matrix (see QuakeTable.measure_from_sites()).
+    Pass a MagnitudeStats as `mag_stats` to have each magnitude added to
+    it as its feature is decoded, so the summary needs no second pass.
 
-    Quakes are returned in feed order. `origin` is an Origin instance;
-    its coordinates are the reference for the distance calculation.
+    All of EVENT_FIELDS are kept by default. Pass a subset as `fields` -
+    e.g. ('depth_km',), or () for none - to read and store only what the
+    report needs; the rest read back as Quake defaults.
     """
-    geo = json.loads(data.decode('utf-8'))
+    table = QuakeTable(name for name, _ in _field_readers(fields))
+    stream = io.BytesIO(data) if isinstance(data, bytes) else data
+    scanner = _FeatureScanner(stream)
+    _fill_table(table, scanner.features(), mag_stats)
+    table.measure_from_sites([origin] if isinstance(origin, Origin) else origin)
+    return table, _feed_meta(scanner.header, len(table))
 
-    quakes: list[Quake] = []
-    for feature in geo['features']:
+
+def _fill_table(
+    table: QuakeTable,
+    features: Iterable[dict[str, Any]],
+    mag_stats: MagnitudeStats | None,
+) -> None:
+    """Append decoded GeoJSON features to `table`, reading its `fields`."""
+    # (reader, column append) for each kept field, in EVENT_FIELDS order.
+    sinks = list(zip([_FIELD_READERS[name] for name in EVENT_FIELDS
+                      if name in table.fields],
+                     table._field_appenders(), strict=True))
+    append_row = table._append_row
+    for feature in features:
         lon, lat = feature['geometry']['coordinates'][0:2]
         props = feature['properties']
-        # USGS 'time' is epoch milliseconds (UTC). Decode as an aware UTC
-        # instant, then convert to the host's local zone for display.
-        event_time = datetime.datetime.fromtimestamp(
-            props['time'] / 1000.0, tz=datetime.timezone.utc
-        ).astimezone()
-        quakes.append(Quake(
-            mag=check_type(props['mag']),
-            place=props['place'],
-            distance_km=calc_dist(lat, lon, origin.lat, origin.lon),
-            time=event_time,
-        ))
-
-    metadata = geo.get('metadata', {})
-    meta: dict[str, Any] = {
-        'count': metadata.get('count', len(quakes)),
-        'title': metadata.get('title', 'USGS FDSN Earthquakes'),
-    }
-    return quakes, meta
+        raw_mag = props['mag']
+        mag = check_type(raw_mag)
+        known = isinstance(raw_mag, (float, int))
+        append_row(mag, props['place'], lat, lon, int(props['time']),
+                   math.nan, known)
+        for read, append in sinks:
+            append(read(feature))
+        if mag_stats is not None and known:
+            mag_stats.add(mag)
 
 
-def magnitude_summary(quakes: list[Quake]) -> str:
+def magnitude_summary(
+    quakes: list[Quake] | QuakeTable | MagnitudeStats,
+) -> str:
     """One-line magnitude statistics, or a 'no results' notice.
 
-    All three statistics are order-independent, so this may be called at
-    any point in the pipeline.
+    `quakes` may also be a MagnitudeStats already fed during parsing (see
+    parse_table()); otherwise one is filled in a single pass here. All
+    three statistics are order-independent, so this may be called at any
+    point in the pipeline. The median is exact up to stats.EXACT_LIMIT
+    events and a close t-digest estimate beyond. Events the feed gave no
+    magnitude are left out.
     """
-    mags = [q.mag for q in quakes]
-    if not mags:
+    if isinstance(quakes, MagnitudeStats):
+        stats = quakes
+    elif isinstance(quakes, QuakeTable):
+        stats = MagnitudeStats.of(quakes.known_mags())
+    else:
+        stats = MagnitudeStats.of(q.mag for q in quakes if q.mag_known)
+    if not stats.count:
         return ('** No results found. '
                 'Try reducing Magnitude or increasing Time Period **')
     return ('Magnitude Max = {:2.2f}, Mean = {:2.2f}, '
-            'Median = {:2.2f}').format(
-        max(mags), mean(mags), median(mags))
+            'Median = {:2.2f}').format(stats.max, stats.mean, stats.median)
+
+
+def _ordered(
+    items: Iterable[Any],
+    key: Callable[[Any], Any],
+    reverse: bool,
+    top: int | None,
+) -> list[Any]:
+    """sorted(items, key, reverse)[:top], by heap selection when `top` is set.
+
+    heapq.nsmallest / nlargest keep sorted()'s stable order for ties, so
+    the result is exactly the head of the full sort.
+    """
+    if top is None:
+        return sorted(items, key=key, reverse=reverse)
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return select(max(top, 0), items, key=key)
 
 
+@overload
 def sort_quakes(
-    quakes: list[Quake], sort_code: int, reverse: bool = False
-) -> list[Quake]:
-    """Return a new list of quakes ordered by the requested sort code."""
+    quakes: list[Quake], sort_code: int, reverse: bool = False,
+    top: int | None = None,
+) -> list[Quake]: ...
+
+
+@overload
+def sort_quakes(
+    quakes: QuakeTable, sort_code: int, reverse: bool = False,
+    top: int | None = None,
+) -> QuakeTable: ...
+
+
+def sort_quakes(
+    quakes: list[Quake] | QuakeTable,
+    sort_code: int,
+    reverse: bool = False,
+    top: int | None = None,
+) -> list[Quake] | QuakeTable:
+    """Return a new list (or table) of quakes ordered by the sort code.
+
+    With `top`, only the first `top` quakes of that order are returned,
+    e.g. the 50 strongest with SORT_MAGNITUDE, reverse=True, top=50. They
+    are picked with a heap in O(n log top), without sorting the rest.
+    """
+    if isinstance(quakes, QuakeTable):
+        return quakes.take(quakes.order(sort_code, reverse, top))
     key: Callable[[Quake], Any]
     if sort_code == SORT_LOCATION:
-        key = _place_key
+        region = _region_lookup(quakes)
+
+        def key(quake: Quake) -> str:
+            return region[quake.place]
     elif sort_code == SORT_DISTANCE:
         key = attrgetter('distance_km')
     elif sort_code == SORT_TIME:
-        key = attrgetter('time')
+        key = attrgetter('time_ms')
     else:
         key = attrgetter('mag')
-    return sorted(quakes, key=key, reverse=reverse)
+    return _ordered(quakes, key, reverse, top)
 
 
-def format_report(
-    quakes: list[Quake],
+def format_catalog_stats(stats: CatalogStats, width: int) -> str:
+    """Render CatalogStats as a block of text lines for the report header.
+
+    The magnitude-frequency histogram is shown per whole magnitude unit,
+    with the cumulative count at or above each, as a bar chart; Mc,
+    b-value, rates and depths follow, one centred line each. Events with
+    no magnitude appear only in the rates and depths.
+    """
+    if not stats.count:
+        return ''
+    per_unit: dict[int, int] = {}
+    for mag, events in stats.histogram:
+        unit = math.floor(mag + 1e-9)
+        per_unit[unit] = per_unit.get(unit, 0) + events
+    out: list[str] = []
+    if per_unit:
+        peak = max(per_unit.values())
+        rows = ['{:>6} {:>10} {:>10}'.format('Mag', 'Events', 'N(>=M)')]
+        remaining = sum(per_unit.values())
+        for unit in sorted(per_unit):
+            events = per_unit[unit]
+            rows.append('{:>6} {:>10,} {:>10,}  {}'.format(
+                'M{}'.format(unit), events, remaining,
+                '#' * max(1, round(40 * events / peak))))
+            remaining -= events
+        indent = ' ' * max(0, (width - max(map(len, rows))) // 2)
+        out.extend('{}{}\n'.format(indent, row) for row in rows)
+        out.append('\n')
+
+        if stats.b_value is not None and stats.b_error is not None:
+            gr = ('Completeness Mc = {:.1f}; Gutenberg-Richter b = {:.3f} '
+                  '+/- {:.3f} from {:,} events at or above Mc').format(
+                stats.mc, stats.b_value, stats.b_error, stats.b_count)
+        else:
+            gr = ('Completeness Mc = {:.1f}; too few events at or above Mc '
+                  'for a b-value').format(stats.mc)
+        out.append('{:^{}}\n'.format(gr, width))
+    per_day, per_hour = stats.per_day, stats.per_hour
+    if (per_day is not None and per_hour is not None
+            and stats.busiest_day is not None):
+        out.append('{:^{}}\n'.format(
+            'Rate {:,.1f} events/day ({:,.2f}/hour); busiest day {} with '
+            '{:,} events'.format(per_day, per_hour, *stats.busiest_day),
+            width))
+    if stats.depth_quantiles is not None:
+        known = sum(stats.depth_bands)
+        shallow, intermediate, deep = (band / known
+                                       for band in stats.depth_bands)
+        out.append('{:^{}}\n'.format(
+            'Depth median {:.1f} km, 90% within {:.1f} km, deepest {:.1f} km; '
+            'shallow {:.0%}, intermediate {:.0%}, deep {:.0%}'.format(
+                *stats.depth_quantiles, shallow, intermediate, deep), width))
+    return ''.join(out)
+
+
+def format_report_header(
+    quakes: list[Quake] | QuakeTable,
     meta: dict[str, Any],
     period_label: str,
     origin: Origin,
@@ -248,15 +1558,15 @@ def format_report(
     stats_line: str,
     elapsed_s: float,
     width: int,
+    fetch_note: str = '',
+    stats_section: str = '',
 ) -> str:
-    """Render a complete fixed-width text report as a single string.
+    """Render the statistics header and sort banner of format_report().
 
-    `quakes` should already be sorted; `stats_line` is the precomputed
-    magnitude_summary() result. `period_label` is the human-readable
-    look-back window (e.g. 'Past Week') appended to the header; pass an
-    empty string to omit it. Returns the string the GUI inserts into its
-    text box (or the CLI prints to stdout).
+    Takes the same arguments; for front ends that lay the event rows out
+    themselves (the GUI's table view) rather than as report text.
     """
+    multi_site = isinstance(quakes, QuakeTable) and len(quakes.sites) > 1
     out: list[str] = []
 
     out.append('{:*^{}}\n\n'.format(' [Event statistical Analysis] ', width))
@@ -265,23 +1575,171 @@ def format_report(
         header = '{}, {}'.format(header, period_label)
     out.append('{:^{}}\n\n'.format(header, width))
     out.append('{:^{}}\n\n'.format(stats_line, width))
-    out.append('{:^{}}\n'.format(
-        'Total processing time: {:2.2f} seconds'.format(elapsed_s), width))
+    if stats_section:
+        out.append('{}\n'.format(stats_section))
+    timing = 'Total processing time: {:2.2f} seconds'.format(elapsed_s)
+    if fetch_note:
+        timing = '{} ({})'.format(timing, fetch_note)
+    out.append('{:^{}}\n'.format(timing, width))
 
-    if sort_code == SORT_DISTANCE:
+    if sort_code == SORT_DISTANCE and multi_site:
+        banner = ' [Events are sorted by DISTANCE from the nearest site] '
+    elif sort_code == SORT_DISTANCE:
         banner = ' [Events are sorted by DISTANCE from: {}] '.format(origin.name)
     elif sort_code in _SORT_LABEL:
         banner = ' [Events are sorted by {}] '.format(_SORT_LABEL[sort_code])
     else:
         banner = ' [Have no idea how we are sorting] '
     out.append('\n{:*^{}}\n\n'.format(banner, width))
+    return ''.join(out)
 
-    for q in quakes:
-        if q.mag >= 0.0:
-            place = format_place(q.place) if sort_code == SORT_LOCATION else q.place
-            stamp = q.time.strftime("%H:%M:%S on %m/%d")
-            out.append(
-                '{:4.2f} centered {:46.45} distance: {:>8.2f} km at {}\n'.format(
-                    q.mag, place, q.distance_km, stamp))
 
-    return ''.join(out)
+def iter_report(
+    quakes: list[Quake] | QuakeTable,
+    meta: dict[str, Any],
+    period_label: str,
+    origin: Origin,
+    sort_code: int,
+    stats_line: str,
+    elapsed_s: float,
+    width: int,
+    fetch_note: str = '',
+    stats_section: str = '',
+) -> Iterator[str]:
+    """Yield the format_report() text piece by piece.
+
+    The header comes first, then one line per event, each formatted only
+    when the consumer asks for it - so writing the pieces to a stream
+    (see write_report()) shows the first lines at once and holds at most
+    one row's text, however many events there are. Arguments are as for
+    format_report().
+    """
+    yield format_report_header(quakes, meta, period_label, origin, sort_code,
+                               stats_line, elapsed_s, width, fetch_note,
+                               stats_section)
+
+    # (mag, shown place, distance, local time, nearest site) per event. A
+    # table's rows are read straight from its columns, with no Quake built.
+    rows: Iterable[tuple[float, str, float, datetime.datetime, int]]
+    if isinstance(quakes, QuakeTable):
+        sites = quakes.sites
+        places = (quakes.region_places() if sort_code == SORT_LOCATION
+                  else quakes.places)
+        rows = zip(quakes.mag, map(places.__getitem__, quakes.place_id),
+                   quakes.distance_km, map(_local_time, quakes.time_ms),
+                   quakes.nearest_site, strict=True)
+    else:
+        sites = []
+        show: Callable[[str], str] = (
+            _region_lookup(quakes).__getitem__
+            if sort_code == SORT_LOCATION else str)
+        rows = ((q.mag, show(q.place), q.distance_km, q.time, 0)
+                for q in quakes)
+    multi_site = len(sites) > 1
+
+    for mag, place, distance_km, local, nearest in rows:
+        if mag >= 0.0:
+            stamp = local.strftime("%H:%M:%S on %m/%d")
+            if multi_site:
+                yield (
+                    '{:4.2f} centered {:46.45} distance: {:>8.2f} km to {:.20} '
+                    'at {}\n'.format(mag, place, distance_km,
+                                     sites[nearest].name, stamp))
+            else:
+                yield (
+                    '{:4.2f} centered {:46.45} distance: {:>8.2f} km at {}\n'.format(
+                        mag, place, distance_km, stamp))
+
+
+def format_report(
+    quakes: list[Quake] | QuakeTable,
+    meta: dict[str, Any],
+    period_label: str,
+    origin: Origin,
+    sort_code: int,
+    stats_line: str,
+    elapsed_s: float,
+    width: int,
+    fetch_note: str = '',
+    stats_section: str = '',
+) -> str:
+    """Render a complete fixed-width text report as a single string.
+
+    `quakes` should already be sorted; `stats_line` is the precomputed
+    magnitude_summary() result. `period_label` is the human-readable
+    look-back window (e.g. 'Past Week') appended to the header; pass an
+    empty string to omit it. Returns the string the GUI inserts into its
+    text box; for large reports prefer iter_report() or write_report(),
+    which never build the whole string.
+
+    When `quakes` is a QuakeTable measured from several sites, distances
+    are to each event's nearest site and a column names that site.
+    `fetch_note` (e.g. ResponseCache.last_status) is shown in parentheses
+    after the processing time. `stats_section`, if given, is a
+    format_catalog_stats() block shown below the statistics line.
+    """
+    return ''.join(iter_report(quakes, meta, period_label, origin, sort_code,
+                               stats_line, elapsed_s, width, fetch_note,
+                               stats_section))
+
+
+def write_report(stream: TextIO, pieces: Iterable[str]) -> None:
+    """Write iter_report() / iter_site_reports() pieces to a text stream.
+
+    Each piece is written as soon as it is formatted, so a reader at the
+    other end of a pipe sees output before the last row is rendered.
+    """
+    for piece in pieces:
+        stream.write(piece)
+
+
+def format_site_reports(
+    table: QuakeTable,
+    meta: dict[str, Any],
+    period_label: str,
+    sort_code: int,
+    reverse: bool,
+    stats_line: str,
+    elapsed_s: float,
+    width: int,
+    fetch_note: str = '',
+    top: int | None = None,
+    stats_section: str = '',
+) -> str:
+    """Render one report section per site of a multi-site QuakeTable.
+
+    `table` is unsorted; each section is sorted independently because
+    distance order differs from site to site. All sections share the one
+    parse (and distance matrix) behind `table`. `top` limits each section
+    as for sort_quakes().
+    """
+    return ''.join(iter_site_reports(table, meta, period_label, sort_code,
+                                     reverse, stats_line, elapsed_s, width,
+                                     fetch_note, top, stats_section))
+
+
+def iter_site_reports(
+    table: QuakeTable,
+    meta: dict[str, Any],
+    period_label: str,
+    sort_code: int,
+    reverse: bool,
+    stats_line: str,
+    elapsed_s: float,
+    width: int,
+    fetch_note: str = '',
+    top: int | None = None,
+    stats_section: str = '',
+) -> Iterator[str]:
+    """Yield the format_site_reports() text piece by piece.
+
+    Each site's section is sorted only when the previous one has been
+    consumed; see iter_report().
+    """
+    for index, site in enumerate(table.sites):
+        if index:
+            yield '\n'
+        yield from iter_report(
+            sort_quakes(table.for_site(index), sort_code, reverse, top),
+            meta, period_label, site, sort_code, stats_line, elapsed_s,
+            width, fetch_note, stats_section)
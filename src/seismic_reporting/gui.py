@@ -10,20 +10,37 @@ FDSN event service: https://earthquake.usgs.gov/fdsnws/event/1/
 
 from __future__ import annotations
 
-import datetime
+import io
+import queue
+import threading
+import time
 import tkinter as tk
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
 from timeit import default_timer as timer
 from tkinter import ttk
+from typing import Any, BinaryIO, Literal, cast
 
+from seismic_reporting.cache import ResponseCache
 from seismic_reporting.core import (
     DEFAULT_ORIGIN,
+    SORT_DISTANCE,
+    SORT_LOCATION,
+    SORT_MAGNITUDE,
+    SORT_TIME,
+    FDSNClient,
+    QuakeTable,
+    TransferStats,
     build_fdsn_url,
-    fetch_geojson,
-    format_report,
+    format_catalog_stats,
+    format_report_header,
+    lookback_start,
     magnitude_summary,
-    parse_quakes,
-    sort_quakes,
+    open_geojson,
+    parse_table,
 )
+from seismic_reporting.stats import CatalogStats, MagnitudeStats
 
 __author__ = "Michael E. O'Connor"
 __copyright__ = "Copyright 2026"
@@ -37,6 +54,187 @@ _PERIODS: dict[str, tuple[str, float]] = {
     'year': ('Past Year', 365.0),
 }
 
+# How often the Tk event loop checks for the worker thread's result, in ms.
+_POLL_MS = 50
+
+
+# Lines of the result pane given to the report header; the rest are rows.
+_HEADER_LINES = 10
+
+_Row = tuple[str, str, str, str]  # formatted (mag, place, distance, time)
+
+
+def _display_orders(table: QuakeTable) -> dict[int, array[int]]:
+    """Every sort order of the table, minus events the report would skip."""
+    mags = table.mag
+    return {sort_code: array('I', [row for row in order if mags[row] >= 0.0])
+            for sort_code, order in table.sort_orders().items()}
+
+
+@dataclass
+class _ResultSet:
+    """The last parsed query, kept so a sort change needs no refetch."""
+
+    key: tuple[str, str]        # (period, minimum magnitude) selections
+    table: QuakeTable
+    meta: dict[str, Any]
+    period_label: str
+    stats: str                  # magnitude_summary() line
+    catalog: CatalogStats       # shown when Statistics is ticked
+    fetched_at: float           # time.monotonic() when parsed
+    orders: dict[int, array[int]]   # ascending rows for each sort code
+    sort: tuple[int, bool]      # current (sort code, reverse)
+    elapsed_s: float = 0.0      # processing time shown in the header
+    note: str = ''              # fetch note shown in the header
+
+    def __len__(self) -> int:
+        return len(self.orders[self.sort[0]])
+
+    def row(self, index: int) -> _Row:
+        """Format the event at display position `index` in the current sort.
+
+        Descending order reads the ascending array from the end, so a sort
+        change never re-sorts anything.
+        """
+        order = self.orders[self.sort[0]]
+        row = order[-1 - index] if self.sort[1] else order[index]
+        quake = self.table[row]
+        place = (self.table.region_places()[self.table.place_id[row]]
+                 if self.sort[0] == SORT_LOCATION else quake.place)
+        return ('{:4.2f}'.format(quake.mag), place,
+                '{:.2f}'.format(quake.distance_km),
+                quake.time.strftime('%H:%M:%S on %m/%d'))
+
+
+class _VirtualRows:
+    """Table view that only ever holds the rows currently on screen.
+
+    A ttk.Treeview with one item per visible line; scrolling rewrites
+    those items from a row callback instead of scrolling the widget, so
+    showing a catalog of any size costs O(visible rows). The scrollbar is
+    driven by hand to reflect the position within the full row count.
+    Clicking a column heading calls `on_heading` with that column's sort
+    code.
+    """
+
+    COLUMNS: tuple[tuple[str, str, int, Literal['e', 'w'], int], ...] = (
+        ('mag', 'Mag', 50, 'e', SORT_MAGNITUDE),
+        ('place', 'Location', 360, 'w', SORT_LOCATION),
+        ('distance', 'Distance (km)', 110, 'e', SORT_DISTANCE),
+        ('time', 'Time', 130, 'w', SORT_TIME))
+
+    def __init__(
+        self,
+        parent: ttk.Frame,
+        height: int,
+        on_heading: Callable[[int], None],
+    ) -> None:
+        self.height = height
+        self.tree = ttk.Treeview(parent, columns=[c[0] for c in self.COLUMNS],
+                                 show='headings', height=height,
+                                 selectmode='none')
+        for name, heading, width, anchor, sort_code in self.COLUMNS:
+            self.tree.heading(name, text=heading, anchor=anchor,
+                              command=lambda code=sort_code: on_heading(code))
+            self.tree.column(name, width=width, anchor=anchor,
+                             stretch=name == 'place')
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL,
+                                       command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=tk.YES)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.yview('scroll', -3))
+        self.tree.bind('<Button-5>', lambda event: self.yview('scroll', 3))
+        self._count = 0
+        self._first = 0
+        self._row: Callable[[int], _Row] = lambda index: ('', '', '', '')
+
+    def show(self, count: int, row: Callable[[int], _Row]) -> None:
+        """Display `count` rows, formatting row i with row(i) on demand."""
+        self._count = count
+        self._row = row
+        self._first = 0
+        self._refresh()
+
+    def clear(self) -> None:
+        self.show(0, self._row)
+
+    def mark_sorted(self, sort_code: int, reverse: bool) -> None:
+        """Put an ascending / descending arrow on the sorted column."""
+        for name, heading, _, _, code in self.COLUMNS:
+            if code == sort_code:
+                heading = '{} {}'.format(heading, '\u25bc' if reverse
+                                         else '\u25b2')
+            self.tree.heading(name, text=heading)
+
+    def yview(self, *args: Any) -> None:
+        """Scrollbar protocol: ('moveto', fraction) or ('scroll', n[, what])."""
+        if args[0] == 'moveto':
+            first = int(float(args[1]) * self._count)
+        else:
+            step = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                step *= self.height
+            first = self._first + step
+        self._first = max(0, min(first, self._count - self.height))
+        self._refresh()
+
+    def _on_wheel(self, event: tk.Event[Any]) -> None:
+        # Windows reports multiples of 120 per notch; macOS reports +-1.
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.yview('scroll', -delta)
+
+    def _refresh(self) -> None:
+        """Rewrite the visible items for the rows from self._first on."""
+        shown = min(self.height, self._count - self._first)
+        items = self.tree.get_children()
+        if len(items) > shown:
+            self.tree.delete(*items[shown:])
+        for index in range(shown):
+            values = self._row(self._first + index)
+            if index < len(items):
+                self.tree.item(items[index], values=values)
+            else:
+                self.tree.insert('', tk.END, values=values)
+        if self._count:
+            self.scrollbar.set(self._first / self._count,
+                               (self._first + shown) / self._count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class _Cancelled(Exception):
+    """Raised in the worker thread once the user has pressed Cancel."""
+
+
+class _CancellableStream(io.BufferedIOBase):
+    """Wraps a response stream so that reads fail after Cancel is pressed.
+
+    The download into the cache and parse_table() both read one chunk at
+    a time, so a cancelled query stops within one network read instead of
+    running to the end. Closing the wrapper closes the wrapped stream.
+    """
+
+    def __init__(self, stream: BinaryIO, cancel: threading.Event) -> None:
+        super().__init__()
+        self._stream = stream
+        self._cancel = cancel
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1, /) -> bytes:
+        if self._cancel.is_set():
+            raise _Cancelled()
+        return self._stream.read(-1 if size is None else size)
+
+    def read1(self, size: int = -1, /) -> bytes:
+        return self.read(size)
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
 
 class USGS_Gui:
 
@@ -49,6 +247,21 @@ class USGS_Gui:
     def __init__(self, master: tk.Tk) -> None:
 
         master.title('USGS Earthquake Data')
+        self.master = master
+        self.cache = ResponseCache()
+        self.client = FDSNClient()
+
+        # Queries run on a worker thread; results come back through this
+        # queue tagged with their job number, and the Tk loop polls it.
+        # Bumping self._job on Cancel makes a late result from the
+        # abandoned worker stale, so it is dropped.
+        self._results: queue.Queue[
+            tuple[int, _ResultSet | str]] = queue.Queue()
+        self._last: _ResultSet | None = None
+        self._job = 0
+        self._busy = False
+        self._cancel = threading.Event()
+        self._transfer = TransferStats()
         frame0 = ttk.Panedwindow(master, orient=tk.HORIZONTAL)
         frame0.pack(fill=tk.BOTH, expand=True)
 
@@ -93,6 +306,7 @@ class USGS_Gui:
         self.add_radiobutton(frame1, "Distance", self.sortby, 2)
         self.add_radiobutton(frame1, "Time", self.sortby, 3)
         self.sortby.set(0)
+        self.sortby.trace_add('write', self._resort)
 
         # Sort order selector
         self.add_label(frame1, "Sort Order")
@@ -100,22 +314,39 @@ class USGS_Gui:
         self.add_radiobutton(frame1, "Ascending", self.reverse, False)
         self.add_radiobutton(frame1, "Descending", self.reverse, True)
         self.reverse.set(False)
+        self.reverse.trace_add('write', self._resort)
 
-        self.add_line(frame1, 'white')
+        # Extended statistics section in the report header
+        self.extended = tk.BooleanVar()
+        ttk.Checkbutton(frame1, text="Statistics", variable=self.extended,
+                        command=self._toggle_stats).pack(anchor='w', pady=5)
 
-        result_button = tk.Button(frame1, text="Get Results",
-                                  command=self.submit, bg='white', fg='blue',
-                                  relief='sunken')
-        result_button.pack(anchor='s', pady=3)
+        self.add_line(frame1, 'white')
 
-        # Result text box with vertical scrollbar
+        self.result_button = tk.Button(frame1, text="Get Results",
+                                       command=self.submit, bg='white',
+                                       fg='blue', relief='sunken')
+        self.result_button.pack(anchor='s', pady=3)
+        self.cancel_button = tk.Button(frame1, text="Cancel",
+                                       command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(anchor='s', pady=3)
+
+        # Activity indicator and bytes-received counter for a running query
+        self.progress = ttk.Progressbar(frame1, mode='indeterminate',
+                                        length=self.SIDE_WIDTH)
+        self.progress.pack(fill=tk.X, pady=3)
+        self.status = tk.StringVar()
+        ttk.Label(frame1, textvariable=self.status).pack(anchor='w')
+
+        # Report header (statistics, or an error message) above a
+        # virtualized table of events
         self.result_box = tk.Text(frame2, width=self.MASTER_WIDTH,
-                                  height=self.MASTER_HEIGHT)
-        scrollbar = tk.Scrollbar(frame2, orient=tk.VERTICAL,
-                                 command=self.result_box.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.result_box["yscrollcommand"] = scrollbar.set
-        self.result_box.pack(side=tk.LEFT, fill=tk.BOTH, expand=tk.YES)
+                                  height=_HEADER_LINES, wrap=tk.WORD)
+        self.result_box.pack(side=tk.TOP, fill=tk.X)
+        rows_frame = ttk.Frame(frame2)
+        rows_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=tk.YES)
+        self.rows = _VirtualRows(rows_frame, self.MASTER_HEIGHT - _HEADER_LINES,
+                                 self._sort_by_column)
 
     # -- small widget-construction helpers ---------------------------------
 
@@ -141,33 +372,186 @@ class USGS_Gui:
     # -- result handling ---------------------------------------------------
 
     def submit(self) -> None:
-        """Fetch, process and display results for the current selections."""
+        """Start fetching results for the current selections.
+
+        The fetch, parse and sort run on a worker thread so the window
+        keeps redrawing; _poll() displays the result when the worker posts
+        it. If the last result set is for the same period and
+        magnitude and is younger than the cache TTL - so a refetch would
+        return the same data - it is only re-sorted instead.
+        """
+        if self._busy:
+            return
+        key = (self.period.get(), self.mag.get())
+        last = self._last
+        if (last is not None and last.key == key
+                and time.monotonic() - last.fetched_at < self.cache.ttl_s):
+            self._resort(force=True)
+            return
         self.clear()
 
-        period_label, days = _PERIODS[self.period.get()]
-        starttime = (datetime.datetime.now(datetime.timezone.utc)
-                     - datetime.timedelta(days=days)
-                     ).strftime('%Y-%m-%dT%H:%M:%S')
-        url = build_fdsn_url(float(self.mag.get()), starttime)
+        period_label, days = _PERIODS[key[0]]
+        url = build_fdsn_url(float(key[1]), lookback_start(days))
+
+        self._job += 1
+        self._cancel = threading.Event()
+        self._transfer = TransferStats()
+        worker = threading.Thread(
+            target=self._run_query, daemon=True,
+            args=(self._job, key, url, period_label, days, self.sortby.get(),
+                  self.reverse.get(), self._cancel, self._transfer))
+        worker.start()
+        self._set_busy(True)
+        self.master.after(_POLL_MS, self._poll)
+
+    def cancel(self) -> None:
+        """Abandon the running query; the worker stops at its next read."""
+        if not self._busy:
+            return
+        self._cancel.set()
+        self._job += 1
+        self._set_busy(False)
+        self._show('Request cancelled.')
+
+    def _resort(self, *_trace: object, force: bool = False) -> None:
+        """Sort-control callback: re-sort the shown results in place.
+
+        Only applies while the displayed result set still matches the
+        period and magnitude selections; otherwise Get Results is needed.
+        """
+        last = self._last
+        sort = (self.sortby.get(), self.reverse.get())
+        if (self._busy or last is None
+                or last.key != (self.period.get(), self.mag.get())
+                or (last.sort == sort and not force)):
+            return
+        last.sort = sort  # the orders are precomputed: nothing to sort
+        last.elapsed_s = 0.0
+        last.note = 're-sorted'
+        self._render(last)
+
+    def _sort_by_column(self, sort_code: int) -> None:
+        """Column-heading callback: sort by that column, or flip direction.
+
+        Works through the sort radio buttons, whose traces re-render.
+        """
+        if sort_code == self.sortby.get():
+            self.reverse.set(not self.reverse.get())
+        else:
+            self.reverse.set(False)
+            self.sortby.set(sort_code)
+
+    def _toggle_stats(self) -> None:
+        """Statistics checkbox callback: redraw the shown header."""
+        if self._last is not None and not self._busy:
+            self._render(self._last)
+
+    def _render(self, result: _ResultSet) -> None:
+        """Show a result set: header text, then its rows in the table."""
+        self.clear()
+        section = (format_catalog_stats(result.catalog, self.MASTER_WIDTH)
+                   if self.extended.get() else '')
+        header = format_report_header(
+            result.table, result.meta, result.period_label, DEFAULT_ORIGIN,
+            result.sort[0], result.stats, result.elapsed_s,
+            self.MASTER_WIDTH, result.note, section)
+        self.result_box['height'] = max(_HEADER_LINES, header.count('\n'))
+        self._show(header)
+        self.rows.show(len(result), result.row)
+        self.rows.mark_sorted(*result.sort)
+
+    def _run_query(
+        self,
+        job: int,
+        key: tuple[str, str],
+        url: str,
+        period_label: str,
+        days: float,
+        sort_code: int,
+        reverse: bool,
+        cancel: threading.Event,
+        transfer: TransferStats,
+    ) -> None:
+        """Worker thread: fetch, parse and sort; post the result set.
 
+        Touches no Tk objects - the Tk variables are read by submit() and
+        passed in, and the result set (or an error message) is handed back
+        through self._results.
+        """
         try:
-            data = fetch_geojson(url)
-        except RuntimeError as err:
-            self._show("Error retrieving data from:\n{}\n\n{}".format(url, err))
+            source = open_geojson(
+                url, cache=self.cache, client=self.client, stats=transfer,
+                wrap=lambda stream: cast(BinaryIO,
+                                         _CancellableStream(stream, cancel)))
+            cache_status = self.cache.last_status
+            start = timer()
+            mag_stats = MagnitudeStats()
+            with source:
+                quakes, meta = parse_table(
+                    cast(BinaryIO, _CancellableStream(source, cancel)),
+                    DEFAULT_ORIGIN, mag_stats, fields=('depth_km',))
+            orders = _display_orders(quakes)
+            note = '; '.join(note for note in (cache_status,
+                                               transfer.summary()) if note)
+            result = _ResultSet(key, quakes, meta, period_label,
+                                magnitude_summary(mag_stats),
+                                quakes.catalog_stats(days), time.monotonic(),
+                                orders, (sort_code, reverse), timer() - start,
+                                note)
+        except _Cancelled:
             return
-
-        start = timer()
-        quakes, meta = parse_quakes(data, DEFAULT_ORIGIN)
-        stats = magnitude_summary(quakes)
-        quakes = sort_quakes(quakes, self.sortby.get(), self.reverse.get())
-        report = format_report(quakes, meta, period_label, DEFAULT_ORIGIN,
-                               self.sortby.get(), stats, timer() - start,
-                               self.MASTER_WIDTH)
-        self._show(report)
+        except (RuntimeError, OSError, ValueError) as err:
+            self._results.put((job, "Error retrieving data from:\n{}\n\n{}"
+                               .format(url, err)))
+            return
+        except Exception as err:  # e.g. KeyError from a malformed feature
+            # Anything escaping here would end the thread silently and
+            # leave the window busy for good.
+            self._results.put((job, "Error reading data from:\n{}\n\n{}: {}"
+                               .format(url, type(err).__name__, err)))
+            return
+        self._results.put((job, result))
+
+    def _poll(self) -> None:
+        """Show the worker's result if it is ready, else check again later."""
+        while True:
+            try:
+                job, posted = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job != self._job:
+                continue
+            self._set_busy(False)
+            if isinstance(posted, str):
+                self._last = None
+                self._show(posted)
+            else:
+                self._last = posted
+                self._render(posted)
+                self._resort()  # sort controls changed while fetching
+        if self._busy:
+            received = self._transfer.wire_bytes
+            if received:
+                self.status.set('{:.1f} MB received'.format(received / 1e6))
+            self.master.after(_POLL_MS, self._poll)
+
+    def _set_busy(self, busy: bool) -> None:
+        """Switch the controls between the idle and query-running states."""
+        self._busy = busy
+        self.result_button['state'] = tk.DISABLED if busy else tk.NORMAL
+        self.cancel_button['state'] = tk.NORMAL if busy else tk.DISABLED
+        if busy:
+            self.status.set('Fetching...')
+            self.progress.start(15)
+        else:
+            self.status.set('')
+            self.progress.stop()
 
     def clear(self) -> None:
-        """Empty the result text box."""
+        """Empty the header text box and the event table."""
         self.result_box.delete('1.0', tk.END)
+        self.result_box['height'] = _HEADER_LINES
+        self.rows.clear()
 
     def _show(self, text: str) -> None:
         """Append text to the result text box."""
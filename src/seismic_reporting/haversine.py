@@ -2,11 +2,25 @@
 
 from __future__ import annotations
 
+import importlib
 import math
+from array import array
+from collections.abc import Sequence
+from typing import Any
 
 # IUGG mean radius of the Earth, in kilometres.
 EARTH_RADIUS_KM: float = 6371.0088
 
+# NumPy is optional: when importable, calc_dists() uses it for large batches.
+_np: Any
+try:
+    _np = importlib.import_module('numpy')
+except ImportError:
+    _np = None
+
+# Below this many points the NumPy call overhead outweighs the loop.
+_NUMPY_MIN_POINTS: int = 64
+
 
 def calc_dist(
     lat1: float,
@@ -26,3 +40,119 @@ def calc_dist(
         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
     )
     return radius * 2 * math.asin(math.sqrt(h))
+
+
+def calc_dists(
+    lat: float,
+    lon: float,
+    lats: Sequence[float],
+    lons: Sequence[float],
+    radius: float = EARTH_RADIUS_KM,
+) -> array[float]:
+    """Return great-circle distances from one origin to many points.
+
+    Equivalent to ``calc_dist(lat, lon, lats[i], lons[i], radius)`` for
+    each i, but the origin's radians and latitude cosine are computed once
+    for the whole batch. Uses NumPy when it is installed and the batch is
+    large enough to benefit; otherwise a plain loop. Returns an
+    ``array('d')`` the same length as ``lats``.
+    """
+    if len(lats) != len(lons):
+        raise ValueError('lats and lons differ in length')
+    if _np is not None and len(lats) >= _NUMPY_MIN_POINTS:
+        return _calc_dists_numpy(lat, lon, lats, lons, radius)
+
+    lat0 = math.radians(lat)
+    lon0 = math.radians(lon)
+    cos_lat0 = math.cos(lat0)
+    to_rad = math.pi / 180.0
+    sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+    diameter = 2 * radius
+
+    dists = array('d')
+    append = dists.append
+    for plat, plon in zip(lats, lons, strict=True):
+        plat *= to_rad
+        h = (sin((plat - lat0) / 2) ** 2
+             + cos_lat0 * cos(plat) * sin((plon * to_rad - lon0) / 2) ** 2)
+        append(diameter * asin(sqrt(h)))
+    return dists
+
+
+def _calc_dists_numpy(
+    lat: float,
+    lon: float,
+    lats: Sequence[float],
+    lons: Sequence[float],
+    radius: float,
+) -> array[float]:
+    """NumPy implementation of calc_dists()."""
+    lat0 = math.radians(lat)
+    lon0 = math.radians(lon)
+    plat = _np.radians(_np.asarray(lats, dtype=_np.float64))
+    plon = _np.radians(_np.asarray(lons, dtype=_np.float64))
+    h = (_np.sin((plat - lat0) / 2) ** 2
+         + math.cos(lat0) * _np.cos(plat) * _np.sin((plon - lon0) / 2) ** 2)
+    # Rounding can push h a hair past 1 for antipodal points.
+    dists = 2 * radius * _np.arcsin(_np.sqrt(_np.minimum(h, 1.0)))
+    return array('d', dists.tobytes())
+
+
+def calc_dist_matrix(
+    origins: Sequence[tuple[float, float]],
+    lats: Sequence[float],
+    lons: Sequence[float],
+    radius: float = EARTH_RADIUS_KM,
+) -> list[array[float]]:
+    """Return the origins x points great-circle distance matrix.
+
+    ``origins`` is a sequence of (lat, lon) pairs. The result holds one
+    ``array('d')`` per origin, each the same length as ``lats``. Point
+    radians and latitude cosines are computed once and shared by every
+    origin; with NumPy the whole matrix is a single broadcast expression.
+    """
+    if len(lats) != len(lons):
+        raise ValueError('lats and lons differ in length')
+    if len(origins) == 1:
+        lat, lon = origins[0]
+        return [calc_dists(lat, lon, lats, lons, radius)]
+    if _np is not None and len(lats) >= _NUMPY_MIN_POINTS:
+        return _calc_dist_matrix_numpy(origins, lats, lons, radius)
+
+    to_rad = math.pi / 180.0
+    sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+    diameter = 2 * radius
+    plats = [plat * to_rad for plat in lats]
+    plons = [plon * to_rad for plon in lons]
+    cos_plats = [cos(plat) for plat in plats]
+
+    matrix: list[array[float]] = []
+    for lat, lon in origins:
+        lat0 = lat * to_rad
+        lon0 = lon * to_rad
+        cos_lat0 = cos(lat0)
+        matrix.append(array('d', [
+            diameter * asin(sqrt(sin((plat - lat0) / 2) ** 2
+                                 + cos_lat0 * cos_plat
+                                 * sin((plon - lon0) / 2) ** 2))
+            for plat, cos_plat, plon in zip(plats, cos_plats, plons, strict=True)
+        ]))
+    return matrix
+
+
+def _calc_dist_matrix_numpy(
+    origins: Sequence[tuple[float, float]],
+    lats: Sequence[float],
+    lons: Sequence[float],
+    radius: float,
+) -> list[array[float]]:
+    """NumPy implementation of calc_dist_matrix()."""
+    origin_rad = _np.radians(_np.asarray(origins, dtype=_np.float64))
+    lat0 = origin_rad[:, 0:1]
+    lon0 = origin_rad[:, 1:2]
+    plat = _np.radians(_np.asarray(lats, dtype=_np.float64))[_np.newaxis, :]
+    plon = _np.radians(_np.asarray(lons, dtype=_np.float64))[_np.newaxis, :]
+    h = (_np.sin((plat - lat0) / 2) ** 2
+         + _np.cos(lat0) * _np.cos(plat) * _np.sin((plon - lon0) / 2) ** 2)
+    dists = 2 * radius * _np.arcsin(_np.sqrt(_np.minimum(h, 1.0)))
+    return [array('d', row.tobytes()) for row in dists]
@@ -0,0 +1,269 @@
+"""Parallel parsing of large saved GeoJSON catalogs across processes.
+
+parse_table() decodes one feature at a time on one core. For a saved
+catalog of hundreds of MB, parse_table_parallel() instead splits the
+'features' array into byte ranges at feature boundaries and hands each
+range to a worker process, which decodes it and measures its distances
+with the same per-feature code. The partial tables are joined in feed
+order with QuakeTable.extend() and their magnitude statistics with
+MagnitudeStats.merge(), giving exactly what parse_table() would.
+
+Split points are found without parsing: each is the first '},{'
+(whitespace allowed) after an even division of the file, which could
+lie inside a feature - in a string, or a nested array of objects. A
+worker therefore checks that its last feature ends exactly where the
+next range begins. The first range starts at a true feature, so if
+every range passes, every split point was a true boundary; if any
+fails, the file is parsed serially instead. A bad guess costs time,
+never correctness.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any
+
+from seismic_reporting.core import (
+    EVENT_FIELDS,
+    Origin,
+    QuakeTable,
+    _feed_meta,
+    _field_readers,
+    _fill_table,
+    parse_table,
+)
+from seismic_reporting.stats import MagnitudeStats
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+# Ranges smaller than this are not worth a process of their own.
+_MIN_RANGE_BYTES: int = 8 << 20
+
+# A candidate split point: the '{' opening the feature after a '},'.
+_BOUNDARY = re.compile(rb'\}[ \t\n\r]*,[ \t\n\r]*(\{)')
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+
+# What may follow a feature: another one, or the end of the array.
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+
+# (table, magnitude statistics, byte offset just past the array's ']',
+# known only to the last range)
+_Part = tuple[QuakeTable, MagnitudeStats | None, int | None]
+
+
+def _skip(buf: mmap.mmap, pos: int) -> int:
+    """Offset of the first non-whitespace byte at or after `pos`."""
+    found = _WHITESPACE.match(buf, pos)
+    return found.end() if found else pos
+
+
+def _expect(buf: mmap.mmap, pos: int, chars: bytes) -> tuple[bytes, int]:
+    """Consume one byte after whitespace, which must be one of `chars`."""
+    pos = _skip(buf, pos)
+    char = buf[pos:pos + 1]
+    if not char or char not in chars:
+        raise ValueError('expected one of {!r} at byte {}'.format(chars, pos))
+    return char, pos + 1
+
+
+def _value(buf: mmap.mmap, pos: int) -> tuple[Any, int]:
+    """Decode the (small) top-level JSON value at `pos`; return it and its end.
+
+    Reads a growing window rather than the rest of the file, so a
+    'metadata' member costs the same however many features follow it.
+    """
+    pos = _skip(buf, pos)
+    decoder = json.JSONDecoder()
+    size = 1 << 12
+    while True:
+        final = pos + size >= len(buf)
+        text = codecs.getincrementaldecoder('utf-8')().decode(
+            buf[pos:pos + size], final)
+        try:
+            value, end = decoder.raw_decode(text)
+        except json.JSONDecodeError:
+            if final:
+                raise
+        else:
+            # A number at the end of the window may continue past it.
+            if end < len(text) or final:
+                return value, pos + len(text[:end].encode('utf-8'))
+        size *= 4
+
+
+def _members(buf: mmap.mmap, pos: int, header: dict[str, Any]) -> int | None:
+    """Read top-level members from `pos` into `header` up to 'features'.
+
+    `pos` is just after the object's '{' or a member's ','. Returns the
+    offset just inside the features array's '[', or None if the object
+    ends first.
+    """
+    pos = _skip(buf, pos)
+    if buf[pos:pos + 1] == b'}':
+        return None
+    while True:
+        key, pos = _value(buf, pos)
+        _, pos = _expect(buf, pos, b':')
+        if key == 'features':
+            _, pos = _expect(buf, pos, b'[')
+            return _skip(buf, pos)
+        header[key], pos = _value(buf, pos)
+        char, pos = _expect(buf, pos, b',}')
+        if char == b'}':
+            return None
+
+
+def _range_features(
+    text: str, last: bool, tail: list[int],
+) -> Iterator[dict[str, Any]]:
+    """Yield the features of one range, checking it holds them whole.
+
+    A range other than the last must end just after a ',' that follows
+    a feature; the last must close the array, and its ']' position (the
+    character after it) is appended to `tail`. ValueError otherwise.
+    """
+    decode = json.JSONDecoder().raw_decode
+    pos = 0
+    while True:
+        feature, pos = decode(text, pos)
+        yield feature
+        separator = _SEPARATOR.match(text, pos)
+        if separator is None:
+            raise ValueError('expected , or ] after a feature')
+        pos = separator.end()
+        if separator.group(1) == ']':
+            if not last:
+                raise ValueError('features array ends inside a range')
+            tail.append(pos)
+            return
+        if pos == len(text):
+            if last:
+                raise ValueError('features array is not closed')
+            return
+
+
+def _parse_range(
+    path: str,
+    begin: int,
+    end: int,
+    last: bool,
+    sites: list[Origin],
+    fields: tuple[str, ...],
+    with_stats: bool,
+) -> _Part | None:
+    """Worker: parse bytes [begin, end) of `path` into a measured table.
+
+    None if the range does not hold whole features; the caller then
+    parses the file serially, which reports any real error in it.
+    """
+    table = QuakeTable(fields)
+    stats = MagnitudeStats() if with_stats else None
+    tail: list[int] = []
+    try:
+        with open(path, 'rb') as stream:
+            stream.seek(begin)
+            text = stream.read(end - begin).decode('utf-8')
+        _fill_table(table, _range_features(text, last, tail), stats)
+    except (ValueError, KeyError, TypeError, IndexError):
+        return None
+    table.measure_from_sites(sites)
+    closed = end - len(text[tail[0]:].encode('utf-8')) if tail else None
+    return table, stats, closed
+
+
+def _split(buf: mmap.mmap, start: int, ranges: int) -> list[int]:
+    """Up to `ranges` candidate range starts, the first being `start`."""
+    starts = [start]
+    for part in range(1, ranges):
+        target = start + (len(buf) - start) * part // ranges
+        found = _BOUNDARY.search(buf, max(target, starts[-1] + 1))
+        if found is None:
+            break
+        starts.append(found.start(1))
+    return starts
+
+
+def parse_table_parallel(
+    path: str | os.PathLike[str],
+    origin: Origin | Sequence[Origin],
+    mag_stats: MagnitudeStats | None = None,
+    fields: Iterable[str] = EVENT_FIELDS,
+    workers: int | None = None,
+) -> tuple[QuakeTable, dict[str, Any]]:
+    """parse_table() for a saved GeoJSON file, spread over processes.
+
+    Returns what parse_table() would for the file at `path` - the same
+    rows in feed order, distances, metadata and `mag_stats` - using up
+    to `workers` processes (default: one per CPU), and never more than
+    there are CPUs: on a single CPU no pool is started at all. A file
+    too small to be worth splitting, or one whose split points do not
+    check out, is also parsed serially in this process.
+    """
+    sites = [origin] if isinstance(origin, Origin) else list(origin)
+    fields = tuple(name for name, _ in _field_readers(fields))
+    path = os.fspath(path)
+    with open(path, 'rb') as stream:
+        size = os.fstat(stream.fileno()).st_size
+        cpus = os.cpu_count() or 1
+        ranges = min(workers or cpus, cpus, size // _MIN_RANGE_BYTES)
+        if ranges > 1:
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                parsed = _parse_ranges(buf, path, ranges, sites, fields,
+                                       mag_stats)
+            if parsed is not None:
+                return parsed
+        return parse_table(stream, sites, mag_stats, fields)
+
+
+def _parse_ranges(
+    buf: mmap.mmap,
+    path: str,
+    ranges: int,
+    sites: list[Origin],
+    fields: tuple[str, ...],
+    mag_stats: MagnitudeStats | None,
+) -> tuple[QuakeTable, dict[str, Any]] | None:
+    """parse_table_parallel() proper; None to fall back to a serial parse."""
+    header: dict[str, Any] = {}
+    try:
+        _, pos = _expect(buf, 0, b'{')
+        start = _members(buf, pos, header)
+    except (ValueError, TypeError):
+        return None
+    if start is None or buf[start:start + 1] == b']':
+        return None
+    starts = _split(buf, start, ranges)
+    if len(starts) < 2:
+        return None
+    ends = [*starts[1:], len(buf)]
+    lasts = [False] * (len(starts) - 1) + [True]
+    with ProcessPoolExecutor(max_workers=len(starts)) as pool:
+        parts = list(pool.map(_parse_range, repeat(path), starts, ends, lasts,
+                              repeat(sites), repeat(fields),
+                              repeat(mag_stats is not None)))
+    done = [part for part in parts if part is not None]
+    closed = done[-1][2] if len(done) == len(parts) else None
+    if closed is None:
+        return None
+    table = done[0][0]
+    for part, stats, _ in done:
+        if part is not table:
+            table.extend(part)
+        if mag_stats is not None and stats is not None:
+            mag_stats.merge(stats)
+    try:
+        char, pos = _expect(buf, closed, b',}')
+        if char == b',' and _members(buf, pos, header) is not None:
+            return None  # a second 'features' member
+    except (ValueError, TypeError):
+        return None
+    return table, _feed_meta(header, len(table))
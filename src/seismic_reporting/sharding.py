@@ -0,0 +1,186 @@
+"""Parallel, time-sharded fetching for large FDSN queries.
+
+USGS caps a single query at SERVER_LIMIT events and a long window may
+time out, so fetch_sharded() splits [starttime, endtime) into
+sub-windows, fetches them concurrently on a bounded thread pool, and
+splices the results into one GeoJSON document that parse_table() /
+parse_quakes() read like any other response. A shard that comes back
+holding the full limit was truncated: it is split in half and both
+halves are fetched again, so shard size adapts to event density.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import BinaryIO, cast
+
+from seismic_reporting.core import (
+    FDSNClient,
+    TransferStats,
+    build_fdsn_url,
+    iter_features,
+    open_geojson,
+)
+from seismic_reporting.util import fdsn_time, parse_utc
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+# Maximum number of events USGS returns for one query.
+SERVER_LIMIT: int = 20000
+
+# A truncated shard narrower than this is not split further.
+_MIN_SHARD = datetime.timedelta(seconds=1)
+
+# Merged output stays in memory up to this size, then spills to disk.
+_SPOOL_BYTES: int = 32 * 1024 * 1024
+
+_Window = tuple[datetime.datetime, datetime.datetime]
+_Shard = list[tuple[str, bytes]]  # (event id, compact feature JSON)
+
+
+def split_window(
+    starttime: str, endtime: str, shards: int
+) -> list[_Window]:
+    """Split an ISO-8601 time range into `shards` equal, contiguous windows."""
+    start, end = parse_utc(starttime), parse_utc(endtime)
+    if end <= start:
+        raise ValueError('endtime must be after starttime')
+    step = (end - start) / max(shards, 1)
+    edges = [start + step * n for n in range(shards)] + [end]
+    return list(zip(edges[:-1], edges[1:], strict=True))
+
+
+def fetch_sharded(
+    min_mag: float,
+    starttime: str,
+    endtime: str | None = None,
+    lat: float | None = None,
+    lon: float | None = None,
+    radius_km: float | None = None,
+    shards: int = 8,
+    workers: int = 4,
+    retries: int = 2,
+    timeout: float = 30,
+    limit: int = SERVER_LIMIT,
+    client: FDSNClient | None = None,
+    stats: TransferStats | None = None,
+) -> BinaryIO:
+    """Fetch a query as parallel time shards; return one GeoJSON stream.
+
+    Parameters mirror build_fdsn_url(); `endtime` defaults to now. Each
+    shard is retried up to `retries` times with exponential back-off
+    before the whole fetch fails with RuntimeError. Events are
+    de-duplicated by id (a boundary event may appear in two shards) and
+    written newest shard first, matching FDSN's default time ordering.
+    The returned stream is positioned at the start and owned by the
+    caller. Pass a `client` to reuse keep-alive connections across shards,
+    and `stats` to total the bytes transferred by all of them.
+    """
+    if endtime is None:
+        endtime = fdsn_time(datetime.datetime.now(datetime.timezone.utc))
+
+    def fetch(window: _Window) -> _Shard:
+        url = build_fdsn_url(min_mag, fdsn_time(window[0]),
+                             endtime=fdsn_time(window[1]), lat=lat, lon=lon,
+                             radius_km=radius_km, limit=limit)
+        attempt = 0
+        while True:
+            try:
+                with open_geojson(url, timeout, client=client,
+                                  stats=stats) as stream:
+                    return [(str(feature.get('id', '')),
+                             json.dumps(feature, separators=(',', ':'))
+                             .encode('utf-8'))
+                            for feature in iter_features(stream)]
+            except (RuntimeError, OSError, ValueError) as err:
+                if attempt == retries:
+                    raise RuntimeError('shard {} to {} failed: {}'.format(
+                        fdsn_time(window[0]), fdsn_time(window[1]),
+                        err)) from err
+            time.sleep(0.5 * 2 ** attempt)
+            attempt += 1
+
+    merged = _MergedDocument()
+    # Windows not yet written, and the finished ones among them waiting
+    # for a newer window: output is newest first, so a shard is written
+    # as soon as every newer one has been.
+    unwritten: set[_Window] = set()
+    waiting: dict[_Window, _Shard] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            pending: dict[Future[_Shard], _Window] = {}
+            for window in split_window(starttime, endtime, shards):
+                pending[pool.submit(fetch, window)] = window
+                unwritten.add(window)
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    window = pending.pop(future)
+                    try:
+                        shard = future.result()
+                    except RuntimeError:
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    start, end = window
+                    if len(shard) >= limit and end - start > _MIN_SHARD:
+                        unwritten.remove(window)
+                        middle = start + (end - start) / 2
+                        for half in ((start, middle), (middle, end)):
+                            pending[pool.submit(fetch, half)] = half
+                            unwritten.add(half)
+                    else:
+                        waiting[window] = shard
+                while waiting and max(unwritten) in waiting:
+                    newest = max(unwritten)
+                    unwritten.remove(newest)
+                    merged.add(waiting.pop(newest))
+    except BaseException:
+        merged.out.close()
+        raise
+    return merged.finish()
+
+
+class _MergedDocument:
+    """Shards spliced newest-first into one FeatureCollection, deduplicated.
+
+    Features are written to a spooled temporary file as each shard is
+    added, so only shards still waiting on a newer one are held in memory.
+    """
+
+    def __init__(self) -> None:
+        self.out = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+        self.out.write(b'{"type":"FeatureCollection","features":[')
+        self.seen: set[str] = set()
+        self.count = 0
+        self.shards = 0
+
+    def add(self, shard: _Shard) -> None:
+        """Append the features of the next-newest shard."""
+        out, seen = self.out, self.seen
+        for event_id, feature in shard:
+            if event_id and event_id in seen:
+                continue
+            seen.add(event_id)
+            if self.count:
+                out.write(b',')
+            out.write(feature)
+            self.count += 1
+        self.shards += 1
+
+    def finish(self) -> BinaryIO:
+        """Close the document and return it, positioned at the start."""
+        out = self.out
+        out.write(b'],"metadata":')
+        out.write(json.dumps({
+            'count': self.count,
+            'title': 'USGS FDSN Earthquakes ({} shards)'.format(self.shards),
+        }).encode('utf-8'))
+        out.write(b'}')
+        out.seek(0)
+        return cast(BinaryIO, out)
@@ -0,0 +1,177 @@
+"""In-memory spatial index over event coordinates.
+
+build_fdsn_url() pushes radial filtering to USGS, so every new centre or
+radius is another request. Once a catalog is loaded, SpatialIndex answers
+the same questions locally: a fixed latitude/longitude grid maps each
+cell to the rows inside it, a radius query visits only the cells that
+can intersect the search cap, and the candidates' exact great-circle
+distances come from one calc_dists() batch. Nearest-k queries grow the
+radius until it holds k events. cell_key() and cap_cells() expose the
+grid itself, for the SQLite store's cell index.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from collections.abc import Sequence
+
+from seismic_reporting.haversine import EARTH_RADIUS_KM, calc_dists
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+# Default grid cell size, in degrees of latitude and longitude.
+CELL_DEG: float = 1.0
+
+
+def _grid(cell_deg: float) -> tuple[float, int, int]:
+    """(cells per degree, latitude bands, longitude columns) of a grid."""
+    if not 0 < cell_deg <= 90:
+        raise ValueError('cell_deg must be in (0, 90]')
+    return 1 / cell_deg, math.ceil(180 / cell_deg), math.ceil(360 / cell_deg)
+
+
+def _band(lat: float, scale: float, bands: int) -> int:
+    return min(max(int((lat + 90) * scale), 0), bands - 1)
+
+
+def _column(lon: float, scale: float, columns: int) -> int:
+    return int((lon + 180) % 360 * scale) % columns
+
+
+def cell_key(lat: float, lon: float, cell_deg: float = CELL_DEG) -> int:
+    """Key of the grid cell holding (lat, lon): band * columns + column."""
+    scale, bands, columns = _grid(cell_deg)
+    return (_band(lat, scale, bands) * columns
+            + _column(lon, scale, columns))
+
+
+def cell_keys(
+    lats: Sequence[float], lons: Sequence[float], cell_deg: float = CELL_DEG
+) -> list[int]:
+    """cell_key() of every (lat, lon) pair, in one pass."""
+    scale, bands, columns = _grid(cell_deg)
+    # _band() / _column(), inlined: this runs once per event.
+    top = bands - 1
+    return [min(max(int((lat + 90) * scale), 0), top) * columns
+            + int((lon + 180) % 360 * scale) % columns
+            for lat, lon in zip(lats, lons, strict=True)]
+
+
+def cap_cells(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    cell_deg: float = CELL_DEG,
+    limit: int | None = None,
+) -> list[int] | None:
+    """Keys of every grid cell that may hold a point within `radius_km`.
+
+    None when the search cap covers the whole sphere, or would take more
+    than `limit` cells - scanning every point is then the cheaper plan.
+    """
+    angle = radius_km / EARTH_RADIUS_KM  # angular radius, radians
+    if angle >= math.pi:
+        return None
+    scale, bands, columns = _grid(cell_deg)
+    reach = math.degrees(angle)
+    south, north = lat - reach, lat + reach
+    # Longitude half-width of the spherical cap; a cap holding a pole
+    # spans every longitude.
+    ratio = math.sin(angle) / max(math.cos(math.radians(lat)), 1e-12)
+    if south <= -90 or north >= 90 or ratio >= 1:
+        width = 180.0
+    else:
+        width = math.degrees(math.asin(ratio))
+    band_keys = range(_band(south, scale, bands) * columns,
+                      (_band(north, scale, bands) + 1) * columns, columns)
+    if width >= 180:
+        offsets: Sequence[int] = range(columns)
+    else:
+        first = _column(lon - width, scale, columns)
+        count = int(2 * width / cell_deg) + 2
+        offsets = [(first + step) % columns
+                   for step in range(min(count, columns))]
+    if limit is not None and len(band_keys) * len(offsets) > limit:
+        return None
+    return [base + offset for base in band_keys for offset in offsets]
+
+
+class SpatialIndex:
+    """Grid of row numbers keyed by (latitude band, longitude column).
+
+    `lats` and `lons` are parallel coordinate columns in decimal degrees
+    (e.g. a QuakeTable's); they are referenced, not copied, so must not
+    change while the index is in use. Building costs one pass; queries
+    cost the cells they touch plus one distance per candidate row.
+    """
+
+    def __init__(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        cell_deg: float = CELL_DEG,
+    ) -> None:
+        if len(lats) != len(lons):
+            raise ValueError('lats and lons differ in length')
+        keys = cell_keys(lats, lons, cell_deg)
+        self.lats = lats
+        self.lons = lons
+        self.cell_deg = cell_deg
+        self._cells: dict[int, array[int]] = {}
+        cells = self._cells
+        for row, key in enumerate(keys):
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = array('I')
+            cell.append(row)
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> list[int]:
+        """Rows in every cell that may hold a point within `radius_km`."""
+        cells = self._cells
+        keys = cap_cells(lat, lon, radius_km, self.cell_deg, len(cells))
+        if keys is None:
+            return list(range(len(self)))  # cheaper to scan every row
+        rows: list[int] = []
+        for key in keys:
+            cell = cells.get(key)
+            if cell is not None:
+                rows.extend(cell)
+        return rows
+
+    def _measure(
+        self, lat: float, lon: float, rows: list[int]
+    ) -> array[float]:
+        lats, lons = self.lats, self.lons
+        return calc_dists(lat, lon, [lats[row] for row in rows],
+                          [lons[row] for row in rows])
+
+    def within(
+        self, lat: float, lon: float, radius_km: float
+    ) -> list[tuple[float, int]]:
+        """(distance km, row) of every point within `radius_km`, by row."""
+        rows = sorted(self._candidates(lat, lon, radius_km))
+        return [(dist, row) for dist, row
+                in zip(self._measure(lat, lon, rows), rows, strict=True)
+                if dist <= radius_km]
+
+    def nearest(self, lat: float, lon: float, k: int) -> list[tuple[float, int]]:
+        """(distance km, row) of the `k` nearest points, nearest first.
+
+        Ties are broken by row. Searches a radius of one cell, doubling it
+        until at least `k` points lie inside; every point nearer than the
+        k-th is then within the radius searched, so the result is exact.
+        """
+        if k <= 0 or not len(self):
+            return []
+        radius_km = math.radians(self.cell_deg) * EARTH_RADIUS_KM
+        while True:
+            found = self.within(lat, lon, radius_km)
+            if len(found) >= k or radius_km >= math.pi * EARTH_RADIUS_KM:
+                return heapq.nsmallest(k, found)
+            radius_km *= 2
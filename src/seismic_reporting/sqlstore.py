@@ -0,0 +1,245 @@
+"""SQLite event history with indexed local queries.
+
+The GeoJSON store in sync.py mirrors one query window and is rewritten
+whole on every sync. EventDatabase keeps a history of any length in a
+single SQLite file instead: parse_table() or parse_quakes() output is
+bulk-inserted with executemany() in one transaction per call, each event
+upserted by id so only its newest revision is kept, in WAL mode so a
+report can read while another process writes. query() takes
+build_fdsn_url()'s filters - minimum magnitude, time window, radius
+around a point - and answers them locally from indexes on time,
+magnitude and the spatial grid cell (see spatial.cell_key()).
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+
+from seismic_reporting.core import (
+    EVENT_FIELDS,
+    Origin,
+    Quake,
+    QuakeTable,
+)
+from seismic_reporting.haversine import calc_dists
+from seismic_reporting.spatial import cap_cells, cell_key, cell_keys
+from seismic_reporting.stats import MagnitudeStats
+from seismic_reporting.util import epoch_ms
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+# Grid cell size of the `cell` column. Stored data depends on it, so it
+# is fixed here rather than following spatial.CELL_DEG.
+_CELL_DEG: float = 1.0
+
+# Radius queries spanning more cells than this skip the cell index and
+# rely on the time and magnitude indexes instead.
+_MAX_CELLS: int = 500
+
+_SCHEMA_VERSION: int = 1
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    event_id TEXT UNIQUE,           -- NULL when the feed gave none
+    time_ms INTEGER NOT NULL,
+    mag REAL NOT NULL,
+    mag_known INTEGER NOT NULL,     -- 0: the feed gave no magnitude
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    cell INTEGER NOT NULL,          -- spatial.cell_key(lat, lon, _CELL_DEG)
+    depth_km REAL,                  -- NULL when unknown
+    place TEXT NOT NULL,
+    updated_ms INTEGER NOT NULL,
+    mag_type TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_time ON events (time_ms);
+CREATE INDEX IF NOT EXISTS events_mag ON events (mag);
+CREATE INDEX IF NOT EXISTS events_cell ON events (cell, time_ms);
+'''
+
+# A newer revision of a stored event replaces it; an older one is ignored.
+_UPSERT = '''
+INSERT INTO events (event_id, time_ms, mag, mag_known, lat, lon, cell,
+                    depth_km, place, updated_ms, mag_type, event_type, status)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (event_id) DO UPDATE SET
+    time_ms = excluded.time_ms, mag = excluded.mag,
+    mag_known = excluded.mag_known, lat = excluded.lat,
+    lon = excluded.lon, cell = excluded.cell, depth_km = excluded.depth_km,
+    place = excluded.place, updated_ms = excluded.updated_ms,
+    mag_type = excluded.mag_type, event_type = excluded.event_type,
+    status = excluded.status
+WHERE excluded.updated_ms >= events.updated_ms
+'''
+
+_SELECT = ('SELECT mag, mag_known, place, lat, lon, time_ms, depth_km, '
+           'event_id, updated_ms, mag_type, event_type, status FROM events')
+
+# FDSN `orderby` values and the ORDER BY clause each stands for.
+_ORDER_BY: dict[str, str] = {
+    'time': 'time_ms DESC',
+    'time-asc': 'time_ms',
+    'magnitude': 'mag DESC',
+    'magnitude-asc': 'mag',
+}
+
+
+def _event_rows(quakes: list[Quake] | QuakeTable) -> Iterator[tuple[Any, ...]]:
+    """_UPSERT parameters per event; a table's are read column by column."""
+    if not isinstance(quakes, QuakeTable):
+        for q in quakes:
+            yield (q.event_id or None, q.time_ms, q.mag, q.mag_known,
+                   q.lat, q.lon, cell_key(q.lat, q.lon, _CELL_DEG),
+                   None if math.isnan(q.depth_km) else q.depth_km, q.place,
+                   q.updated_ms, q.mag_type, q.event_type, q.status)
+        return
+    table, rows = quakes, len(quakes)
+
+    def column(name: str, default: Any) -> Iterable[Any]:
+        if name not in table.fields:
+            return repeat(default, rows)
+        if name == 'event_id':
+            return [event_id or None for event_id in table.event_id]
+        if name == 'depth_km':
+            return [None if math.isnan(depth) else depth
+                    for depth in table.depth_km]
+        if name == 'updated_ms':
+            return table.updated_ms
+        return map(table.labels.__getitem__, getattr(table, name))
+
+    yield from zip(
+        column('event_id', None), table.time_ms, table.mag, table.mag_known,
+        table.lat, table.lon, cell_keys(table.lat, table.lon, _CELL_DEG),
+        column('depth_km', None), map(table.places.__getitem__,
+                                      table.place_id),
+        column('updated_ms', 0), column('mag_type', ''),
+        column('event_type', ''), column('status', ''), strict=True)
+
+
+class EventDatabase:
+    """A SQLite file of USGS events, queried like the FDSN service.
+
+    Use as a context manager, or call close(). With `create=False` the
+    file must already exist (sqlite3.OperationalError otherwise), so a
+    mistyped path is not silently created empty.
+    """
+
+    def __init__(self, path: str | Path, create: bool = True) -> None:
+        self.path = Path(path)
+        if create:
+            self._conn = sqlite3.connect(self.path)
+        else:
+            self._conn = sqlite3.connect(
+                '{}?mode=rw'.format(self.path.absolute().as_uri()), uri=True)
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, _SCHEMA_VERSION):
+            self._conn.close()
+            raise ValueError('{} has unsupported schema version {}'.format(
+                path, version))
+        # WAL lets reports read while a sync writes; NORMAL sync is safe
+        # with WAL and spares an fsync per transaction.
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(
+                'PRAGMA user_version = {}'.format(_SCHEMA_VERSION))
+
+    def __enter__(self) -> EventDatabase:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute(
+            'SELECT count(*) FROM events').fetchone()[0])
+
+    def insert(self, quakes: list[Quake] | QuakeTable) -> int:
+        """Add or update `quakes` in one transaction; return rows changed.
+
+        Events are matched by event_id, and a stored event is replaced
+        only by a revision at least as new (by updated_ms). Events with
+        no id - e.g. parsed with a `fields` projection that left it out -
+        are always added.
+        """
+        with self._conn:
+            cursor = self._conn.executemany(_UPSERT, _event_rows(quakes))
+        return cursor.rowcount
+
+    def query(
+        self,
+        origin: Origin | Sequence[Origin],
+        min_mag: float,
+        starttime: str,
+        endtime: str | None = None,
+        lat: float | None = None,
+        lon: float | None = None,
+        radius_km: float | None = None,
+        orderby: str = 'time',
+        limit: int | None = None,
+        mag_stats: MagnitudeStats | None = None,
+        fields: Iterable[str] = EVENT_FIELDS,
+    ) -> tuple[QuakeTable, dict[str, Any]]:
+        """Stored events matching an FDSN query, as (QuakeTable, metadata).
+
+        `min_mag` to `limit` mean what they do for build_fdsn_url(), and
+        deleted events are left out as FDSN leaves them out; `origin`,
+        `mag_stats` and `fields` are as for parse_table(). A radius query
+        reads only the grid cells the circle touches, then keeps the
+        events within `radius_km` by exact great-circle distance.
+        """
+        if orderby not in _ORDER_BY:
+            raise ValueError('unknown orderby: {}'.format(orderby))
+        where = ["status != 'deleted'", 'mag >= ?', 'time_ms >= ?']
+        params: list[Any] = [min_mag, epoch_ms(starttime)]
+        if endtime is not None:
+            where.append('time_ms <= ?')
+            params.append(epoch_ms(endtime))
+        circle = None
+        if lat is not None and lon is not None and radius_km is not None:
+            circle = (lat, lon, radius_km)
+            cells = cap_cells(lat, lon, radius_km, _CELL_DEG, _MAX_CELLS)
+            if cells is not None:
+                where.append('cell IN ({})'.format(','.join('?' * len(cells))))
+                params.extend(cells)
+        sql = '{} WHERE {} ORDER BY {}'.format(_SELECT, ' AND '.join(where),
+                                                _ORDER_BY[orderby])
+        if limit is not None and circle is None:
+            sql += ' LIMIT {:d}'.format(limit)
+
+        table = QuakeTable(fields)
+        for (mag, mag_known, place, qlat, qlon, time_ms, depth_km, event_id,
+             updated_ms, mag_type, event_type, status) in self._conn.execute(
+                 sql, params):
+            table.append(mag, place, qlat, qlon, time_ms,
+                         depth_km=math.nan if depth_km is None else depth_km,
+                         event_id=event_id or '', updated_ms=updated_ms,
+                         mag_type=mag_type, event_type=event_type,
+                         status=status, mag_known=bool(mag_known))
+        if circle is not None:
+            # The cells over-select; LIMIT applies after the exact cut.
+            center_lat, center_lon, radius = circle
+            dists = calc_dists(center_lat, center_lon, table.lat, table.lon)
+            rows = [row for row, dist in enumerate(dists) if dist <= radius]
+            table = table.take(rows[:limit])
+        table.measure_from_sites(
+            [origin] if isinstance(origin, Origin) else origin)
+        if mag_stats is not None:
+            mag_stats.update(table.known_mags())
+        meta = {'title': 'local event database {}'.format(self.path.name),
+                'count': len(table)}
+        return table, meta
@@ -0,0 +1,397 @@
+"""Single-pass, mergeable magnitude statistics.
+
+MagnitudeStats is fed one value at a time - typically while parse_table()
+decodes the feed - and keeps count, min, max and a Welford running mean
+and variance, so no list of magnitudes is built and nothing is re-read.
+Medians and other quantiles are exact while the set is small (the values
+are kept and sorted on demand) and come from a t-digest sketch once it
+grows past `exact_limit`. Two accumulators combine with merge(), so
+shards or parallel parses can each summarise their own events and the
+partial results be added up afterwards.
+
+catalog_stats() adds the seismological view of a parsed catalog: a
+magnitude-frequency histogram, the completeness magnitude and maximum
+likelihood Gutenberg-Richter b-value, event rates and the depth
+distribution. It works on whole columns (a QuakeTable's typed arrays)
+with C-level builtins - Counter, map, fsum, sorted - rather than a
+Python loop per event.
+
+t-digest: Dunning & Ertl, "Computing Extremely Accurate Quantiles Using
+t-Digests" (2019), https://arxiv.org/abs/1902.04023
+b-value: Aki (1965); Utsu (1966); uncertainty after Shi & Bolt (1982).
+Completeness: maximum curvature, Wiemer & Wyss (2000), with the +0.2
+correction of Woessner & Wiemer (2005).
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import math
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from itertools import repeat
+from operator import floordiv
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+# Sets up to this size keep every value and report exact quantiles.
+EXACT_LIMIT: int = 10_000
+
+# t-digest compression: roughly the number of centroids retained.
+# Quantile error is a small fraction of a percent of rank at 100.
+_COMPRESSION: float = 100.0
+
+# Magnitude bin width for the histogram, Mc and b-value (USGS reports
+# magnitudes to 0.1 or finer).
+MAG_BIN: float = 0.1
+
+# Added to the maximum-curvature Mc, which tends to underestimate it.
+MC_CORRECTION: float = 0.2
+
+# Fewer events at or above Mc than this give no b-value.
+_MIN_B_EVENTS: int = 50
+
+# Depth classes, km: shallow above the first, deep at or below the last.
+DEPTH_BANDS: tuple[float, float] = (70.0, 300.0)
+
+_DAY_MS: int = 86_400_000
+
+# Values buffered per compression, as a multiple of the compression.
+# Magnitudes are reported to 0.01, so a large buffer holds many repeats,
+# which compress() collapses into one weighted point before sorting.
+_BUFFER_FACTOR: int = 20
+
+
+def _interpolate(ordered: Sequence[float], q: float) -> float:
+    """The `q` quantile of sorted values, linear between order statistics."""
+    position = q * (len(ordered) - 1)
+    below = math.floor(position)
+    above = min(below + 1, len(ordered) - 1)
+    return ordered[below] + (ordered[above] - ordered[below]) * (position - below)
+
+
+class _TDigest:
+    """Merging t-digest: sorted (mean, weight) centroids plus a buffer."""
+
+    def __init__(self, compression: float = _COMPRESSION) -> None:
+        self.compression = compression
+        self.means: list[float] = []
+        self.weights: list[float] = []
+        self._buffer: list[float] = []
+        self._buffer_limit = int(_BUFFER_FACTOR * compression)
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        if len(self._buffer) >= self._buffer_limit:
+            self.compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        self._buffer.extend(values)
+        if len(self._buffer) >= self._buffer_limit:
+            self.compress()
+
+    def merge(self, other: _TDigest) -> None:
+        """Fold `other`'s centroids and buffered values into this digest."""
+        self._buffer.extend(other._buffer)
+        self.compress(list(zip(other.means, other.weights, strict=True)))
+
+    def _k(self, q: float) -> float:
+        # k1 scale function: centroids are smallest near q = 0 and q = 1.
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        angle = min(k * 2 * math.pi / self.compression, math.pi / 2)
+        return (math.sin(angle) + 1) / 2
+
+    def compress(self, extra: list[tuple[float, float]] | None = None) -> None:
+        """Merge buffered values (and `extra` centroids) into the centroids."""
+        points = list(zip(self.means, self.weights, strict=True))
+        points.extend((value, float(repeats))
+                      for value, repeats in Counter(self._buffer).items())
+        if extra:
+            points.extend(extra)
+        self._buffer.clear()
+        if not points:
+            return
+        points.sort()
+        total = math.fsum(weight for _, weight in points)
+        means: list[float] = []
+        weights: list[float] = []
+        mean, weight = points[0]
+        before = 0.0
+        limit = total * self._k_inverse(self._k(0.0) + 1)
+        for value, value_weight in points[1:]:
+            if before + weight + value_weight <= limit:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                limit = total * self._k_inverse(self._k(before / total) + 1)
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q: float, low: float, high: float) -> float:
+        """Interpolated `q` quantile; `low`/`high` are the exact extremes."""
+        self.compress()
+        total = math.fsum(self.weights)
+        rank = q * total
+        # Each centroid's mean sits at the midpoint of the ranks it covers.
+        previous_mean, previous_rank = low, 0.0
+        covered = 0.0
+        for mean, weight in zip(self.means, self.weights, strict=True):
+            centre = covered + weight / 2
+            if rank < centre:
+                span = centre - previous_rank
+                fraction = (rank - previous_rank) / span if span else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_mean, previous_rank = mean, centre
+            covered += weight
+        span = total - previous_rank
+        fraction = (rank - previous_rank) / span if span else 1.0
+        return previous_mean + fraction * (high - previous_mean)
+
+
+class MagnitudeStats:
+    """Streaming count / min / max / mean / variance / quantile accumulator.
+
+    add() costs O(1) amortised and memory stays bounded: at most
+    `exact_limit` values plus a few hundred centroids. Quantiles are
+    exact up to `exact_limit` values and approximate beyond.
+    """
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT) -> None:
+        self.exact_limit = exact_limit
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+        self._values: array[float] | None = array('d')
+        self._digest: _TDigest | None = None
+
+    @classmethod
+    def of(cls, values: Iterable[float]) -> MagnitudeStats:
+        """An accumulator fed every value in `values`."""
+        stats = cls()
+        stats.update(values)
+        return stats
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def exact(self) -> bool:
+        """True while quantiles are computed from the retained values."""
+        return self._values is not None
+
+    def add(self, value: float) -> None:
+        """Fold one value into the statistics."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self._values is not None:
+            self._values.append(value)
+            if len(self._values) > self.exact_limit:
+                self._to_sketch()
+        else:
+            assert self._digest is not None
+            self._digest.add(value)
+
+    def update(self, values: Iterable[float]) -> None:
+        """Fold every value of `values` into the statistics.
+
+        The batch is summarised on its own with C-level sums and then
+        merged, which is much cheaper than one add() per value.
+        """
+        batch = array('d', values)
+        if not batch:
+            return
+        part = MagnitudeStats(self.exact_limit)
+        part.count = len(batch)
+        part.mean = math.fsum(batch) / part.count
+        part._m2 = math.fsum([(value - part.mean) ** 2 for value in batch])
+        part.min, part.max = min(batch), max(batch)
+        part._values = batch
+        if part.count > self.exact_limit:
+            part._to_sketch()
+        self.merge(part)
+
+    def merge(self, other: MagnitudeStats) -> None:
+        """Combine `other`'s partial statistics into this accumulator.
+
+        The result is the same as if this accumulator had been fed both
+        value streams (quantiles up to the sketch's approximation).
+        """
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self._values is not None and other._values is not None:
+            self._values.extend(other._values)
+            if len(self._values) > self.exact_limit:
+                self._to_sketch()
+            return
+        if self._values is not None:
+            self._to_sketch()
+        assert self._digest is not None
+        if other._values is not None:
+            self._digest.extend(other._values)
+        else:
+            assert other._digest is not None
+            self._digest.merge(other._digest)
+
+    def _to_sketch(self) -> None:
+        assert self._values is not None
+        self._digest = _TDigest()
+        self._digest.extend(self._values)
+        self._values = None
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator); NaN below two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation; NaN below two values."""
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> float:
+        """The `q` quantile (0 <= q <= 1); NaN when no values were added.
+
+        Exact mode interpolates linearly between order statistics, so
+        quantile(0.5) is the conventional median.
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError('quantile must be between 0 and 1')
+        if not self.count:
+            return math.nan
+        if self._values is None:
+            assert self._digest is not None
+            return min(max(self._digest.quantile(q, self.min, self.max),
+                           self.min), self.max)
+        return _interpolate(sorted(self._values), q)
+
+    def percentiles(self, percents: Iterable[float]) -> list[float]:
+        """quantile() at each of `percents`, given on a 0-100 scale."""
+        return [self.quantile(percent / 100) for percent in percents]
+
+    @property
+    def median(self) -> float:
+        """The 50% quantile."""
+        return self.quantile(0.5)
+
+
+@dataclass
+class CatalogStats:
+    """Extended statistics for a catalog; see catalog_stats()."""
+
+    count: int
+    bin_width: float
+    histogram: list[tuple[float, int]]  # (bin magnitude, events), ascending
+    mc: float                           # completeness magnitude, or NaN
+    b_value: float | None               # None below _MIN_B_EVENTS above Mc
+    b_error: float | None
+    b_count: int                        # events at or above Mc
+    span_days: float | None             # None for a single instant
+    busiest_day: tuple[str, int] | None   # (UTC date, events)
+    depth_quantiles: tuple[float, float, float] | None  # median, 90%, max
+    depth_bands: tuple[int, int, int]   # shallow, intermediate, deep
+
+    @property
+    def per_day(self) -> float | None:
+        """Mean events per day over the span."""
+        return self.count / self.span_days if self.span_days else None
+
+    @property
+    def per_hour(self) -> float | None:
+        """Mean events per hour over the span."""
+        per_day = self.per_day
+        return per_day / 24 if per_day is not None else None
+
+
+def catalog_stats(
+    mags: Sequence[float | None],
+    times_ms: Sequence[int],
+    depths_km: Sequence[float],
+    span_days: float | None = None,
+    bin_width: float = MAG_BIN,
+    mc_correction: float = MC_CORRECTION,
+) -> CatalogStats:
+    """Histogram, Mc, b-value, rates and depths of a catalog's columns.
+
+    The three sequences are parallel columns, one entry per event (NaN
+    for an unknown depth, NaN or None for an unknown magnitude, which
+    the magnitude statistics leave out). `span_days` is the observation
+    window the rates are taken over, e.g. the query's look-back; by
+    default it is the time between the first and last event. Magnitudes
+    are rounded half up to `bin_width` bins, the completeness magnitude
+    Mc is the most populated bin plus `mc_correction`, and the b-value
+    is the Aki-Utsu maximum likelihood estimate over events at or above
+    Mc.
+    """
+    scale = 1 / bin_width
+    bins = Counter(math.floor(mag * scale + 0.5) for mag in mags
+                   if mag is not None and not math.isnan(mag))
+    histogram = [(index * bin_width, bins[index]) for index in sorted(bins)]
+
+    mc = math.nan
+    b_value = b_error = None
+    b_count = 0
+    if bins:
+        mode = max(sorted(bins), key=bins.__getitem__)
+        mc_index = mode + round(mc_correction * scale)
+        mc = mc_index * bin_width
+        above = [(index, count) for index, count in bins.items()
+                 if index >= mc_index]
+        b_count = sum(count for _, count in above)
+        if b_count >= _MIN_B_EVENTS:
+            mean = math.fsum(index * count for index, count in above) / b_count
+            spread = math.fsum((index - mean) ** 2 * count
+                               for index, count in above) * bin_width ** 2
+            excess = mean * bin_width - (mc - bin_width / 2)
+            if excess > 0:
+                b_value = math.log10(math.e) / excess
+                b_error = 2.3 * b_value ** 2 * math.sqrt(
+                    spread / (b_count * (b_count - 1)))
+
+    busiest_day = None
+    if times_ms:
+        if span_days is None:
+            span_days = (max(times_ms) - min(times_ms)) / _DAY_MS
+        days = Counter(map(floordiv, times_ms, repeat(_DAY_MS)))
+        day, events = max(sorted(days.items()), key=lambda item: item[1])
+        busiest_day = (datetime.datetime.fromtimestamp(
+            day * _DAY_MS / 1000, tz=datetime.timezone.utc).date().isoformat(),
+            events)
+
+    depths = sorted(depth for depth in depths_km if not math.isnan(depth))
+    shallow = bisect.bisect_left(depths, DEPTH_BANDS[0])
+    deep = len(depths) - bisect.bisect_left(depths, DEPTH_BANDS[1])
+    depth_quantiles = ((_interpolate(depths, 0.5), _interpolate(depths, 0.9),
+                        depths[-1]) if depths else None)
+
+    return CatalogStats(
+        count=len(mags), bin_width=bin_width, histogram=histogram, mc=mc,
+        b_value=b_value, b_error=b_error, b_count=b_count,
+        span_days=span_days or None, busiest_day=busiest_day,
+        depth_quantiles=depth_quantiles,
+        depth_bands=(shallow, len(depths) - shallow - deep, deep))
@@ -0,0 +1,204 @@
+"""Incremental catalog sync into a local GeoJSON event store.
+
+The store is an ordinary GeoJSON FeatureCollection on disk, so it can be
+read back with parse_table() or `seismic --file`. Its metadata records
+the query it mirrors, the start of the window it covers and a watermark:
+the newest 'updated' time seen, or when nothing matched, the time of the
+last request.
+Each sync asks FDSN only for events updated after the watermark
+(including deletions) and merges them into the store by event id, so a
+frequent cron job transfers minutes of changes instead of the whole
+window.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from seismic_reporting.core import (
+    FDSNClient,
+    TransferStats,
+    build_fdsn_url,
+    iter_features,
+    lookback_start,
+    open_geojson,
+)
+from seismic_reporting.util import (
+    atomic_write,
+    epoch_ms,
+    fdsn_time,
+    utc_from_ms,
+)
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+# Re-request this much before the watermark on every sync, so events
+# published to FDSN slightly out of 'updated' order are not missed.
+# Merging by id makes the overlap harmless.
+_WATERMARK_OVERLAP_MS: int = 60_000
+
+
+@dataclass
+class SyncResult:
+    """What one sync_store() call changed."""
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    pruned: int = 0
+    full: bool = False  # True when the whole window was (re)downloaded
+
+    def summary(self) -> str:
+        """Short description for the report header."""
+        kind = 'full sync' if self.full else 'sync'
+        return '{}: {} new, {} updated, {} deleted'.format(
+            kind, self.inserted, self.updated, self.deleted)
+
+
+def _updated_ms(feature: dict[str, Any]) -> int:
+    props = feature['properties']
+    return int(props.get('updated') or props['time'])
+
+
+class EventStore:
+    """A GeoJSON event store file, held in memory keyed by event id."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.features: dict[str, dict[str, Any]] = {}
+        self.query: dict[str, Any] = {}
+        self.start_ms: int | None = None  # start of the window covered
+        self.watermark_ms: int | None = None
+
+    def load(self) -> None:
+        """Read the store file; a missing file leaves the store empty."""
+        try:
+            handle = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        header: dict[str, Any] = {}
+        with handle:
+            self.features = {feature['id']: feature
+                             for feature in iter_features(handle, header)}
+        state = header.get('metadata', {}).get('sync', {})
+        self.query = state.get('query', {})
+        self.start_ms = state.get('start')
+        self.watermark_ms = state.get('watermark')
+
+    def reset(self, query: dict[str, Any]) -> None:
+        """Empty the store and record the query it now mirrors."""
+        self.features = {}
+        self.query = query
+        self.start_ms = None
+        self.watermark_ms = None
+
+    def merge(self, feature: dict[str, Any], result: SyncResult) -> None:
+        """Insert, replace or delete one feature, by event id."""
+        event_id = feature['id']
+        if feature['properties'].get('status') == 'deleted':
+            if self.features.pop(event_id, None) is not None:
+                result.deleted += 1
+        else:
+            if event_id in self.features:
+                result.updated += 1
+            else:
+                result.inserted += 1
+            self.features[event_id] = feature
+        updated = _updated_ms(feature)
+        if self.watermark_ms is None or updated > self.watermark_ms:
+            self.watermark_ms = updated
+
+    def prune(self, before_ms: int) -> int:
+        """Drop events whose origin time is before `before_ms`."""
+        stale = [event_id for event_id, feature in self.features.items()
+                 if feature['properties']['time'] < before_ms]
+        for event_id in stale:
+            del self.features[event_id]
+        return len(stale)
+
+    def save(self) -> None:
+        """Write the store atomically, newest event first."""
+        features = sorted(self.features.values(),
+                          key=lambda f: f['properties']['time'], reverse=True)
+        document = {
+            'type': 'FeatureCollection',
+            'metadata': {
+                'title': 'USGS FDSN Earthquakes (local store)',
+                'count': len(features),
+                'sync': {'query': self.query, 'start': self.start_ms,
+                         'watermark': self.watermark_ms},
+            },
+            'features': features,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with (atomic_write(self.path) as tmp,
+              io.TextIOWrapper(tmp, encoding='utf-8') as text):
+            json.dump(document, text, separators=(',', ':'))
+
+
+def sync_store(
+    path: Path,
+    min_mag: float,
+    days: float,
+    lat: float | None = None,
+    lon: float | None = None,
+    radius_km: float | None = None,
+    timeout: float = 10,
+    client: FDSNClient | None = None,
+    stats: TransferStats | None = None,
+) -> SyncResult:
+    """Bring the store at `path` up to date with FDSN, and save it.
+
+    The first sync - or any sync whose query parameters differ from the
+    ones the store was built with, or whose window reaches further back
+    than the store's - downloads the whole window. Later syncs fetch
+    only events updated since the store's watermark, which a sync that
+    finds no events at all sets to the time of its request. Events that
+    have aged out of the `days` window are pruned. Network failures
+    raise RuntimeError, as fetch_geojson() does; the store is then left
+    unchanged on disk. `client` and `stats` are passed through to
+    open_geojson().
+    """
+    if radius_km is None:
+        lat = lon = None  # a global query: the observer is irrelevant
+    query = {'min_mag': min_mag, 'lat': lat, 'lon': lon,
+             'radius_km': radius_km}
+    store = EventStore(path)
+    store.load()
+    result = SyncResult()
+    starttime = lookback_start(days)
+    start_ms = epoch_ms(starttime)
+    if (store.query != query or store.watermark_ms is None
+            or store.start_ms is None or start_ms < store.start_ms):
+        store.reset(query)
+        result.full = True
+
+    updatedafter = None
+    if store.watermark_ms is not None:
+        updatedafter = fdsn_time(
+            utc_from_ms(store.watermark_ms - _WATERMARK_OVERLAP_MS))
+    url = build_fdsn_url(min_mag, starttime, lat=lat, lon=lon,
+                         radius_km=radius_km, updatedafter=updatedafter,
+                         includedeleted=not result.full)
+    requested_ms = int(time.time() * 1000)
+    with open_geojson(url, timeout, client=client,
+                      stats=stats) as stream:
+        try:
+            for feature in iter_features(stream):
+                store.merge(feature, result)
+        except OSError as err:
+            raise RuntimeError('USGS request failed: {}'.format(err)) from err
+
+    if store.watermark_ms is None:
+        # Nothing matched: the next sync need only ask what changed since.
+        store.watermark_ms = requested_ms - _WATERMARK_OVERLAP_MS
+    store.start_ms = start_ms
+    result.pruned = store.prune(start_ms)
+    store.save()
+    return result
@@ -0,0 +1,68 @@
+"""Small helpers shared by the storage and fetching modules.
+
+atomic_write() replaces a file without a reader ever seeing it half
+written; the time helpers convert between FDSN ISO-8601 timestamps,
+aware UTC datetimes and the epoch milliseconds USGS reports. This module
+imports nothing from the rest of the package, so any module can use it.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+__author__ = "Michael E. O'Connor"
+__copyright__ = "Copyright 2026"
+
+
+@contextmanager
+def atomic_write(path: str | Path) -> Iterator[BinaryIO]:
+    """Open a binary temporary file beside `path`; rename it over `path`.
+
+    The file is created in the same directory, so the final os.replace()
+    is atomic: a concurrent reader sees the old file or the new one,
+    never a partial write. If the block raises, the temporary file is
+    removed and `path` is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as tmp:
+            yield tmp
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def parse_utc(stamp: str) -> datetime.datetime:
+    """An FDSN ISO-8601 timestamp as an aware datetime (UTC if unmarked).
+
+    Raises ValueError for a string that is not ISO-8601.
+    """
+    moment = datetime.datetime.fromisoformat(stamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment
+
+
+def epoch_ms(stamp: str) -> int:
+    """An FDSN ISO-8601 timestamp (UTC if unmarked) as epoch milliseconds."""
+    return int(parse_utc(stamp).timestamp() * 1000)
+
+
+def utc_from_ms(time_ms: float) -> datetime.datetime:
+    """Epoch milliseconds as an aware UTC datetime."""
+    return datetime.datetime.fromtimestamp(time_ms / 1000.0,
+                                           tz=datetime.timezone.utc)
+
+
+def fdsn_time(moment: datetime.datetime) -> str:
+    """An aware datetime as an FDSN ISO-8601 UTC timestamp (milliseconds)."""
+    return moment.astimezone(datetime.timezone.utc).strftime(
+        '%Y-%m-%dT%H:%M:%S.%f')[:-3]
@@ -0,0 +1,43 @@
+"""urlopen stand-ins shared by the tests that fetch from a fake FDSN."""
+
+from __future__ import annotations
+
+import io
+import json
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request
+
+
+class FakeResponse(io.BytesIO):
+    """An urlopen() response: status code, headers and an in-memory body."""
+
+    def __init__(self, code: int = 200, payload: bytes = b"",
+                 headers: dict[str, str] | None = None) -> None:
+        super().__init__(payload)
+        self._code = code
+        self.headers = headers or {}
+
+    def getcode(self) -> int:
+        return self._code
+
+
+def geojson_response(features: list[dict[str, Any]]) -> FakeResponse:
+    """A 200 response carrying `features` as a FeatureCollection."""
+    return FakeResponse(200, json.dumps(
+        {"type": "FeatureCollection", "features": features}).encode())
+
+
+class FakeFeed:
+    """Stands in for urlopen: one FeatureCollection per request, in turn.
+
+    The query parameters of each request are recorded in `queries`.
+    """
+
+    def __init__(self, *batches: list[dict[str, Any]]) -> None:
+        self.batches = list(batches)
+        self.queries: list[dict[str, list[str]]] = []
+
+    def __call__(self, request: Request, timeout: float = 10) -> FakeResponse:
+        self.queries.append(parse_qs(urlparse(request.full_url).query))
+        return geojson_response(self.batches.pop(0))
@@ -0,0 +1,241 @@
+"""Tests for seismic_reporting.cache and the cached open_geojson path."""
+
+from __future__ import annotations
+
+import datetime
+import io
+import os
+import time
+from pathlib import Path
+from typing import Any
+from urllib.error import HTTPError
+
+import pytest
+
+from seismic_reporting import core
+from seismic_reporting.cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_REVALIDATED,
+    ResponseCache,
+    cache_key,
+    default_cache_dir,
+)
+from seismic_reporting.core import fetch_geojson, open_geojson
+from tests._fakes import FakeResponse
+
+URL = "https://example.test/query?starttime=2024-01-01T00:00:00&format=geojson"
+
+
+class _FakeServer:
+    """Stands in for urlopen, recording the request headers it was sent."""
+
+    def __init__(self, *responses: FakeResponse | HTTPError) -> None:
+        self.responses = list(responses)
+        self.requests: list[dict[str, str]] = []
+
+    def __call__(self, request: Any, timeout: float = 10) -> FakeResponse:
+        self.requests.append(dict(request.header_items()))
+        response = self.responses.pop(0)
+        if isinstance(response, HTTPError):
+            raise response
+        return response
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ResponseCache:
+    return ResponseCache(tmp_path / "cache", ttl_s=60)
+
+
+# --------------------------------------------------------------------------
+# keys and storage
+# --------------------------------------------------------------------------
+
+def test_cache_key_ignores_parameter_order() -> None:
+    """Equivalent queries normalise to one key."""
+    assert cache_key("https://Example.test/q?b=2&a=1") == cache_key(
+        "https://example.test/q?a=1&b=2")
+    assert cache_key("https://example.test/q?a=1") != cache_key(
+        "https://example.test/q?a=2")
+
+
+def test_default_cache_dir_honours_xdg(monkeypatch: pytest.MonkeyPatch) -> None:
+    """XDG_CACHE_HOME relocates the cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", "/xdg")
+    assert default_cache_dir() == Path("/xdg/seismic-reporting")
+
+
+def test_construction_has_no_side_effects(tmp_path: Path) -> None:
+    """The directory is only created when something is stored."""
+    ResponseCache(tmp_path / "cache")
+    assert not (tmp_path / "cache").exists()
+
+
+def test_store_then_lookup(cache: ResponseCache) -> None:
+    """A stored body round-trips with its validators."""
+    with cache.store(URL, io.BytesIO(b"body"), {"ETag": '"v1"'}) as stream:
+        assert stream.read() == b"body"
+    entry = cache.lookup(URL)
+    assert entry is not None
+    assert entry.validators() == {"If-None-Match": '"v1"'}
+    assert cache.is_fresh(entry)
+    assert cache.last_status == CACHE_MISS
+
+
+def test_lookup_missing(cache: ResponseCache) -> None:
+    assert cache.lookup(URL) is None
+
+
+def test_entry_expires_after_ttl(cache: ResponseCache) -> None:
+    cache.store(URL, io.BytesIO(b"body"), {}).close()
+    entry = cache.lookup(URL)
+    assert entry is not None
+    entry.stored_at -= 61
+    assert not cache.is_fresh(entry)
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    """Least-recently-used bodies are dropped once over the size bound."""
+    cache = ResponseCache(tmp_path, max_bytes=35)
+    urls = ["https://example.test/q?n={}".format(n) for n in range(3)]
+    for age, url in enumerate(urls):
+        cache.store(url, io.BytesIO(b"x" * 10), {}).close()
+        entry = cache.lookup(url)
+        assert entry is not None
+        stamp = time.time() - 100 + age
+        os.utime(entry.body, (stamp, stamp))
+    oldest = cache.lookup(urls[0])
+    assert oldest is not None
+    cache.open_entry(oldest).close()
+    cache.store("https://example.test/q?n=new", io.BytesIO(b"x" * 10), {}).close()
+    assert cache.lookup(urls[0]) is not None
+    assert cache.lookup(urls[1]) is None
+    assert cache.lookup(urls[2]) is not None
+
+
+# --------------------------------------------------------------------------
+# open_geojson / fetch_geojson with a cache
+# --------------------------------------------------------------------------
+
+def test_open_geojson_miss_then_hit(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A repeat query within the TTL never reaches the network."""
+    server = _FakeServer(FakeResponse(200, b'{"features": []}'))
+    monkeypatch.setattr(core, "urlopen", server)
+    assert fetch_geojson(URL, cache=cache) == b'{"features": []}'
+    assert cache.last_status == CACHE_MISS
+    with open_geojson(URL, cache=cache) as stream:
+        assert stream.read() == b'{"features": []}'
+    assert cache.last_status == CACHE_HIT
+    assert len(server.requests) == 1
+
+
+def test_open_geojson_revalidates_stale_entry(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A stale entry is revalidated and reused on HTTP 304."""
+    not_modified = HTTPError(URL, 304, "Not Modified", {}, None)
+    server = _FakeServer(
+        FakeResponse(200, b"old", {"ETag": '"v1"',
+                                    "Last-Modified": "Mon, 01 Jan 2024"}),
+        not_modified)
+    monkeypatch.setattr(core, "urlopen", server)
+    fetch_geojson(URL, cache=cache)
+    cache.ttl_s = 0
+    assert fetch_geojson(URL, cache=cache) == b"old"
+    assert cache.last_status == CACHE_REVALIDATED
+    assert server.requests[1]["If-none-match"] == '"v1"'
+    assert server.requests[1]["If-modified-since"] == "Mon, 01 Jan 2024"
+
+
+def test_open_geojson_replaces_changed_entry(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A stale entry whose content changed is replaced by the new body."""
+    server = _FakeServer(FakeResponse(200, b"old", {"ETag": '"v1"'}),
+                         FakeResponse(200, b"new", {"ETag": '"v2"'}))
+    monkeypatch.setattr(core, "urlopen", server)
+    fetch_geojson(URL, cache=cache)
+    cache.ttl_s = 0
+    assert fetch_geojson(URL, cache=cache) == b"new"
+    assert cache.last_status == CACHE_MISS
+    entry = cache.lookup(URL)
+    assert entry is not None and entry.etag == '"v2"'
+
+
+def test_open_geojson_repeats_lookback_query(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """'The past day' asked again later reuses its entry; 'past week' does not."""
+    clock = [datetime.datetime(2024, 5, 2, 12, 0, 50,
+                               tzinfo=datetime.timezone.utc).timestamp()]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+
+    def past(days: float) -> str:
+        now = datetime.datetime.fromtimestamp(clock[0], datetime.timezone.utc)
+        return core.build_fdsn_url(2.5, core.lookback_start(days, now))
+
+    not_modified = HTTPError(URL, 304, "Not Modified", {}, None)
+    server = _FakeServer(FakeResponse(200, b"day", {"ETag": '"v1"'}),
+                         not_modified, FakeResponse(200, b"week"))
+    monkeypatch.setattr(core, "urlopen", server)
+    first = past(1)
+    assert fetch_geojson(first, cache=cache) == b"day"
+    clock[0] += 20  # into the next minute: the start time has moved
+    assert past(1) != first
+    assert fetch_geojson(past(1), cache=cache) == b"day"
+    assert cache.last_status == CACHE_HIT
+    clock[0] += 120  # past the TTL
+    assert fetch_geojson(past(1), cache=cache) == b"day"
+    assert cache.last_status == CACHE_REVALIDATED
+    assert server.requests[1]["If-none-match"] == '"v1"'
+    assert fetch_geojson(past(7), cache=cache) == b"week"
+    assert cache.last_status == CACHE_MISS
+    assert len(server.requests) == 3
+
+
+def test_open_geojson_caches_empty_result(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An HTTP 204 is cached as an empty FeatureCollection."""
+    monkeypatch.setattr(core, "urlopen", _FakeServer(FakeResponse(204)))
+    assert b'"features":[]' in fetch_geojson(URL, cache=cache)
+    assert b'"features":[]' in fetch_geojson(URL, cache=cache)
+
+
+def test_open_geojson_wrap_aborts_download(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An error raised by `wrap` mid-body closes the response, stores nothing."""
+    class Abort(Exception):
+        pass
+
+    class Guard(io.RawIOBase):
+        def __init__(self, stream: Any) -> None:
+            self.stream = stream
+            self.reads = 0
+
+        def read(self, size: int = -1) -> bytes:
+            self.reads += 1
+            if self.reads > 1:
+                raise Abort()
+            return self.stream.read(size)
+
+    response = FakeResponse(200, b"x" * (4 << 20))
+    monkeypatch.setattr(core, "urlopen", _FakeServer(response))
+    with pytest.raises(Abort):
+        open_geojson(URL, cache=cache, wrap=Guard)
+    assert response.closed
+    assert cache.lookup(URL) is None
+    assert not list(cache.directory.glob("*.tmp"))
+
+
+def test_open_geojson_cached_error_still_raises(
+    cache: ResponseCache, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Errors are translated to RuntimeError and nothing is stored."""
+    monkeypatch.setattr(core, "urlopen", _FakeServer(FakeResponse(500)))
+    with pytest.raises(RuntimeError, match="HTTP 500"):
+        open_geojson(URL, cache=cache)
+    assert cache.lookup(URL) is None
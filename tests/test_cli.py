@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import io
+import json
+import os
+import threading
 from pathlib import Path
+from typing import BinaryIO
 
 import pytest
 
-from seismic_reporting import cli
+from seismic_reporting import cli, parallel
+from seismic_reporting.core import FDSNClient, TransferStats
+from seismic_reporting.export import read_columnar
+from seismic_reporting.sync import SyncResult
 
 # --------------------------------------------------------------------------
 # parse_args
@@ -49,6 +57,19 @@ def test_parse_args_rejects_bad_sort() -> None:
         cli.parse_args(["--sort", "depth"])
 
 
+def test_parse_args_sites() -> None:
+    """Each --site adds an Origin; the name is optional."""
+    args = cli.parse_args(["--site", "19.7,-155.1,Hilo", "--site=-40,-10"])
+    assert [(o.lat, o.lon, o.name) for o in args.sites] == [
+        (19.7, -155.1, "Hilo"), (-40.0, -10.0, "-40,-10")]
+
+
+def test_parse_args_rejects_bad_site() -> None:
+    """A --site value that is not LAT,LON is rejected by argparse."""
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--site", "Hilo"])
+
+
 def test_sort_codes_cover_all_choices() -> None:
     """Every CLI sort name maps to a known core sort code."""
     assert set(cli._SORT_CODES) == {"magnitude", "location", "distance", "time"}
@@ -91,6 +112,55 @@ def test_main_file_mode_all_sorts(
     assert capsys.readouterr().out.strip() != ""
 
 
+def test_main_file_mode_per_site(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--per-site prints one section per --site from a single parse."""
+    rc = cli.main(["--file", str(sample_path), "--per-site",
+                   "--site", "19.7,-155.1,Hilo", "--site=-40,-10,South"])
+    out = capsys.readouterr().out
+    assert rc == 0
+    assert "DISTANCE from: Hilo" in out
+    assert "DISTANCE from: South" in out
+
+
+def test_main_stats_section(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--stats adds the extended statistics section to the header."""
+    assert cli.main(["--file", str(sample_path), "--stats"]) == 0
+    out = capsys.readouterr().out
+    assert "Completeness Mc" in out
+    assert out.index("Depth median") < out.index("[Events are sorted")
+
+
+def test_main_file_radius_filters_locally(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """With --file, --radius keeps only events within KM of the observer."""
+    assert cli.main(["--file", str(sample_path), "--radius", "100"]) == 0
+    out = capsys.readouterr().out
+    assert "Recorded 2 events" in out
+    assert out.count("centered") == 2
+    assert "within 100 km" in out
+    assert "Hilo" not in out
+
+
+def test_main_nearest(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--nearest K reports the K events closest to the observer."""
+    assert cli.main(["--file", str(sample_path), "--nearest", "3",
+                     "--sort", "magnitude"]) == 0
+    out = capsys.readouterr().out
+    assert out.count("centered") == 3
+    assert "Mid-Atlantic" not in out
+    assert "nearest 3" in out
+    for bad in ("0", "-1"):
+        with pytest.raises(SystemExit):
+            cli.parse_args(["--nearest", bad])
+
+
 def test_main_empty_file(
     empty_path: Path, capsys: pytest.CaptureFixture[str],
 ) -> None:
@@ -113,9 +183,257 @@ def test_main_network_error_returns_1(
     monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str],
 ) -> None:
     """A failed fetch is reported to stderr with exit status 1, no traceback."""
-    def boom(url: str, timeout: float = 10) -> bytes:
+    def boom(url: str, timeout: float = 10, **kwargs: object) -> BinaryIO:
         raise RuntimeError("USGS request timed out after 10s")
-    monkeypatch.setattr(cli, "fetch_geojson", boom)
+    monkeypatch.setattr(cli, "open_geojson", boom)
     rc = cli.main(["--days", "1"])
     assert rc == 1
     assert "Error retrieving data" in capsys.readouterr().err
+
+
+def test_main_closes_client_on_error(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Pooled connections are closed even when the fetch fails."""
+    closed: list[bool] = []
+
+    class Client(FDSNClient):
+        def close(self) -> None:
+            closed.append(True)
+            super().close()
+
+    def boom(url: str, timeout: float = 10, **kwargs: object) -> BinaryIO:
+        raise RuntimeError("USGS request timed out after 10s")
+    monkeypatch.setattr(cli, "FDSNClient", Client)
+    monkeypatch.setattr(cli, "open_geojson", boom)
+    assert cli.main(["--days", "1"]) == 1
+    assert closed == [True]
+
+
+def test_parse_args_rejects_limit_with_sync_or_shards() -> None:
+    """--limit would be ignored by --sync and --shards, so it is refused."""
+    for extra in (["--sync", "a.geojson"], ["--shards", "4"]):
+        with pytest.raises(SystemExit):
+            cli.parse_args(["--limit", "20", *extra])
+    assert cli.parse_args(["--limit", "20", "--shards", "1"]).limit == 20
+
+
+def test_main_sync_reports_from_store(
+    sample_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--sync updates the store, then reports from it with a sync note."""
+    store = tmp_path / "store.geojson"
+
+    def fake_sync(path: Path, *args: object, **kwargs: object) -> SyncResult:
+        path.write_bytes(sample_path.read_bytes())
+        return SyncResult(inserted=4, full=True)
+    monkeypatch.setattr(cli, "sync_store", fake_sync)
+    rc = cli.main(["--sync", str(store)])
+    out = capsys.readouterr().out
+    assert rc == 0
+    assert "Recorded 4 events" in out
+    assert "full sync: 4 new, 0 updated, 0 deleted" in out
+
+
+def test_main_sharded_fetch(
+    sample_bytes: bytes, monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--shards routes the query through fetch_sharded."""
+    calls: list[int] = []
+
+    def fake_sharded(*args: object, shards: int = 1,
+                     **kwargs: object) -> BinaryIO:
+        calls.append(shards)
+        return io.BytesIO(sample_bytes)
+    monkeypatch.setattr(cli, "fetch_sharded", fake_sharded)
+    rc = cli.main(["--shards", "4", "--days", "365"])
+    assert rc == 0
+    assert calls == [4]
+    assert "(4 shards)" in capsys.readouterr().out
+
+
+def test_main_reports_transfer_stats(
+    sample_bytes: bytes, monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Bytes moved over the wire are noted after the processing time."""
+    def fake_open(url: str, timeout: float = 10, *,
+                  stats: TransferStats, **kwargs: object) -> BinaryIO:
+        stats.add(300, len(sample_bytes))
+        return io.BytesIO(sample_bytes)
+    monkeypatch.setattr(cli, "open_geojson", fake_open)
+    rc = cli.main(["--no-cache"])
+    assert rc == 0
+    assert "(300 B over the wire for " in capsys.readouterr().out
+
+
+def test_main_top_limits_rows(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--top N prints only N event rows, but statistics over all events."""
+    rc = cli.main(["--file", str(sample_path), "--sort", "magnitude",
+                   "--reverse", "--top", "2"])
+    out = capsys.readouterr().out
+    assert rc == 0
+    assert out.count("centered") == 2
+    assert out.index("4.50 centered") < out.index("3.10 centered")
+    assert "Recorded 4 events" in out
+    assert "(top 2)" in out
+    for bad in ("0", "-3"):
+        with pytest.raises(SystemExit):
+            cli.parse_args(["--top", bad])
+
+
+def test_main_csv_format(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--format csv writes a header and one row per event, in sort order."""
+    rc = cli.main(["--file", str(sample_path), "--format", "csv",
+                   "--sort", "magnitude", "--reverse", "--top", "2"])
+    lines = capsys.readouterr().out.splitlines()
+    assert rc == 0
+    assert lines[0].startswith("mag,place,distance_km,time_ms,lat,lon,")
+    assert [line.split(",")[0] for line in lines[1:]] == ["4.5", "3.1"]
+
+
+def test_main_ndjson_format(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--format ndjson writes one JSON object per event and no report."""
+    rc = cli.main(["--file", str(sample_path), "--format", "ndjson"])
+    out = capsys.readouterr().out
+    assert rc == 0
+    assert "Event statistical Analysis" not in out
+    records = [json.loads(line) for line in out.splitlines()]
+    assert len(records) == 4
+    assert records[0]["distance_km"] <= records[-1]["distance_km"]
+
+
+def test_main_columnar_format(
+    sample_path: Path, capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    """--format columnar writes a catalog read_columnar() loads back."""
+    rc = cli.main(["--file", str(sample_path), "--format", "columnar"])
+    assert rc == 0
+    table, meta = read_columnar(capsysbinary.readouterr().out)
+    assert len(table) == meta["count"] == 4
+
+
+def test_main_format_rejects_stats() -> None:
+    """--stats only applies to the text report."""
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--format", "csv", "--stats"])
+
+
+def test_main_compile_then_report(
+    sample_path: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """A compiled catalog reports the same events as its GeoJSON source."""
+    compiled = tmp_path / "catalog.bin"
+    rc = cli.main(["compile", str(sample_path), "-o", str(compiled)])
+    assert rc == 0
+    assert "Compiled 4 events" in capsys.readouterr().out
+    rows = []
+    for path in (sample_path, compiled):
+        assert cli.main(["--file", str(path), "--sort", "magnitude"]) == 0
+        out = capsys.readouterr().out
+        rows.append([line for line in out.splitlines() if "centered" in line])
+    assert rows[0] == rows[1] and len(rows[0]) == 4
+
+
+def test_main_file_from_pipe(
+    sample_path: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """--file reads GeoJSON or a compiled catalog from a non-seekable pipe."""
+    monkeypatch.setattr(parallel, "_MIN_RANGE_BYTES", 256)
+    compiled = tmp_path / "catalog.bin"
+    assert cli.main(["compile", str(sample_path), "-o", str(compiled)]) == 0
+    capsys.readouterr()
+    pipe = tmp_path / "pipe"
+    rows = []
+    for path in (sample_path, compiled):
+        os.mkfifo(pipe)
+        writer = threading.Thread(target=lambda path=path: pipe.write_bytes(
+            path.read_bytes()))
+        writer.start()
+        assert cli.main(["--file", str(pipe), "--sort", "magnitude",
+                         "--workers", "4"]) == 0
+        writer.join()
+        pipe.unlink()
+        out = capsys.readouterr().out
+        rows.append([line for line in out.splitlines() if "centered" in line])
+    assert rows[0] == rows[1] and len(rows[0]) == 4
+
+
+def test_main_compile_missing_source_returns_1(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """A missing GeoJSON file is reported and nothing is written."""
+    output = tmp_path / "catalog.bin"
+    rc = cli.main(["compile", str(tmp_path / "nope.geojson"),
+                   "-o", str(output)])
+    assert rc == 1
+    assert "Error reading" in capsys.readouterr().err
+    assert not output.exists()
+
+
+def test_main_file_workers(
+    sample_path: Path, capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """--workers parses a --file in processes with the same report rows."""
+    monkeypatch.setattr(parallel, "_MIN_RANGE_BYTES", 256)
+    rows = []
+    for extra in ([], ["--workers", "4"]):
+        assert cli.main(["--file", str(sample_path), "--sort", "magnitude",
+                         *extra]) == 0
+        out = capsys.readouterr().out
+        rows.append([line for line in out.splitlines() if "centered" in line])
+    assert rows[0] == rows[1] and len(rows[0]) == 4
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--workers", "0"])
+
+
+def test_main_save_db_then_report_from_db(
+    sample_path: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Events kept with --save-db are reported again from --db."""
+    database = tmp_path / "quakes.db"
+    rc = cli.main(["--file", str(sample_path), "--save-db", str(database)])
+    out = capsys.readouterr().out
+    assert rc == 0
+    assert "4 saved" in out
+    rows = []
+    for source in (["--file", str(sample_path)],
+                   ["--db", str(database), "--days", "100000",
+                    "--min-mag", "0"]):
+        assert cli.main(source + ["--sort", "magnitude"]) == 0
+        out = capsys.readouterr().out
+        rows.append([line for line in out.splitlines() if "centered" in line])
+    assert "from local event database quakes.db" in out
+    assert rows[0] == rows[1] and len(rows[0]) == 4
+
+
+def test_main_missing_db_returns_1(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    """--db does not create a database that is not there."""
+    database = tmp_path / "nope.db"
+    assert cli.main(["--db", str(database)]) == 1
+    assert "Error reading" in capsys.readouterr().err
+    assert not database.exists()
+
+
+def test_main_db_and_save_db_are_exclusive() -> None:
+    """Reading from and saving to a database cannot be combined."""
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--db", "a.db", "--save-db", "b.db"])
+
+
+def test_main_sync_and_file_are_exclusive() -> None:
+    """--sync and --file cannot be combined."""
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--sync", "a.geojson", "--file", "b.geojson"])
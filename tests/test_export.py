@@ -0,0 +1,257 @@
+"""Tests for seismic_reporting.export."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from seismic_reporting.core import (
+    DEFAULT_ORIGIN,
+    SORT_DISTANCE,
+    SORT_LOCATION,
+    SORT_MAGNITUDE,
+    SORT_TIME,
+    Origin,
+    Quake,
+    QuakeTable,
+    parse_quakes,
+    parse_table,
+    sort_quakes,
+)
+from seismic_reporting.export import (
+    COLUMNAR_MAGIC,
+    read_columnar,
+    record_fields,
+    write_columnar,
+    write_csv,
+    write_ndjson,
+)
+from seismic_reporting.stats import MagnitudeStats
+
+_EVENTS = (
+    b'{"metadata": {"title": "fixture", "count": 3}, "features": ['
+    b'{"type": "Feature", "id": "hv74103036", "properties":'
+    b' {"mag": 2.1, "place": "5km W of Volcano, Hawaii", "time": 1000,'
+    b' "updated": 2000, "magType": "md", "type": "earthquake",'
+    b' "status": "reviewed"}, "geometry": {"coordinates": [-155.3, 19.4, 4.5]}},'
+    b' {"type": "Feature", "id": "us7000abcd", "properties":'
+    b' {"mag": 4.0, "place": "R\\u00edo \\"Grande\\", Chile", "time": 500,'
+    b' "magType": "mb", "type": "earthquake", "status": "automatic"},'
+    b' "geometry": {"coordinates": [-70.0, -30.0, null]}},'
+    b' {"type": "Feature", "id": "nc123", "properties":'
+    b' {"mag": 1.2, "place": "5km W of Volcano, Hawaii", "time": 1500,'
+    b' "magType": "md", "type": "quarry blast", "status": "reviewed"},'
+    b' "geometry": {"coordinates": [-155.2, 19.5, 0.5]}}]}'
+)
+
+
+@pytest.fixture
+def table() -> QuakeTable:
+    """A three-event table with every field, one of unknown depth."""
+    return parse_table(_EVENTS, DEFAULT_ORIGIN)[0]
+
+
+# --------------------------------------------------------------------------
+# record_fields
+# --------------------------------------------------------------------------
+
+def test_record_fields_follow_table_fields() -> None:
+    """A projected table exports only the fields it holds."""
+    bare, _ = parse_table(_EVENTS, DEFAULT_ORIGIN, fields=("status",))
+    assert record_fields(bare) == ["mag", "place", "distance_km", "time_ms",
+                                   "lat", "lon", "status"]
+    quakes, _ = parse_quakes(_EVENTS, DEFAULT_ORIGIN)
+    assert len(record_fields(quakes)) == 12
+
+
+# --------------------------------------------------------------------------
+# write_csv / write_ndjson
+# --------------------------------------------------------------------------
+
+def test_write_csv_round_trips(table: QuakeTable) -> None:
+    """Each row reads back as the event's fields; unknown numbers are empty."""
+    stream = io.StringIO()
+    write_csv(stream, table)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert len(rows) == 3
+    assert list(rows[0]) == record_fields(table)
+    assert rows[0]["event_id"] == "hv74103036"
+    assert rows[0]["place"] == "5km W of Volcano, Hawaii"
+    assert float(rows[0]["distance_km"]) == table.distance_km[0]
+    assert rows[1]["place"] == 'Río "Grande", Chile'
+    assert rows[1]["depth_km"] == ""
+    assert (rows[2]["time_ms"], rows[2]["event_type"]) == ("1500",
+                                                          "quarry blast")
+
+
+def test_write_ndjson_round_trips(table: QuakeTable) -> None:
+    """One JSON object per line, with every field; unknown numbers are null."""
+    stream = io.StringIO()
+    write_ndjson(stream, table)
+    lines = stream.getvalue().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 3
+    for record, quake in zip(records, table, strict=True):
+        assert list(record) == record_fields(table)
+        assert record["mag"] == quake.mag
+        assert record["place"] == quake.place
+        assert record["distance_km"] == quake.distance_km
+        assert (record["event_id"], record["mag_type"]) == (quake.event_id,
+                                                            quake.mag_type)
+    assert records[1]["depth_km"] is None
+    assert records[0]["updated_ms"] == 2000
+
+
+def test_writers_leave_unknown_magnitude_empty() -> None:
+    """A null magnitude is an empty CSV cell and a JSON null, not 0.0."""
+    events = _EVENTS.replace(b'"mag": 4.0', b'"mag": null')
+    unknown, _ = parse_table(events, DEFAULT_ORIGIN)
+    quakes, _ = parse_quakes(events, DEFAULT_ORIGIN)
+    for source in (unknown, quakes):
+        stream = io.StringIO()
+        write_csv(stream, source)
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert [row["mag"] for row in rows] == ["2.1", "", "1.2"]
+        stream = io.StringIO()
+        write_ndjson(stream, source)
+        records = [json.loads(line)
+                   for line in stream.getvalue().splitlines()]
+        assert [record["mag"] for record in records] == [2.1, None, 1.2]
+
+
+def test_writers_accept_quake_list(table: QuakeTable) -> None:
+    """A list of Quakes is written exactly as the equivalent table."""
+    quakes, _ = parse_quakes(_EVENTS, DEFAULT_ORIGIN)
+    for write in (write_csv, write_ndjson):
+        from_list, from_table = io.StringIO(), io.StringIO()
+        write(from_list, quakes)
+        write(from_table, table)
+        assert from_list.getvalue() == from_table.getvalue()
+
+
+def test_write_csv_empty() -> None:
+    """An empty result still gets a header row."""
+    stream = io.StringIO()
+    write_csv(stream, [])
+    assert stream.getvalue().count("\n") == 1
+
+
+# --------------------------------------------------------------------------
+# write_columnar / read_columnar
+# --------------------------------------------------------------------------
+
+def _columnar(
+    quakes: list[Quake] | QuakeTable, meta: dict[str, Any] | None = None,
+) -> bytes:
+    stream = io.BytesIO()
+    write_columnar(stream, quakes, meta)
+    return stream.getvalue()
+
+
+def test_columnar_round_trips(table: QuakeTable) -> None:
+    """Every field, the sites and the metadata survive a write and read."""
+    data = _columnar(table, {"title": "fixture", "count": 99})
+    assert data.startswith(COLUMNAR_MAGIC)
+    loaded, meta = read_columnar(data)
+    assert [loaded[0], loaded[2]] == [table[0], table[2]]
+    assert loaded[1].place == 'Río "Grande", Chile'
+    assert math.isnan(loaded[1].depth_km)
+    assert [q.event_id for q in loaded] == [q.event_id for q in table]
+    assert loaded.sites == [DEFAULT_ORIGIN]
+    assert loaded.distance_km == table.distance_km
+    assert meta == {"title": "fixture", "count": 3}
+
+
+def test_columnar_keeps_unknown_magnitudes() -> None:
+    """An event the feed gave no magnitude stays marked as such."""
+    unknown, _ = parse_table(_EVENTS.replace(b'"mag": 4.0', b'"mag": null'),
+                             DEFAULT_ORIGIN)
+    loaded, _ = read_columnar(_columnar(unknown))
+    assert list(loaded.mag_known) == [1, 0, 1]
+
+
+def test_columnar_reads_mapped_file(table: QuakeTable, tmp_path: Path) -> None:
+    """A file object is memory-mapped, and may be closed once read."""
+    path = tmp_path / "catalog.bin"
+    path.write_bytes(_columnar(table))
+    stats = MagnitudeStats()
+    with open(path, "rb") as stream:
+        loaded, _ = read_columnar(stream, mag_stats=stats)
+    assert loaded[2] == table[2]
+    assert loaded.places == table.places
+    assert (stats.count, stats.max) == (3, 4.0)
+
+
+def test_columnar_maps_columns_in_place(
+    table: QuakeTable, tmp_path: Path,
+) -> None:
+    """Mapped columns are read-only views that the pipeline works on as is."""
+    path = tmp_path / "catalog.bin"
+    path.write_bytes(_columnar(table))
+    with open(path, "rb") as stream:
+        loaded, _ = read_columnar(stream)
+    assert isinstance(loaded.mag, memoryview) and loaded.mag.readonly
+    for sort_code in (SORT_MAGNITUDE, SORT_LOCATION, SORT_DISTANCE, SORT_TIME):
+        assert ([q.event_id for q in sort_quakes(loaded, sort_code, top=2)]
+                == [q.event_id for q in sort_quakes(table, sort_code, top=2)])
+    assert loaded.catalog_stats() == table.catalog_stats()
+    assert len(loaded.within(19.4, -155.3, 50.0)) == 2
+    assert _columnar(loaded) == _columnar(table)
+
+
+def test_columnar_remeasures_other_sites(table: QuakeTable) -> None:
+    """Distances are recomputed only for a different origin."""
+    data = _columnar(table)
+    elsewhere = Origin(-30.0, -70.0, "Chile")
+    loaded, _ = read_columnar(data, elsewhere)
+    assert loaded.sites == [elsewhere]
+    assert loaded.distance_km[1] == pytest.approx(0.0)
+    same, _ = read_columnar(data, DEFAULT_ORIGIN)
+    assert same.distance_km == table.distance_km
+
+
+def test_columnar_keeps_site_matrix() -> None:
+    """A multi-site table keeps every site's distance column."""
+    sites = [DEFAULT_ORIGIN, Origin(-30.0, -70.0, "Chile")]
+    table, _ = parse_table(_EVENTS, sites)
+    loaded, _ = read_columnar(_columnar(table), sites)
+    assert loaded.site_km == table.site_km
+    assert loaded.nearest_site == table.nearest_site
+    assert loaded.for_site(1).distance_km == table.site_km[1]
+
+
+def test_columnar_field_projection(table: QuakeTable) -> None:
+    """Only requested fields are loaded; a sorted table keeps its order."""
+    ordered = sort_quakes(table, SORT_MAGNITUDE, reverse=True)
+    loaded, _ = read_columnar(_columnar(ordered), fields=("depth_km",))
+    assert loaded.fields == {"depth_km"}
+    assert [q.mag for q in loaded] == [4.0, 2.1, 1.2]
+    assert (loaded[1].depth_km, loaded[1].event_id) == (4.5, "")
+
+
+def test_columnar_empty_and_list() -> None:
+    """Empty results and lists of Quakes round-trip too."""
+    empty, meta = read_columnar(_columnar([]))
+    assert len(empty) == 0 and meta == {"count": 0}
+    quakes, _ = parse_quakes(_EVENTS, DEFAULT_ORIGIN)
+    loaded, _ = read_columnar(_columnar(quakes))
+    assert [q.place for q in loaded] == [q.place for q in quakes]
+    assert [q.distance_km for q in loaded] == [q.distance_km for q in quakes]
+
+
+def test_read_columnar_rejects_other_data(tmp_path: Path) -> None:
+    """GeoJSON, truncated and empty input raise ValueError."""
+    with pytest.raises(ValueError):
+        read_columnar(_EVENTS)
+    with pytest.raises(ValueError):
+        read_columnar(COLUMNAR_MAGIC)
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with open(path, "rb") as stream, pytest.raises(ValueError):
+        read_columnar(stream)
@@ -6,7 +6,16 @@ import math
 
 import pytest
 
-from seismic_reporting.haversine import EARTH_RADIUS_KM, calc_dist
+from seismic_reporting import haversine
+from seismic_reporting.haversine import (
+    EARTH_RADIUS_KM,
+    calc_dist,
+    calc_dist_matrix,
+    calc_dists,
+)
+
+_POINTS = [(19.1, -155.4), (20.7, -155.0), (-40.0, -16.0), (0.0, 24.0),
+           (90.0, 0.0), (-19.64, 24.0)] * 20
 
 
 def test_zero_distance() -> None:
@@ -43,3 +52,64 @@ def test_custom_radius_scales_linearly() -> None:
 def test_one_degree_of_latitude() -> None:
     """One degree of latitude is roughly 111 km."""
     assert calc_dist(0.0, 0.0, 1.0, 0.0) == pytest.approx(111.2, abs=0.5)
+
+
+# --------------------------------------------------------------------------
+# calc_dists (batch)
+# --------------------------------------------------------------------------
+
+def test_batch_matches_scalar(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The stdlib batch path agrees with calc_dist point by point."""
+    monkeypatch.setattr(haversine, "_np", None)
+    lats = [p[0] for p in _POINTS]
+    lons = [p[1] for p in _POINTS]
+    dists = calc_dists(19.64, -155.99, lats, lons)
+    assert len(dists) == len(_POINTS)
+    for (lat, lon), dist in zip(_POINTS, dists, strict=True):
+        assert dist == pytest.approx(calc_dist(19.64, -155.99, lat, lon),
+                                     rel=1e-12, abs=1e-9)
+
+
+def test_batch_numpy_matches_scalar() -> None:
+    """The NumPy batch path agrees with calc_dist point by point."""
+    pytest.importorskip("numpy")
+    lats = [p[0] for p in _POINTS]
+    lons = [p[1] for p in _POINTS]
+    dists = calc_dists(19.64, -155.99, lats, lons)
+    for (lat, lon), dist in zip(_POINTS, dists, strict=True):
+        assert dist == pytest.approx(calc_dist(19.64, -155.99, lat, lon),
+                                     rel=1e-9, abs=1e-6)
+
+
+def test_batch_empty() -> None:
+    """No points give an empty result."""
+    assert len(calc_dists(0.0, 0.0, [], [])) == 0
+
+
+def test_batch_length_mismatch() -> None:
+    """Coordinate sequences of different lengths are rejected."""
+    with pytest.raises(ValueError):
+        calc_dists(0.0, 0.0, [1.0, 2.0], [1.0])
+
+
+def test_matrix_matches_scalar(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each matrix row holds the distances from one origin."""
+    monkeypatch.setattr(haversine, "_np", None)
+    origins = [(19.64, -155.99), (37.77, -122.42), (-33.9, 151.2)]
+    lats = [p[0] for p in _POINTS]
+    lons = [p[1] for p in _POINTS]
+    matrix = calc_dist_matrix(origins, lats, lons)
+    assert len(matrix) == len(origins)
+    for (olat, olon), row in zip(origins, matrix, strict=True):
+        assert len(row) == len(_POINTS)
+        for (lat, lon), dist in zip(_POINTS, row, strict=True):
+            assert dist == pytest.approx(calc_dist(olat, olon, lat, lon),
+                                         rel=1e-12, abs=1e-9)
+
+
+def test_matrix_single_origin_matches_batch() -> None:
+    """A one-origin matrix is the calc_dists result."""
+    lats = [p[0] for p in _POINTS]
+    lons = [p[1] for p in _POINTS]
+    assert calc_dist_matrix([(1.0, 2.0)], lats, lons) == [
+        calc_dists(1.0, 2.0, lats, lons)]
@@ -0,0 +1,157 @@
+"""Tests for seismic_reporting.parallel."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from seismic_reporting import parallel
+from seismic_reporting.core import DEFAULT_ORIGIN, Origin, QuakeTable, parse_table
+from seismic_reporting.parallel import parse_table_parallel
+from seismic_reporting.stats import MagnitudeStats
+
+_SITES = [DEFAULT_ORIGIN, Origin(-30.0, -70.0, "Chile")]
+
+
+def _feature(n: int, **props: Any) -> dict[str, Any]:
+    return {
+        "type": "Feature",
+        "id": "ev{}".format(n),
+        "properties": {"mag": None if n % 17 == 0 else n % 60 / 10,
+                       "place": ("{}km N of Río Grande, Chile" if n % 3
+                                 else "{}km W of Volcano, Hawaii").format(n % 7),
+                       "time": 1_700_000_000_000 - n * 60_000,
+                       "magType": ("md", "ml", "mb")[n % 3],
+                       "type": "earthquake", "status": "reviewed", **props},
+        "geometry": {"type": "Point",
+                     "coordinates": [-155.0 + n % 50, 19.0 - n % 40, n % 30]},
+    }
+
+
+def _write(path: Path, features: list[dict[str, Any]],
+           meta_last: bool = False, indent: int | None = None) -> Path:
+    """Save `features` as a FeatureCollection, metadata first or last."""
+    metadata = {"title": "Catálogo", "count": len(features)}
+    document = ({"type": "FeatureCollection", "features": features,
+                 "metadata": metadata} if meta_last else
+                {"type": "FeatureCollection", "metadata": metadata,
+                 "features": features})
+    path.write_text(json.dumps(document, indent=indent, ensure_ascii=False),
+                    encoding="utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def small_ranges(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Split even the small test files into several ranges."""
+    monkeypatch.setattr(parallel, "_MIN_RANGE_BYTES", 1024)
+
+
+@pytest.fixture(autouse=True)
+def several_cpus(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Let the tests use four processes even on a single-CPU machine."""
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 4)
+
+
+def _same(path: Path, **kwargs: Any) -> QuakeTable:
+    """Parse `path` both ways, assert the results match, return the table."""
+    serial_stats, parallel_stats = MagnitudeStats(), MagnitudeStats()
+    with open(path, "rb") as stream:
+        expected, expected_meta = parse_table(stream, _SITES, serial_stats,
+                                              **kwargs)
+    table, meta = parse_table_parallel(path, _SITES, parallel_stats,
+                                       workers=4, **kwargs)
+    assert meta == expected_meta
+    assert list(table) == list(expected)
+    assert table.places == expected.places
+    assert table.labels == expected.labels
+    assert table.site_km == expected.site_km
+    assert table.nearest_site == expected.nearest_site
+    assert (parallel_stats.count, parallel_stats.max) == (serial_stats.count,
+                                                          serial_stats.max)
+    assert parallel_stats.mean == pytest.approx(serial_stats.mean)
+    return table
+
+
+# --------------------------------------------------------------------------
+# parse_table_parallel
+# --------------------------------------------------------------------------
+
+def test_matches_serial_parse(tmp_path: Path) -> None:
+    """Rows, order, distances, metadata and statistics match parse_table()."""
+    path = _write(tmp_path / "catalog.geojson",
+                  [_feature(n) for n in range(300)])
+    assert len(_same(path)) == 300
+
+
+def test_metadata_after_features(tmp_path: Path) -> None:
+    """Members after the features array (as fetch_sharded() writes) are read."""
+    path = _write(tmp_path / "sharded.geojson",
+                  [_feature(n) for n in range(300)], meta_last=True, indent=1)
+    _same(path)
+
+
+def test_field_projection(tmp_path: Path) -> None:
+    """`fields` projects the optional event fields as for parse_table()."""
+    path = _write(tmp_path / "catalog.geojson",
+                  [_feature(n) for n in range(300)])
+    assert _same(path, fields=("depth_km",)).fields == {"depth_km"}
+
+
+def test_misleading_split_points(tmp_path: Path) -> None:
+    """'},{' inside strings and nested objects never corrupts the result."""
+    features = [_feature(n, note='x"},{"y' * (n % 5),
+                         products=[{"a": n}, {"b": n}] * (n % 4))
+                for n in range(300)]
+    _same(_write(tmp_path / "tricky.geojson", features))
+
+
+def test_small_and_empty_files(tmp_path: Path) -> None:
+    """Files too small to split, or with no features, still parse."""
+    _same(_write(tmp_path / "one.geojson", [_feature(1)]))
+    table = _same(_write(tmp_path / "empty.geojson", []))
+    assert len(table) == 0
+
+
+def test_malformed_file_raises_like_parse_table(tmp_path: Path) -> None:
+    """A broken document raises the error a serial parse would."""
+    path = _write(tmp_path / "catalog.geojson",
+                  [_feature(n) for n in range(300)])
+    path.write_bytes(path.read_bytes()[:-5000])
+    with pytest.raises(json.JSONDecodeError):
+        parse_table_parallel(path, DEFAULT_ORIGIN, workers=4)
+
+
+def _no_pool(*args: Any, **kwargs: Any) -> Any:
+    raise AssertionError("a process pool was started")
+
+
+def test_single_cpu_parses_serially(tmp_path: Path,
+                                    monkeypatch: pytest.MonkeyPatch) -> None:
+    """On one CPU no pool is started, whatever `workers` asks for."""
+    path = _write(tmp_path / "catalog.geojson",
+                  [_feature(n) for n in range(300)])
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", _no_pool)
+    assert len(_same(path)) == 300
+
+
+def test_workers_capped_at_cpu_count(tmp_path: Path,
+                                     monkeypatch: pytest.MonkeyPatch) -> None:
+    """Asking for more workers than CPUs starts one process per CPU."""
+    path = _write(tmp_path / "catalog.geojson",
+                  [_feature(n) for n in range(300)])
+    pools: list[int] = []
+    pool_class = parallel.ProcessPoolExecutor
+
+    def pool(max_workers: int) -> Any:
+        pools.append(max_workers)
+        return pool_class(max_workers=max_workers)
+
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", pool)
+    _same(path)
+    assert pools == [2]
@@ -0,0 +1,149 @@
+"""Tests for seismic_reporting.sharding (urlopen monkeypatched - no network)."""
+
+from __future__ import annotations
+
+import datetime
+import threading
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request
+
+import pytest
+
+from seismic_reporting import core, sharding
+from seismic_reporting.core import DEFAULT_ORIGIN, parse_table
+from seismic_reporting.sharding import fetch_sharded, split_window
+from tests._fakes import FakeResponse, geojson_response
+
+START = "2024-01-01T00:00:00"
+END = "2024-01-02T00:00:00"
+START_MS = 1704067200000  # START as epoch milliseconds
+DAY_MS = 86_400_000
+
+
+def _ms(stamp: str) -> int:
+    value = datetime.datetime.fromisoformat(stamp).replace(
+        tzinfo=datetime.timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+class _FakeCatalog:
+    """Answers FDSN time-window queries from an in-memory event list."""
+
+    def __init__(self, times_ms: list[int], fail_first: int = 0) -> None:
+        self.times_ms = times_ms
+        self.fail_first = fail_first
+        self.windows: list[tuple[int, int]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: Request, timeout: float = 10) -> FakeResponse:
+        params = parse_qs(urlparse(request.full_url).query)
+        start = _ms(params["starttime"][0])
+        end = _ms(params["endtime"][0])
+        limit = int(params["limit"][0])
+        with self._lock:
+            self.windows.append((start, end))
+            if self.fail_first:
+                self.fail_first -= 1
+                raise OSError("connection reset")
+        # FDSN windows are inclusive at both ends.
+        features: list[dict[str, Any]] = [
+            {"id": "ev{}".format(t),
+             "properties": {"mag": 3.0, "place": "Somewhere", "time": t},
+             "geometry": {"coordinates": [-155.0, 19.5, 5.0]}}
+            for t in sorted(self.times_ms, reverse=True) if start <= t <= end
+        ][:limit]
+        return geojson_response(features)
+
+
+def test_split_window_even_and_contiguous() -> None:
+    """Windows cover the range exactly, in order, without gaps."""
+    windows = split_window(START, END, 4)
+    assert len(windows) == 4
+    assert windows[0][0].isoformat().startswith(START)
+    assert windows[-1][1].isoformat().startswith(END)
+    for (_, end), (start, _) in zip(windows, windows[1:], strict=False):
+        assert end == start
+
+
+def test_split_window_rejects_empty_range() -> None:
+    with pytest.raises(ValueError):
+        split_window(END, START, 2)
+
+
+def test_fetch_sharded_merges_and_dedupes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Every event appears once, including those on shard boundaries."""
+    times = [START_MS + n * DAY_MS // 4 for n in range(4)] + [START_MS + 7]
+    catalog = _FakeCatalog(times)
+    monkeypatch.setattr(core, "urlopen", catalog)
+    with fetch_sharded(1.0, START, END, shards=4) as stream:
+        table, meta = parse_table(stream, DEFAULT_ORIGIN)
+    assert sorted(table.time_ms) == sorted(times)
+    assert meta["count"] == len(times)
+    assert list(table.time_ms) == sorted(times, reverse=True)
+    assert len(catalog.windows) == 4
+
+
+def test_fetch_sharded_splits_truncated_shards(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A shard that returns the limit is halved until it fits."""
+    times = [START_MS + n * 60_000 for n in range(40)]
+    catalog = _FakeCatalog(times)
+    monkeypatch.setattr(core, "urlopen", catalog)
+    with fetch_sharded(1.0, START, END, shards=1, limit=10) as stream:
+        table, _ = parse_table(stream, DEFAULT_ORIGIN)
+    assert sorted(table.time_ms) == times
+    assert len(catalog.windows) > 1
+
+
+def test_fetch_sharded_spools_shards_as_they_finish(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The newest shard is written out while an older one is still fetching."""
+    times = [START_MS + DAY_MS // 4, START_MS + 3 * DAY_MS // 4]
+    catalog = _FakeCatalog(times)
+    written = threading.Event()
+    add = sharding._MergedDocument.add
+
+    def add_and_signal(self: sharding._MergedDocument,
+                       shard: list[tuple[str, bytes]]) -> None:
+        add(self, shard)
+        written.set()
+
+    def fetch(request: Request, timeout: float = 10) -> FakeResponse:
+        params = parse_qs(urlparse(request.full_url).query)
+        if _ms(params["starttime"][0]) == START_MS:  # the older half
+            assert written.wait(5), "newest shard was held back"
+        return catalog(request, timeout)
+    monkeypatch.setattr(sharding._MergedDocument, "add", add_and_signal)
+    monkeypatch.setattr(core, "urlopen", fetch)
+    with fetch_sharded(1.0, START, END, shards=2) as stream:
+        table, _ = parse_table(stream, DEFAULT_ORIGIN)
+    assert list(table.time_ms) == sorted(times, reverse=True)
+
+
+def test_fetch_sharded_retries_failed_shard(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A transient failure is retried rather than failing the fetch."""
+    monkeypatch.setattr("seismic_reporting.sharding.time.sleep",
+                        lambda seconds: None)
+    catalog = _FakeCatalog([START_MS + 1000], fail_first=1)
+    monkeypatch.setattr(core, "urlopen", catalog)
+    with fetch_sharded(1.0, START, END, shards=1) as stream:
+        table, _ = parse_table(stream, DEFAULT_ORIGIN)
+    assert len(table) == 1
+
+
+def test_fetch_sharded_gives_up_after_retries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A shard that keeps failing raises RuntimeError."""
+    monkeypatch.setattr("seismic_reporting.sharding.time.sleep",
+                        lambda seconds: None)
+    monkeypatch.setattr(core, "urlopen", _FakeCatalog([], fail_first=10))
+    with pytest.raises(RuntimeError, match="shard .* failed"):
+        fetch_sharded(1.0, START, END, shards=2, retries=1)
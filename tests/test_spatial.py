@@ -0,0 +1,108 @@
+"""Tests for seismic_reporting.spatial."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from seismic_reporting.haversine import calc_dist
+from seismic_reporting.spatial import SpatialIndex, cap_cells, cell_key, cell_keys
+
+_RNG = random.Random(5)
+_LATS = [_RNG.uniform(-90, 90) for _ in range(3000)]
+_LONS = [_RNG.uniform(-180, 180) for _ in range(3000)]
+# Clusters at the poles and across the antimeridian.
+_LATS += [89.9, -89.5, 10.0, 10.0, -5.0]
+_LONS += [0.0, 120.0, 179.9, -179.9, 180.0]
+
+
+def _brute_distances(lat: float, lon: float) -> list[tuple[float, int]]:
+    return [(calc_dist(lat, lon, plat, plon), row)
+            for row, (plat, plon) in enumerate(zip(_LATS, _LONS, strict=True))]
+
+
+@pytest.fixture(scope="module")
+def index() -> SpatialIndex:
+    """An index over the random and edge-case points."""
+    return SpatialIndex(_LATS, _LONS)
+
+
+@pytest.mark.parametrize("lat,lon,radius_km", [
+    (19.6, -155.9, 500.0),
+    (10.0, 180.0, 50.0),       # straddles the antimeridian
+    (88.0, 45.0, 600.0),       # cap holds the north pole
+    (-89.0, 0.0, 200.0),
+    (0.0, 0.0, 0.0),
+    (45.0, 90.0, 5000.0),
+    (0.0, 0.0, 30000.0),       # wider than the Earth
+])
+def test_within_matches_brute_force(
+    index: SpatialIndex, lat: float, lon: float, radius_km: float,
+) -> None:
+    """A radius query returns exactly the rows a full scan would."""
+    found = index.within(lat, lon, radius_km)
+    assert [row for _, row in found] == [
+        row for dist, row in _brute_distances(lat, lon) if dist <= radius_km]
+    for dist, row in found:
+        assert dist == pytest.approx(calc_dist(lat, lon, _LATS[row], _LONS[row]))
+
+
+@pytest.mark.parametrize("lat,lon,k", [
+    (19.6, -155.9, 1), (10.0, -180.0, 5), (89.0, 0.0, 25), (0.0, 0.0, 400),
+])
+def test_nearest_matches_brute_force(
+    index: SpatialIndex, lat: float, lon: float, k: int,
+) -> None:
+    """Nearest-k equals the k smallest distances of a full scan."""
+    expected = sorted(_brute_distances(lat, lon))
+    found = index.nearest(lat, lon, k)
+    assert [row for _, row in found] == [row for _, row in expected[:k]]
+
+
+def test_nearest_more_than_available() -> None:
+    """Asking for more points than exist returns them all, nearest first."""
+    index = SpatialIndex([0.0, 1.0, -60.0], [0.0, 1.0, 100.0])
+    assert [row for _, row in index.nearest(0.0, 0.0, 10)] == [0, 1, 2]
+    assert index.nearest(0.0, 0.0, 0) == []
+
+
+def test_within_visits_only_nearby_cells(index: SpatialIndex) -> None:
+    """A small radius examines a few cells, not the whole catalog."""
+    candidates = index._candidates(19.6, -155.9, 100.0)
+    assert len(candidates) < len(_LATS) / 100
+
+
+def test_rejects_mismatched_columns() -> None:
+    """Coordinate columns must be the same length."""
+    with pytest.raises(ValueError):
+        SpatialIndex([0.0], [])
+
+
+# --------------------------------------------------------------------------
+# cell_key / cap_cells
+# --------------------------------------------------------------------------
+
+def test_cap_cells_cover_every_point_in_radius() -> None:
+    """Every point within the radius lies in one of the cap's cells."""
+    rng = random.Random(11)
+    for lat, lon, radius in ((0.0, 179.9, 300.0), (89.5, 10.0, 200.0),
+                             (-45.0, -60.0, 50.0)):
+        cells = cap_cells(lat, lon, radius, 1.0)
+        assert cells is not None
+        for _ in range(500):
+            plat, plon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            if calc_dist(lat, lon, plat, plon) <= radius:
+                assert cell_key(plat, plon, 1.0) in cells
+        lats, lons = [lat, -lat], [lon, -lon]
+        assert cell_keys(lats, lons, 1.0) == [cell_key(a, b, 1.0)
+                                              for a, b in zip(lats, lons,
+                                                              strict=True)]
+
+
+def test_cap_cells_limit() -> None:
+    """A cap spanning more cells than `limit` returns None."""
+    assert cap_cells(0.0, 0.0, 5000.0, 1.0, limit=100) is None
+    assert cap_cells(0.0, 0.0, 50.0, 1.0, limit=100) is not None
+    with pytest.raises(ValueError):
+        cell_key(0.0, 0.0, 0.0)
@@ -0,0 +1,193 @@
+"""Tests for seismic_reporting.sqlstore."""
+
+from __future__ import annotations
+
+import math
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from seismic_reporting.core import (
+    DEFAULT_ORIGIN,
+    Origin,
+    QuakeTable,
+    parse_quakes,
+    parse_table,
+)
+from seismic_reporting.haversine import calc_dist
+from seismic_reporting.sqlstore import EventDatabase
+from seismic_reporting.stats import MagnitudeStats
+
+_EVENTS = (
+    b'{"metadata": {"title": "fixture", "count": 3}, "features": ['
+    b'{"type": "Feature", "id": "hv1", "properties":'
+    b' {"mag": 2.1, "place": "5km W of Volcano, Hawaii", "time": 1000,'
+    b' "updated": 2000, "magType": "md", "type": "earthquake",'
+    b' "status": "reviewed"}, "geometry": {"coordinates": [-155.3, 19.4, 4.5]}},'
+    b' {"type": "Feature", "id": "us2", "properties":'
+    b' {"mag": 4.0, "place": "Tonga", "time": 500, "updated": 600,'
+    b' "magType": "mb", "type": "earthquake", "status": "automatic"},'
+    b' "geometry": {"coordinates": [-175.0, -20.0, null]}},'
+    b' {"type": "Feature", "id": "hv3", "properties":'
+    b' {"mag": 3.0, "place": "10km SE of Pahala, Hawaii", "time": 3000,'
+    b' "updated": 3000, "magType": "ml", "type": "earthquake",'
+    b' "status": "reviewed"}, "geometry": {"coordinates": [-155.4, 19.1, 33]}}'
+    b']}'
+)
+
+# starttime covering every fixture event (epoch 0 onwards).
+_EPOCH = "1970-01-01T00:00:00"
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> EventDatabase:
+    """A database holding the three fixture events."""
+    database = EventDatabase(tmp_path / "events.db")
+    table, _ = parse_table(_EVENTS, DEFAULT_ORIGIN)
+    database.insert(table)
+    return database
+
+
+# --------------------------------------------------------------------------
+# insert
+# --------------------------------------------------------------------------
+
+def test_insert_round_trips_every_field(db: EventDatabase) -> None:
+    """Stored events come back with every field, unknown depth as NaN."""
+    table, meta = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, orderby="time-asc")
+    expected, _ = parse_table(_EVENTS, DEFAULT_ORIGIN)
+    assert [q.event_id for q in table] == ["us2", "hv1", "hv3"]
+    assert table[1] == expected[0]
+    assert table[2] == expected[2]
+    assert math.isnan(table[0].depth_km)
+    assert (table[0].status, table[0].updated_ms) == ("automatic", 600)
+    assert meta["count"] == 3
+
+
+def test_insert_keeps_newest_revision(db: EventDatabase) -> None:
+    """A re-sent event replaces the stored one only if it is newer."""
+    older = _EVENTS.replace(b'"mag": 4.0', b'"mag": 9.0').replace(
+        b'"updated": 600', b'"updated": 100')
+    newer = _EVENTS.replace(b'"mag": 4.0', b'"mag": 4.2').replace(
+        b'"updated": 600', b'"updated": 900')
+    db.insert(parse_quakes(older, DEFAULT_ORIGIN)[0])
+    assert len(db) == 3
+    assert db.query(DEFAULT_ORIGIN, 3.5, _EPOCH)[0].mag.tolist() == [4.0]
+    db.insert(parse_quakes(newer, DEFAULT_ORIGIN)[0])
+    assert len(db) == 3
+    assert db.query(DEFAULT_ORIGIN, 3.5, _EPOCH)[0].mag.tolist() == [4.2]
+
+
+def test_insert_list_matches_table(tmp_path: Path) -> None:
+    """A list of Quakes and a projected table are stored alike."""
+    with EventDatabase(tmp_path / "a.db") as from_list, \
+            EventDatabase(tmp_path / "b.db") as from_table:
+        from_list.insert(parse_quakes(_EVENTS, DEFAULT_ORIGIN)[0])
+        from_table.insert(parse_table(_EVENTS, DEFAULT_ORIGIN)[0])
+        assert (list(from_list.query(DEFAULT_ORIGIN, 0.0, _EPOCH)[0])[0]
+                == list(from_table.query(DEFAULT_ORIGIN, 0.0, _EPOCH)[0])[0])
+        bare, _ = parse_table(_EVENTS, DEFAULT_ORIGIN, fields=())
+        assert from_table.insert(bare) == 3  # no ids: always added
+        assert len(from_table) == 6
+
+
+# --------------------------------------------------------------------------
+# query
+# --------------------------------------------------------------------------
+
+def test_insert_keeps_unknown_magnitudes(tmp_path: Path) -> None:
+    """An event the feed gave no magnitude is stored as such."""
+    unknown = _EVENTS.replace(b'"mag": 4.0', b'"mag": null')
+    with EventDatabase(tmp_path / "events.db") as db:
+        db.insert(parse_table(unknown, DEFAULT_ORIGIN)[0])
+        table, _ = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, orderby="time-asc")
+    assert [q.event_id for q in table] == ["us2", "hv1", "hv3"]
+    assert list(table.mag_known) == [0, 1, 1]
+    with EventDatabase(tmp_path / "quakes.db") as db:
+        db.insert(parse_quakes(unknown, DEFAULT_ORIGIN)[0])
+        mag_stats = MagnitudeStats()
+        table, _ = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, orderby="time-asc",
+                            mag_stats=mag_stats)
+    assert list(table.mag_known) == [0, 1, 1]
+    assert mag_stats.count == 2
+
+
+def test_query_filters_like_fdsn(db: EventDatabase) -> None:
+    """Magnitude, time window, order and limit follow the FDSN parameters."""
+    newest, _ = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, limit=2)
+    assert [q.time_ms for q in newest] == [3000, 1000]
+    strong, _ = db.query(DEFAULT_ORIGIN, 2.5, _EPOCH, orderby="magnitude")
+    assert strong.mag.tolist() == [4.0, 3.0]
+    window, _ = db.query(DEFAULT_ORIGIN, 0.0, "1970-01-01T00:00:00.800",
+                         endtime="1970-01-01T00:00:02")
+    assert [q.event_id for q in window] == ["hv1"]
+    with pytest.raises(ValueError):
+        db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, orderby="depth")
+
+
+def test_query_skips_deleted(db: EventDatabase) -> None:
+    """Events whose latest revision is 'deleted' are not reported."""
+    deleted = _EVENTS.replace(b'"status": "automatic"', b'"status": "deleted"'
+                              ).replace(b'"updated": 600', b'"updated": 700')
+    db.insert(parse_quakes(deleted, DEFAULT_ORIGIN)[0])
+    table, _ = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH)
+    assert "us2" not in [q.event_id for q in table]
+
+
+def test_query_radius_measures_from_origin(db: EventDatabase) -> None:
+    """A radius query keeps nearby events and measures from `origin`."""
+    home = Origin(-20.0, -175.0, "Tonga")
+    table, _ = db.query(home, 0.0, _EPOCH, lat=19.5, lon=-155.3,
+                        radius_km=100.0)
+    assert sorted(q.event_id for q in table) == ["hv1", "hv3"]
+    assert table.sites == [home]
+    assert table.distance_km[0] == pytest.approx(
+        calc_dist(-20.0, -175.0, table.lat[0], table.lon[0]))
+
+
+def test_query_radius_matches_brute_force(tmp_path: Path) -> None:
+    """The cell index never drops an event inside the circle."""
+    rng = random.Random(3)
+    table = QuakeTable()
+    for n in range(2000):
+        table.append(3.0, "p", rng.uniform(-89, 89), rng.uniform(-180, 180),
+                     n, event_id="e{}".format(n))
+    with EventDatabase(tmp_path / "grid.db") as db:
+        db.insert(table)
+        for lat, lon, radius in ((10.0, 179.5, 800.0), (85.0, 0.0, 900.0),
+                                 (0.0, 0.0, 12000.0)):
+            found, _ = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, lat=lat,
+                                lon=lon, radius_km=radius)
+            brute = {"e{}".format(row) for row in range(len(table))
+                     if calc_dist(lat, lon, table.lat[row],
+                                  table.lon[row]) <= radius}
+            assert {q.event_id for q in found} == brute
+
+
+def test_query_feeds_mag_stats_and_fields(db: EventDatabase) -> None:
+    """mag_stats and fields behave as for parse_table()."""
+    stats = MagnitudeStats()
+    table, _ = db.query(DEFAULT_ORIGIN, 0.0, _EPOCH, mag_stats=stats,
+                        fields=("depth_km",))
+    assert (stats.count, stats.max) == (3, 4.0)
+    assert table.fields == {"depth_km"}
+    assert table[0].event_id == ""
+
+
+# --------------------------------------------------------------------------
+# opening
+# --------------------------------------------------------------------------
+
+def test_open_existing_only(tmp_path: Path) -> None:
+    """create=False refuses to create a missing database."""
+    with pytest.raises(sqlite3.OperationalError):
+        EventDatabase(tmp_path / "missing.db", create=False)
+    assert not (tmp_path / "missing.db").exists()
+
+
+def test_database_uses_wal(db: EventDatabase) -> None:
+    """The database is in WAL mode, so readers do not block the writer."""
+    mode = sqlite3.connect(db.path).execute("PRAGMA journal_mode").fetchone()
+    assert mode == ("wal",)
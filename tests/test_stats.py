@@ -0,0 +1,166 @@
+"""Tests for seismic_reporting.stats."""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+
+import pytest
+
+from seismic_reporting.stats import MagnitudeStats, catalog_stats
+
+_MAGS = [round(random.Random(7).gauss(2.0, 1.0), 2) for _ in range(2000)]
+
+
+def _check_moments(stats: MagnitudeStats, values: list[float]) -> None:
+    assert stats.count == len(values)
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values), abs=1e-9)
+    assert stats.variance == pytest.approx(statistics.variance(values),
+                                           rel=1e-9)
+
+
+def test_empty() -> None:
+    """No values: zero count and NaN statistics, not an exception."""
+    stats = MagnitudeStats()
+    assert len(stats) == 0
+    assert math.isnan(stats.median)
+    assert math.isnan(stats.variance)
+
+
+def test_single_value() -> None:
+    """One value is its own min, max, mean and median."""
+    stats = MagnitudeStats.of([4.5])
+    assert (stats.min, stats.max, stats.mean, stats.median) == (4.5,) * 4
+    assert math.isnan(stats.stdev)
+
+
+def test_exact_moments_and_quantiles() -> None:
+    """Small sets match the statistics module exactly."""
+    stats = MagnitudeStats.of(_MAGS)
+    assert stats.exact
+    _check_moments(stats, _MAGS)
+    assert stats.median == statistics.median(_MAGS)
+    assert stats.percentiles([10, 90]) == pytest.approx(
+        statistics.quantiles(_MAGS, n=10, method='inclusive')[::8])
+    assert MagnitudeStats.of([1.0, 2.0]).median == 1.5
+
+
+def test_quantile_range_checked() -> None:
+    """Quantiles outside [0, 1] are rejected."""
+    with pytest.raises(ValueError):
+        MagnitudeStats.of([1.0]).quantile(1.5)
+
+
+def test_sketch_quantiles_close() -> None:
+    """Past exact_limit the t-digest estimate stays close to exact."""
+    values = [random.Random(3).expovariate(1.5) for _ in range(50_000)]
+    stats = MagnitudeStats.of(values)
+    assert not stats.exact
+    _check_moments(stats, values)
+    ordered = sorted(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert stats.quantile(q) == pytest.approx(exact, rel=0.01, abs=1e-3)
+    assert stats.quantile(0.0) == stats.min
+    assert stats.quantile(1.0) == stats.max
+
+
+@pytest.mark.parametrize("exact_limit", [10_000, 100])
+def test_merge_matches_single_pass(exact_limit: int) -> None:
+    """Merged partials agree with one accumulator fed every value."""
+    parts = [_MAGS[:500], _MAGS[500:1500], [], _MAGS[1500:]]
+    merged = MagnitudeStats(exact_limit)
+    for part in parts:
+        partial = MagnitudeStats(exact_limit)
+        partial.update(part)
+        merged.merge(partial)
+    whole = MagnitudeStats(exact_limit)
+    whole.update(_MAGS)
+    _check_moments(merged, _MAGS)
+    assert merged.exact == whole.exact
+    assert merged.median == pytest.approx(whole.median, abs=0.02)
+
+
+# --------------------------------------------------------------------------
+# catalog_stats
+# --------------------------------------------------------------------------
+
+_DAY_MS = 86_400_000
+
+
+def _gutenberg_richter(count: int, b_value: float) -> list[float]:
+    """Magnitudes above M1.0 with the given b-value, reported to 0.1."""
+    rng = random.Random(11)
+    return [round(1.0 + rng.expovariate(b_value * math.log(10)), 1)
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("b_value", [0.8, 1.0, 1.3])
+def test_catalog_b_value_recovered(b_value: float) -> None:
+    """The maximum likelihood b-value recovers the generating one."""
+    mags = _gutenberg_richter(20_000, b_value)
+    stats = catalog_stats(mags, [0] * len(mags), [])
+    assert 1.0 <= stats.mc <= 1.5
+    assert stats.b_value == pytest.approx(b_value, rel=0.05)
+    assert stats.b_error is not None and 0 < stats.b_error < 0.05
+    assert stats.b_count == sum(1 for mag in mags if mag >= stats.mc - 1e-9)
+
+
+def test_catalog_histogram() -> None:
+    """Magnitudes are counted in 0.1 bins, in ascending order."""
+    stats = catalog_stats([2.5, 2.52, 2.61, 4.0], [0] * 4, [])
+    assert stats.histogram == [(2.5, 2), (pytest.approx(2.6), 1), (4.0, 1)]
+    assert stats.count == 4
+
+
+def test_catalog_skips_unknown_magnitudes() -> None:
+    """None/NaN magnitudes count as events but stay out of the bins and Mc."""
+    stats = catalog_stats([2.5, 2.6, 2.6, None, math.nan], [0] * 5, [])
+    assert stats.histogram == [(2.5, 1), (pytest.approx(2.6), 2)]
+    assert stats.mc == pytest.approx(2.8)
+    assert stats.count == 5
+
+
+def test_catalog_bins_round_half_up() -> None:
+    """A magnitude on a bin edge goes up, not to the even bin."""
+    stats = catalog_stats([2.25, 2.45, 0.05], [0] * 3, [])
+    assert [mag for mag, _ in stats.histogram] == [
+        pytest.approx(0.1), pytest.approx(2.3), pytest.approx(2.5)]
+
+
+def test_catalog_too_few_for_b_value() -> None:
+    """A handful of events gives Mc but no b-value."""
+    stats = catalog_stats([2.5, 3.0, 3.5], [0] * 3, [])
+    assert stats.b_value is None
+    assert stats.mc == pytest.approx(2.7)
+
+
+def test_catalog_rates() -> None:
+    """Rates average over the given span; the busiest UTC day is found."""
+    times = [0, 1000, _DAY_MS + 5, 3 * _DAY_MS - 1]
+    stats = catalog_stats([2.0] * 4, times, [], span_days=2.0)
+    assert stats.per_day == 2.0
+    assert stats.per_hour == pytest.approx(2.0 / 24)
+    assert stats.busiest_day == ("1970-01-01", 2)
+    assert catalog_stats([2.0] * 4, times, []).span_days == pytest.approx(3.0)
+
+
+def test_catalog_depths() -> None:
+    """Depth quantiles and bands skip unknown (NaN) depths."""
+    depths = [10.0, 20.0, 30.0, 100.0, 650.0, math.nan]
+    stats = catalog_stats([2.0] * 6, [0] * 6, depths)
+    assert stats.depth_quantiles == (30.0, pytest.approx(430.0), 650.0)
+    assert stats.depth_bands == (3, 1, 1)
+
+
+def test_catalog_empty() -> None:
+    """An empty catalog has no Mc, b-value, rate or depths."""
+    stats = catalog_stats([], [], [])
+    assert math.isnan(stats.mc)
+    assert stats.b_value is None
+    assert stats.per_day is None
+    assert stats.busiest_day is None
+    assert stats.depth_quantiles is None
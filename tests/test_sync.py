@@ -0,0 +1,172 @@
+"""Tests for seismic_reporting.sync (urlopen monkeypatched - no network)."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+from urllib.request import Request
+
+import pytest
+
+from seismic_reporting import core
+from seismic_reporting.core import DEFAULT_ORIGIN, parse_table
+from seismic_reporting.sync import EventStore, sync_store
+from tests._fakes import FakeFeed, FakeResponse
+
+NOW_MS = int(time.time() * 1000)
+HOUR_MS = 3_600_000
+
+
+def _feature(event_id: str, mag: float, age_h: float, updated_h: float,
+             status: str = "reviewed") -> dict[str, Any]:
+    return {
+        "type": "Feature",
+        "id": event_id,
+        "properties": {"mag": mag, "place": "Somewhere " + event_id,
+                       "time": NOW_MS - int(age_h * HOUR_MS),
+                       "updated": NOW_MS - int(updated_h * HOUR_MS),
+                       "status": status},
+        "geometry": {"type": "Point", "coordinates": [-155.0, 19.5, 5.0]},
+    }
+
+
+@pytest.fixture
+def store_path(tmp_path: Path) -> Path:
+    return tmp_path / "store.geojson"
+
+
+def test_first_sync_downloads_window(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An empty store is filled by a full query with no updatedafter."""
+    feed = FakeFeed([_feature("a", 3.0, 2, 2), _feature("b", 4.0, 1, 1)])
+    monkeypatch.setattr(core, "urlopen", feed)
+    result = sync_store(store_path, 2.5, 1.0)
+    assert result.full
+    assert (result.inserted, result.updated, result.deleted) == (2, 0, 0)
+    assert "updatedafter" not in feed.queries[0]
+    table, meta = parse_table(store_path.read_bytes(), DEFAULT_ORIGIN)
+    assert len(table) == 2
+    assert meta["count"] == 2
+
+
+def test_incremental_sync_merges_by_id(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Later syncs ask only for updates and apply them by event id."""
+    feed = FakeFeed(
+        [_feature("a", 3.0, 5, 5), _feature("b", 4.0, 4, 3),
+         _feature("c", 2.6, 3, 2)],
+        [_feature("a", 3.3, 5, 0.5), _feature("b", 4.0, 4, 0.4, "deleted"),
+         _feature("d", 5.0, 0.1, 0.1)],
+    )
+    monkeypatch.setattr(core, "urlopen", feed)
+    sync_store(store_path, 2.5, 1.0)
+    result = sync_store(store_path, 2.5, 1.0)
+    assert not result.full
+    assert (result.inserted, result.updated, result.deleted) == (1, 1, 1)
+    assert feed.queries[1]["includedeleted"] == ["true"]
+    assert "updatedafter" in feed.queries[1]
+
+    store = EventStore(store_path)
+    store.load()
+    assert sorted(store.features) == ["a", "c", "d"]
+    assert store.features["a"]["properties"]["mag"] == 3.3
+    assert store.watermark_ms == NOW_MS - int(0.1 * HOUR_MS)
+
+
+def test_watermark_sets_updatedafter(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """updatedafter is the stored watermark, less a safety overlap."""
+    feed = FakeFeed([_feature("a", 3.0, 2, 1)], [])
+    monkeypatch.setattr(core, "urlopen", feed)
+    sync_store(store_path, 2.5, 1.0)
+    sync_store(store_path, 2.5, 1.0)
+    (after,) = feed.queries[1]["updatedafter"]
+    stamp = core.datetime.datetime.fromisoformat(after).replace(
+        tzinfo=core.datetime.timezone.utc)
+    expected_ms = NOW_MS - HOUR_MS - 60_000
+    assert abs(stamp.timestamp() * 1000 - expected_ms) < 1
+
+
+def test_empty_first_sync_sets_watermark(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A window with no events still lets the next sync be incremental."""
+    feed = FakeFeed([], [_feature("a", 3.0, 0.1, 0.1)])
+    monkeypatch.setattr(core, "urlopen", feed)
+    before_ms = int(time.time() * 1000)
+    assert sync_store(store_path, 2.5, 1.0).full
+    store = EventStore(store_path)
+    store.load()
+    assert store.watermark_ms is not None
+    assert store.watermark_ms >= before_ms - 60_000
+    result = sync_store(store_path, 2.5, 1.0)
+    assert not result.full
+    assert result.inserted == 1
+    assert "updatedafter" in feed.queries[1]
+
+
+def test_changed_query_forces_full_sync(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A store built for another min magnitude is rebuilt from scratch."""
+    feed = FakeFeed([_feature("a", 3.0, 2, 2)], [_feature("b", 5.0, 1, 1)])
+    monkeypatch.setattr(core, "urlopen", feed)
+    sync_store(store_path, 2.5, 1.0)
+    result = sync_store(store_path, 4.5, 1.0)
+    assert result.full
+    store = EventStore(store_path)
+    store.load()
+    assert list(store.features) == ["b"]
+
+
+def test_widened_window_forces_full_sync(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Widening --days refetches the window, not only recent updates."""
+    feed = FakeFeed([_feature("a", 3.0, 2, 2)],
+                     [_feature("a", 3.0, 2, 2), _feature("old", 3.0, 200, 200)],
+                     [], [])
+    monkeypatch.setattr(core, "urlopen", feed)
+    sync_store(store_path, 2.5, 1.0)
+    result = sync_store(store_path, 2.5, 30.0)
+    assert result.full
+    assert "updatedafter" not in feed.queries[1]
+    assert feed.queries[1]["starttime"] < feed.queries[0]["starttime"]
+    store = EventStore(store_path)
+    store.load()
+    assert sorted(store.features) == ["a", "old"]
+    assert not sync_store(store_path, 2.5, 30.0).full
+    assert not sync_store(store_path, 2.5, 1.0).full  # narrowing prunes
+
+
+def test_sync_prunes_events_outside_window(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Events older than the look-back window are dropped."""
+    feed = FakeFeed([_feature("old", 3.0, 30, 30), _feature("new", 3.0, 1, 1)])
+    monkeypatch.setattr(core, "urlopen", feed)
+    result = sync_store(store_path, 2.5, 1.0)
+    assert result.pruned == 1
+    store = EventStore(store_path)
+    store.load()
+    assert list(store.features) == ["new"]
+
+
+def test_failed_sync_leaves_store_untouched(
+    store_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A network error raises RuntimeError without rewriting the store."""
+    monkeypatch.setattr(core, "urlopen", FakeFeed([_feature("a", 3.0, 1, 1)]))
+    sync_store(store_path, 2.5, 1.0)
+    before = store_path.read_bytes()
+
+    def boom(request: Request, timeout: float = 10) -> FakeResponse:
+        raise OSError("unreachable")
+    monkeypatch.setattr(core, "urlopen", boom)
+    with pytest.raises(RuntimeError, match="request failed"):
+        sync_store(store_path, 2.5, 1.0)
+    assert store_path.read_bytes() == before
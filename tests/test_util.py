@@ -0,0 +1,67 @@
+"""Tests for seismic_reporting.util."""
+
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+from seismic_reporting.util import (
+    atomic_write,
+    epoch_ms,
+    fdsn_time,
+    parse_utc,
+    utc_from_ms,
+)
+
+# --------------------------------------------------------------------------
+# atomic_write
+# --------------------------------------------------------------------------
+
+
+def test_atomic_write_replaces_file(tmp_path: Path) -> None:
+    """The new contents land at the path with no temporary file left over."""
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+    with atomic_write(path) as out:
+        out.write(b'new')
+        assert path.read_bytes() == b'old'  # not visible until the end
+    assert path.read_bytes() == b'new'
+    assert [p.name for p in tmp_path.iterdir()] == ['out.bin']
+
+
+def test_atomic_write_leaves_file_on_error(tmp_path: Path) -> None:
+    """A failed write keeps the old file and removes the temporary one."""
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+    with pytest.raises(RuntimeError), atomic_write(path) as out:
+        out.write(b'partial')
+        raise RuntimeError('boom')
+    assert path.read_bytes() == b'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['out.bin']
+
+
+# --------------------------------------------------------------------------
+# timestamps
+# --------------------------------------------------------------------------
+
+
+def test_parse_utc_assumes_utc_when_unmarked() -> None:
+    """A bare FDSN timestamp is UTC; an explicit offset is honoured."""
+    utc = datetime.timezone.utc
+    assert parse_utc('2024-01-02T03:04:05') == datetime.datetime(
+        2024, 1, 2, 3, 4, 5, tzinfo=utc)
+    assert parse_utc('2024-01-02T04:04:05+01:00') == parse_utc(
+        '2024-01-02T03:04:05')
+    with pytest.raises(ValueError):
+        parse_utc('yesterday')
+
+
+def test_timestamp_round_trip() -> None:
+    """epoch_ms(), utc_from_ms() and fdsn_time() agree to the millisecond."""
+    stamp = '2024-01-02T03:04:05.678'
+    time_ms = epoch_ms(stamp)
+    assert time_ms == 1704164645678
+    assert fdsn_time(utc_from_ms(time_ms)) == stamp
+    assert epoch_ms(fdsn_time(utc_from_ms(0))) == 0